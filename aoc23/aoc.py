@@ -1,22 +1,316 @@
-import argparse, importlib
+import sys, time
 
-parser = argparse.ArgumentParser(
-    prog='aoc',
-    description='Run advent of code programs')
-parser.add_argument('day', metavar='N', type=int, nargs = '?', help = 'day to run')
+def run_arguments(parser):
+    parser.add_argument('day', metavar='N', type=int, nargs = '?', help = 'day to run')
+    parser.add_argument('-j', '--jobs', metavar='J', type=int, nargs='?', const=0,
+                        help = 'run parts in parallel across J worker processes (default: one per CPU) and report timings')
+    parser.add_argument('-p', '--profile', metavar='TOP', type=int, nargs='?', const=20,
+                        help = 'profile each part, reporting its TOP functions (default: 20) and writing flamegraph stacks')
+    parser.add_argument('-s', '--sample', metavar='MS', type=float, nargs='?', const=2.0,
+                        help = 'sample each part\'s stack every MS milliseconds of CPU time (default: 2), '
+                               'reporting its top functions and writing flamegraph stacks')
+    parser.add_argument('--profile-dir', metavar='DIR', help = 'where to write the collapsed stacks (default: .aoc/profiles)')
+    parser.add_argument('-m', '--memory', metavar='TOP', type=int, nargs='?', const=5,
+                        help = 'trace allocations, reporting peak memory and the TOP allocation sites (default: 5)')
+    parser.add_argument('--memory-budget', metavar='MB', type=float,
+                        help = 'fail any part whose peak traced memory exceeds MB megabytes (implies --memory)')
+    parser.add_argument('--parse-cache', metavar='DIR', nargs='?', const='',
+                        help = 'reuse parsed inputs saved by earlier runs over the same input and code (default: .aoc/cache)')
+    parser.add_argument('--memo', metavar='DIR', nargs='?', const='',
+                        help = 'keep solvers\' memo tables between runs of the same code (default: .aoc/memo)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help = 'solve every part even if its answer for the same input and code is known')
+    parser.add_argument('--cache-size', metavar='N', type=int, default=1000, help = 'most answers to keep')
+    parser.add_argument('-t', '--timeout', metavar='SECONDS', type=float,
+                        help = 'run each part in a process of its own, stopping it after SECONDS')
+    parser.add_argument('--resume', action='store_true',
+                        help = 'continue long searches from their last checkpoint (in .aoc/checkpoints)')
+    parser.add_argument('--trace', metavar='FILE', nargs='?', const='',
+                        help = 'write the spans of each part as a Chrome trace, for Perfetto (default: .aoc/trace.json)')
 
-def day(n):
+def bench_arguments(parser):
+    parser.add_argument('days', metavar='N', type=int, nargs='*', help='days to benchmark (default: all)')
+    parser.add_argument('-n', '--repeat', type=int,
+                        help='timed runs per part (default: 5, or 10 when saving or comparing)')
+    parser.add_argument('-w', '--warmup', type=int, default=1, help='untimed runs before timing')
+    bench_inputs = parser.add_mutually_exclusive_group()
+    bench_inputs.add_argument('-t', '--test', action='store_true', help='use the doctest inputs rather than the puzzle inputs')
+    bench_inputs.add_argument('--scale', metavar='S', type=float,
+                              help='use inputs generated at S times the size of the puzzle inputs')
+    parser.add_argument('--seed', type=int, default=0, help='seed for generated inputs')
+    parser.add_argument('-o', '--output', metavar='FILE', help='write results as JSON to FILE (- for stdout)')
+    parser.add_argument('-s', '--save', action='store_true', help='add the results to the local benchmark history')
+    parser.add_argument('-c', '--compare', metavar='COMMIT', nargs='?', const='',
+                        help='flag regressions against the latest saved run (of COMMIT, if given)')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='fractional slowdown of the median that counts as a regression')
+    parser.add_argument('--alpha', type=float, default=0.05,
+                        help='significance level of the rank test for a regression')
 
-    try:
-        module = importlib.import_module(f'aoc23.day{n}')
-        module.main()
-    except:
-        pass
+def batch_arguments(parser):
+    parser.add_argument('pattern', metavar='GLOB',
+                        help='input files to solve; {n} is replaced by the day, as in variants/day{n}/*.txt')
+    parser.add_argument('days', metavar='N', type=int, nargs='*', help='days to solve them for (default: all)')
+    parser.add_argument('-j', '--jobs', metavar='J', type=int, help='worker processes (default: one per CPU)')
+    parser.add_argument('-o', '--output', metavar='FILE', default='-', help='where to write results (default: stdout)')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue long searches from their last checkpoint (in .aoc/checkpoints)')
 
-if __name__ == '__main__':
-    opts = parser.parse_args()
-    if n := opts.day:
-        day(n)
+def daemon_arguments(parser):
+    parser.add_argument('--socket', metavar='PATH', help='socket to listen on (default: .aoc/daemon.sock)')
+    parser.add_argument('-j', '--jobs', metavar='J', type=int, help='worker processes (default: one per CPU)')
+
+def query_arguments(parser):
+    parser.add_argument('day', metavar='N', type=int, help='day to solve')
+    parser.add_argument('parts', metavar='PART', nargs='*', help='parts to solve (default: all)')
+    parser.add_argument('-i', '--input', metavar='FILE', help='input to solve (default: the puzzle input)')
+    parser.add_argument('--socket', metavar='PATH', help='socket the daemon listens on (default: .aoc/daemon.sock)')
+
+def complexity_arguments(parser):
+    parser.add_argument('days', metavar='N', type=int, nargs='*', help='days to measure (default: all)')
+    parser.add_argument('-l', '--ladder', metavar='S', type=float, nargs='+',
+                        help='input scales to time, relative to the puzzle input (default: 0.125 0.25 0.5 1)')
+    parser.add_argument('-n', '--repeat', type=int, default=3, help='timed runs at each scale, taking the fastest')
+    parser.add_argument('--seed', type=int, default=0, help='seed for generated inputs')
+    parser.add_argument('--limit', metavar='SECONDS', type=float, default=10.0,
+                        help='stop climbing the ladder once a part takes longer than this')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='how far the fitted exponent may exceed the expected one')
+    parser.add_argument('-o', '--output', metavar='FILE', help='write results as JSON to FILE (- for stdout)')
+
+def startup_arguments(parser):
+    parser.add_argument('days', metavar='N', type=int, nargs='*', help='days to report (default: all)')
+    parser.add_argument('--top', type=int, default=5, help='heaviest imports to list per day')
+
+def generate_arguments(parser):
+    parser.add_argument('day', metavar='N', type=int, help='day to generate input for')
+    parser.add_argument('-s', '--scale', metavar='S', type=float, default=1.0,
+                        help='size relative to the puzzle input (default: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the generator')
+    parser.add_argument('-o', '--output', metavar='FILE', default='-', help='where to write it (default: stdout)')
+
+def instruments(opts):
+
+    import functools
+
+    found = []
+    if opts.profile is not None:
+        from aoc23 import profiling
+        found.append(functools.partial(profiling.Profile, top=opts.profile,
+                                       directory=opts.profile_dir or profiling.PROFILES))
+    if opts.sample is not None:
+        from aoc23 import profiling
+        found.append(functools.partial(profiling.Sampler, interval=opts.sample / 1000, top=opts.profile or 20,
+                                       directory=opts.profile_dir or profiling.PROFILES))
+    if opts.memory is not None or opts.memory_budget is not None:
+        from aoc23 import memory
+        budget = None if opts.memory_budget is None else int(opts.memory_budget * memory.MiB)
+        found.append(functools.partial(memory.Memory, top=5 if opts.memory is None else opts.memory, budget=budget))
+    return found
+
+def parallel(days, jobs, instruments=(), store=None, timeout=None, trace=None):
+
+    from aoc23 import memo, metrics, progress, runner
+
+    start = time.perf_counter()
+    failures = 0
+    cpu = 0.0
+    recorded = []
+    display = progress.sink = progress.sink_for(sys.stderr)
+    for result in runner.run_parallel(days, jobs, instruments, store, timeout):
+        display.clear()
+        print(result, flush=True)
+        for note in result.notes:
+            print(note)
+        if result.metrics:
+            print(f'  metrics: {metrics.describe(result.metrics)}')
+            if rates := memo.describe(result.metrics):
+                print(f'  memo: {rates}')
+        if not result.ok:
+            failures += 1
+            print(result.error, file=sys.stderr)
+        cpu += result.cpu
+        recorded.extend(result.spans or ())
+    print(f'{failures} failed, wall {time.perf_counter() - start:.3f}s, cpu {cpu:.3f}s')
+    if trace is not None:
+        from aoc23 import spans
+        spans.write(recorded, trace)
+        print(f'trace written to {trace}')
+    return 1 if failures else 0
+
+def run(opts):
+
+    from aoc23 import registry
+
+    found = registry.days()
+    days = [opts.day] if opts.day else found
+    if opts.parse_cache is not None:
+        from aoc23 import cache
+        cache.enable(opts.parse_cache or cache.CACHE)
+    if opts.memo is not None:
+        from aoc23 import memo
+        memo.enable(opts.memo or memo.MEMOS)
+    if opts.resume:
+        from aoc23 import checkpoint
+        checkpoint.enable_resume()
+    trace = None
+    if opts.trace is not None:
+        from aoc23 import spans
+        spans.enable()
+        trace = opts.trace or spans.TRACE
+    measured = instruments(opts)
+    if measured or trace or opts.jobs is not None or opts.timeout is not None:
+        store = None
+        if not (measured or trace or opts.no_cache):
+            from aoc23 import results
+            store = results.ResultStore(capacity=opts.cache_size)
+        return parallel(days, 1 if opts.jobs is None else opts.jobs, measured, store, opts.timeout, trace)
+    import contextlib
+    from typing import TextIO, cast
+    from aoc23 import progress
+
+    display = progress.sink = progress.sink_for(sys.stderr)
+    # Above stands in for the stream it wraps, though it isn't an IO
+    with contextlib.redirect_stdout(cast(TextIO, progress.Above(sys.stdout, display))):
+        for n in days:
+            if n in found:
+                progress.reset(day=n)
+                registry.module(n).main()
+    return 0
+
+def bench(opts):
+
+    from aoc23 import baseline, bench, registry
+
+    # enough runs for the rank test to tell a regression from noise
+    repeat = opts.repeat or (10 if opts.save or opts.compare is not None else 5)
+    results = []
+    for result in bench.bench(opts.days or registry.days(), repeat, opts.warmup, opts.test, opts.scale, opts.seed):
+        print(bench.format_result(result), flush=True)
+        results.append(result)
+    report = bench.report(results, repeat, opts.warmup, opts.test, opts.scale, opts.seed)
+    if opts.output:
+        bench.write(report, opts.output)
+    regressions = 0
+    if opts.compare is not None:
+        print()
+        for c in baseline.compare(results, baseline.history(), opts.compare or None, opts.threshold, opts.alpha):
+            print(baseline.format_comparison(c))
+            regressions += c['regression']
+        print(f'{regressions} regressed')
+    if opts.save:
+        baseline.save(report)
+    return 1 if regressions or any(r['status'] == 'FAIL' for r in results) else 0
+
+def batch(opts):
+
+    import contextlib
+    from aoc23 import batch, progress, registry
+
+    progress.sink = progress.Log(sys.stderr)
+    if opts.resume:
+        from aoc23 import checkpoint
+        checkpoint.enable_resume()
+    failures = count = 0
+    with contextlib.ExitStack() as stack:
+        out = sys.stdout if opts.output == '-' else stack.enter_context(open(opts.output, 'w'))
+        for result, path in batch.run_batch(opts.pattern, opts.days or registry.days(), opts.jobs):
+            print(batch.record(result, path), file=out, flush=True)
+            count += 1
+            failures += not result.ok
+    print(f'{count} solved, {failures} failed', file=sys.stderr)
+    return 1 if failures else 0
+
+def daemon(opts):
+
+    from aoc23 import daemon
+
+    daemon.serve(opts.socket or daemon.SOCKET, opts.jobs)
+    return 0
+
+def query(opts):
+
+    import json, os
+    from aoc23 import daemon, runner
+
+    requests = [{'day': opts.day, 'part': p, 'input': opts.input and os.path.abspath(opts.input)}
+                for p in opts.parts or runner.parts(opts.day)]
+    failures = 0
+    for answer in daemon.query(requests, opts.socket or daemon.SOCKET):
+        print(json.dumps(answer))
+        failures += answer['status'] not in ('ok', 'cached')
+    return 1 if failures else 0
+
+def complexity(opts):
+
+    from aoc23 import bench, complexity, registry
+
+    results = []
+    for result in complexity.analyse(opts.days or registry.days(), opts.ladder or complexity.LADDER, opts.repeat,
+                                     opts.seed, opts.limit, opts.tolerance):
+        print(complexity.format_curve(result), flush=True)
+        results.append(result)
+    if opts.output:
+        bench.write({'commit': bench.commit(), 'machine': bench.machine(), 'seed': opts.seed,
+                     'results': results}, opts.output)
+    worse = sum(r['worse'] for r in results)
+    print(f'{worse} worse than expected')
+    return 1 if worse or any(r['status'] == 'FAIL' for r in results) else 0
+
+def startup(opts):
+
+    from aoc23 import registry, startup
+
+    print(f'aoc     {startup.ms(startup.cli())}')
+    for n in opts.days or registry.days():
+        print(startup.format_day(startup.day(n, opts.top)), flush=True)
+    return 0
+
+def generate(opts):
+
+    from aoc23 import generate
+
+    text = ''.join(f'{line}\n' for line in generate.generate(opts.day, opts.scale, opts.seed))
+    if opts.output == '-':
+        sys.stdout.write(text)
     else:
-        for n in range(0, 26):
-            day(n)
+        with open(opts.output, 'w') as fd:
+            fd.write(text)
+    return 0
+
+COMMANDS = {
+    'run': ('run days (default)', run_arguments, run),
+    'bench': ('benchmark parts over repeated runs', bench_arguments, bench),
+    'batch': ('solve many inputs, writing results as NDJSON', batch_arguments, batch),
+    'daemon': ('keep solvers warm, answering requests on a Unix socket', daemon_arguments, daemon),
+    'query': ('ask a running daemon for answers', query_arguments, query),
+    'complexity': ('fit how solve time grows with input size', complexity_arguments, complexity),
+    'startup': ('report import time of the CLI and of each day', startup_arguments, startup),
+    'generate': ('write a synthetic input for a day', generate_arguments, generate),
+}
+
+def make_parser(command=None):
+    """The parser for the CLI, with only `command`'s arguments added:
+    adding every command's was most of the time `aoc` took to start."""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='aoc',
+        description='Run advent of code programs (the default command is `run`)')
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    for name, (help, arguments, func) in COMMANDS.items():
+        subparser = commands.add_parser(name, help=help)
+        subparser.set_defaults(func=func)
+        if name == command:
+            arguments(subparser)
+    return parser
+
+def main(argv):
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ('-h', '--help'):
+        argv = ['run'] + argv
+    opts = make_parser(argv[0]).parse_args(argv)
+    return opts.func(opts)
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
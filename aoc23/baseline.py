@@ -0,0 +1,134 @@
+import json, math, statistics
+from functools import cache
+
+from aoc23 import runner
+
+HISTORY = runner.PACKAGE.parent / '.aoc' / 'bench.jsonl'
+
+
+def save(report, path=HISTORY):
+    """Append a benchmark report to the history file (one JSON object per line)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a') as fd:
+        fd.write(json.dumps(report) + '\n')
+
+
+def history(path=HISTORY):
+    """Saved reports, oldest first."""
+    if not path.exists():
+        return []
+    with open(path) as fd:
+        return [json.loads(line) for line in fd if line.strip()]
+
+
+def baseline(reports, n, part, input_digest, commit=None):
+    """Solve samples of the most recent saved run of part `n``part` over
+    the same input, optionally restricted to runs of `commit` (which
+    may be abbreviated)."""
+    for report in reversed(reports):
+        if commit and not (report.get('commit') or '').startswith(commit):
+            continue
+        for r in report['results']:
+            if (r['day'], r['part'], r['status']) == (n, part, 'ok') and r['input_digest'] == input_digest:
+                return report.get('commit'), r['solve']['samples']
+    return None
+
+
+def u_statistic(xs, ys):
+    """Mann-Whitney U: the number of pairs in which x exceeds y, ties
+    counting a half.
+
+    >>> u_statistic([3, 4, 5], [1, 2, 3])
+    8.5
+    """
+    return sum(1.0 if x > y else 0.5 if x == y else 0.0 for x in xs for y in ys)
+
+
+@cache
+def u_distribution(m, n):
+    """Number of orderings of m x-values and n y-values giving each U.
+
+    >>> u_distribution(2, 2)
+    (1, 1, 2, 1, 1)
+    """
+    if m == 0 or n == 0:
+        return (1,)
+    counts = [0] * (m * n + 1)
+    # either the largest value is an x (beating all n ys) or it is a y
+    for u, c in enumerate(u_distribution(m - 1, n)):
+        counts[u + n] += c
+    for u, c in enumerate(u_distribution(m, n - 1)):
+        counts[u] += c
+    return tuple(counts)
+
+
+def p_slower(xs, ys):
+    """One-sided p-value for `xs` being drawn from a slower
+    distribution than `ys` (exact for small samples, normal
+    approximation otherwise).
+
+    >>> p_slower([6, 7, 8, 9, 10], [1, 2, 3, 4, 5])
+    0.003968253968253968
+    >>> p_slower([1, 2, 3], [4, 5, 6])
+    1.0
+    """
+    m, n = len(xs), len(ys)
+    u = u_statistic(xs, ys)
+    if m * n <= 400:
+        counts = u_distribution(m, n)
+        return sum(counts[math.ceil(u):]) / sum(counts)
+    mean, sd = m * n / 2, math.sqrt(m * n * (m + n + 1) / 12)
+    return 0.5 * math.erfc((u - 0.5 - mean) / (sd * math.sqrt(2)))
+
+
+def smallest_p(m, n):
+    """The smallest p-value `p_slower` can give samples of sizes `m`
+    and `n`, when every x is slower than every y. No smaller `alpha`
+    can be met, however large the slowdown.
+
+    >>> smallest_p(3, 3), smallest_p(10, 10) < 0.001
+    (0.05, True)
+    """
+    return 1 / math.comb(m + n, m)
+
+
+def compare(results, reports, commit=None, threshold=0.1, alpha=0.05):
+    """Compare fresh bench results with the saved baseline for each
+    part, yielding one comparison per part that has a baseline.
+
+    A part regresses when its median solve time is more than
+    `threshold` (a fraction) above the baseline median *and* the rank
+    test says the slowdown is unlikely to be noise. With too few
+    samples for the test to reach `alpha` at all, the comparison is
+    marked `inconclusive` rather than passed.
+    """
+    for r in results:
+        if r['status'] != 'ok':
+            continue
+        found = baseline(reports, r['day'], r['part'], r['input_digest'], commit)
+        if found is None:
+            continue
+        base_commit, base_samples = found
+        samples = r['solve']['samples']
+        before, after = statistics.median(base_samples), r['solve']['median']
+        change = after / before - 1 if before else 0.0
+        p = p_slower(samples, base_samples)
+        inconclusive = smallest_p(len(samples), len(base_samples)) > alpha
+        yield {
+            'day': r['day'],
+            'part': r['part'],
+            'baseline': base_commit,
+            'before': before,
+            'after': after,
+            'change': change,
+            'p': p,
+            'regression': change > threshold and p <= alpha,
+            'inconclusive': inconclusive,
+        }
+
+
+def format_comparison(c):
+    label = f'Day {c["day"]}{c["part"]}'
+    verdict = 'REGRESSION' if c['regression'] else 'too few samples to tell' if c.get('inconclusive') else ''
+    return (f'{label:<8} median {c["before"] * 1000:10.3f}ms -> {c["after"] * 1000:10.3f}ms  '
+            f'{c["change"]:+7.1%}  p={c["p"]:.3f}  {verdict}').rstrip()
@@ -0,0 +1,44 @@
+import glob, importlib, json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from aoc23 import runner
+
+
+def inputs(pattern, days):
+    """(day, path) for every input file to solve: `pattern` is a glob,
+    formatted with `n` for each day so that days can keep their inputs
+    apart (`variants/day{n}/*.txt`)."""
+    for n in days:
+        for path in sorted(glob.glob(pattern.format(n=n))):
+            yield n, path
+
+
+def preload(days):
+    """Pool initialiser importing the solvers once, so that each input
+    a worker takes on only costs its parse and solve."""
+    for n in days:
+        importlib.import_module(f'aoc23.day{n}')
+
+
+def record(result, path):
+    """
+    >>> record(runner.PartResult(3, 'a', 'ok', 4361, 0.25, 0.125), 'day3/test.txt')
+    '{"day": 3, "part": "a", "input": "day3/test.txt", "status": "ok", "answer": 4361, "wall": 0.25, "cpu": 0.125, "error": null, "metrics": null}'
+    """
+    return json.dumps({'day': result.day, 'part': result.part, 'input': path, 'status': result.status,
+                       'answer': result.answer, 'wall': result.wall, 'cpu': result.cpu, 'error': result.error,
+                       'metrics': result.metrics},
+                      default=str)
+
+
+def run_batch(pattern, days, jobs=None):
+    """Solve every part of `days` for each of their inputs across a pool
+    of `jobs` workers, yielding (result, path) as each input is done
+    (its parts sharing one parse)."""
+    days = [n for n in days if runner.parts(n)]
+    with ProcessPoolExecutor(max_workers=jobs or None, initializer=preload, initargs=(days,)) as pool:
+        futures = {pool.submit(runner.run_parts, n, runner.parts(n), (), path): path
+                   for n, path in inputs(pattern, days)}
+        for future in as_completed(futures):
+            for result in future.result():
+                yield result, futures[future]
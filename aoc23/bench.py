@@ -0,0 +1,183 @@
+import ast, doctest, hashlib, importlib, json, os, platform, statistics, subprocess, time, traceback
+from datetime import datetime, timezone
+
+from aoc23 import generate, metrics, runner
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile.
+
+    >>> percentile([5, 1, 4, 2, 3], 95)
+    5
+    >>> percentile([5, 1, 4, 2, 3], 50)
+    3
+    """
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarise(samples):
+    """
+    >>> s = summarise([0.5, 0.25, 0.75, 0.5])
+    >>> s['min'], s['median'], s['p95'], s['stddev']
+    (0.25, 0.5, 0.75, 0.2041241452319315)
+    """
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'p95': percentile(samples, 95),
+        'stddev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'samples': list(samples),
+    }
+
+
+def doctest_input(module, n, part):
+    """The arguments the first doctest of `dayNx` passes to it, or None.
+
+    >>> from aoc23 import day11
+    >>> args, kwargs = doctest_input(day11, 11, 'b')
+    >>> len(args[0]), args[1:], kwargs
+    (10, (10,), {})
+    """
+    solve = getattr(module, f'day{n}{part}')
+    for example in doctest.DocTestParser().get_examples(solve.__doc__ or ''):
+        call = ast.parse(example.source, mode='eval').body
+        if isinstance(call, ast.Call) and getattr(call.func, 'id', None) == solve.__name__:
+            try:
+                args = tuple(doctest_value(module, a) for a in call.args)
+                kwargs = {k.arg: doctest_value(module, k.value) for k in call.keywords if k.arg is not None}
+            except (AttributeError, ValueError):
+                return None
+            return (args, kwargs)
+    return None
+
+
+def doctest_value(module, node):
+    if isinstance(node, ast.Name):
+        return getattr(module, node.id)
+    return ast.literal_eval(node)
+
+
+def digest(lines):
+    return hashlib.sha256('\n'.join(lines).encode()).hexdigest()
+
+
+def commit():
+    """Current commit of the checkout, or None outside git."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=runner.PACKAGE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def machine():
+    return {
+        'node': platform.node(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+    }
+
+
+def bench_part(n, part, repeat=5, warmup=1, test=False, scale=None, seed=0):
+
+    """Time one part `repeat` times after `warmup` untimed runs.
+
+    Each repetition loads the input afresh (untimed), makes the day's
+    model of it with `parse()` (the parse phase) and then calls the
+    part's `solve_<part>()` on that (the solve phase); the two are
+    reported separately, along with the `metrics` of the last
+    repetition.
+
+    With a `scale`, the input is generated (once, untimed) at that
+    multiple of the puzzle input's size rather than read from disk.
+    """
+
+    result = {'day': n, 'part': part, 'status': 'ok'}
+    try:
+        module = importlib.import_module(f'aoc23.day{n}')
+        solve = getattr(module, f'solve_{part}')
+
+        if test:
+            if (found := doctest_input(module, n, part)) is None:
+                return result | {'status': 'skip', 'error': 'no doctest input'}
+            args, kwargs = found
+            data, *extra = args
+            load = lambda: list(data)
+            input_digest = digest(data)
+        elif scale is not None:
+            extra, kwargs = (), {}
+            data = generate.generate(n, scale, seed)
+            load = lambda: runner.parse_lines(module, data)
+            input_digest = digest(data)
+        else:
+            extra, kwargs = (), {}
+            load = lambda: runner.load_input(module, n)
+            input_digest = runner.input_digest(n)
+
+        parse_times, solve_times = [], []
+        answer = None
+        for i in range(warmup + repeat):
+            lines = load()
+            metrics.reset()
+            t0 = time.perf_counter()
+            model = module.parse(lines)
+            t1 = time.perf_counter()
+            answer = solve(model, *extra, **kwargs)
+            t2 = time.perf_counter()
+            if i >= warmup:
+                parse_times.append(t1 - t0)
+                solve_times.append(t2 - t1)
+
+        return result | {
+            'answer': answer,
+            'input_digest': input_digest,
+            'parse': summarise(parse_times),
+            'solve': summarise(solve_times),
+            'metrics': metrics.snapshot(),
+        }
+    except Exception:
+        return result | {'status': 'FAIL', 'error': traceback.format_exc()}
+
+
+def bench(days, repeat=5, warmup=1, test=False, scale=None, seed=0):
+    """Benchmark every part of `days` in turn, yielding each result."""
+    for n in days:
+        for part in runner.parts(n):
+            yield bench_part(n, part, repeat, warmup, test, scale, seed)
+
+
+def report(results, repeat, warmup, test, scale=None, seed=0):
+    return {
+        'commit': commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'machine': machine(),
+        'input': 'test' if test else 'real' if scale is None else f'generated x{scale:g} seed {seed}',
+        'repeat': repeat,
+        'warmup': warmup,
+        'results': results,
+    }
+
+
+def ms(t):
+    return f'{t * 1000:10.3f}ms'
+
+
+def format_result(result):
+    label = f'Day {result["day"]}{result["part"]}'
+    if result['status'] != 'ok':
+        return f'{label:<8} {result["status"]}'
+    s, p = result['solve'], result['parse']
+    return (f'{label:<8} min {ms(s["min"])}  median {ms(s["median"])}  p95 {ms(s["p95"])}  '
+            f'sd {ms(s["stddev"])}  parse {ms(p["median"])}')
+
+
+def write(report, path):
+    if path == '-':
+        print(json.dumps(report, indent=2))
+    else:
+        with open(path, 'w') as fd:
+            json.dump(report, fd, indent=2)
@@ -0,0 +1,80 @@
+import functools, os
+
+# hashlib, pickle and pathlib are only imported once the cache is
+# enabled: every parser is wrapped at import time, but most runs never
+# touch the cache.
+CACHE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.aoc', 'cache')
+VARIABLE = 'AOC_PARSE_CACHE'
+
+
+def enable(directory=CACHE):
+    """Turn on the parse cache for this process and any it starts."""
+    os.environ[VARIABLE] = str(directory)
+
+
+@functools.cache
+def source_digest(module_name):
+    """Digest of the source of the module `module_name` and of the
+    package modules it imports, on which what it makes may depend."""
+    from aoc23 import runner
+    return runner.module_digest(module_name.rpartition('.')[2])
+
+
+def key(fn, args, kwargs):
+    """Digest of the source the function depends on, its name and its
+    arguments.
+
+    Arguments are digested as they pickle, except those with a
+    `cache_key()`, which stands in for them: an object whose pickle
+    would copy a large buffer, or hold state (cached properties, say)
+    that depends on what has been asked of it so far rather than on
+    what it is.
+    """
+    import hashlib, io, pickle
+
+    class Keys(pickle.Pickler):
+        def reducer_override(self, obj):
+            if (cache_key := getattr(type(obj), 'cache_key', None)) is None:
+                return NotImplemented
+            return type(obj), (cache_key(obj),)
+
+    h = hashlib.sha256(source_digest(fn.__module__).encode())
+    h.update(fn.__qualname__.encode())
+    buffer = io.BytesIO()
+    Keys(buffer, pickle.HIGHEST_PROTOCOL).dump((args, kwargs))
+    h.update(buffer.getbuffer())
+    return h.hexdigest()
+
+
+def parsed(fn):
+    """Keep what `fn` parses from its input in an on-disk pickle, so
+    that repeat runs over the same input skip parsing and
+    preprocessing altogether.
+
+    Entries are keyed by the input and the source of the module
+    defining `fn` and of the package modules it imports, so editing any
+    of them or the input misses the cache rather than returning stale
+    structures. The cache is off (and `fn` is called directly) unless
+    `enable()` has been called.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not (directory := os.environ.get(VARIABLE)):
+            return fn(*args, **kwargs)
+        import pickle
+        from pathlib import Path
+        module = fn.__module__.rpartition('.')[2]
+        path = Path(directory) / f'{module}.{fn.__qualname__}.{key(fn, args, kwargs)[:32]}.pickle'
+        try:
+            with open(path, 'rb') as fd:
+                return pickle.load(fd)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+        value = fn(*args, **kwargs)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temp, 'wb') as fd:
+            pickle.dump(value, fd, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, path)
+        return value
+    return wrapper
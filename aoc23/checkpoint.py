@@ -0,0 +1,77 @@
+import os, time
+
+# hashlib and pickle are only imported once a search has run long
+# enough to need them, as in the parse cache.
+CHECKPOINTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.aoc', 'checkpoints')
+VARIABLE = 'AOC_RESUME'
+INTERVAL = 30.0
+
+
+def enable_resume():
+    """Let searches in this process and any it starts pick up from their
+    last checkpoint."""
+    os.environ[VARIABLE] = '1'
+
+
+class Checkpoint:
+
+    """Periodic snapshots of a long search's state, so that a run that
+    is killed can be resumed rather than started over.
+
+    Searches `save()` their state as often as they like (it is only
+    written every `interval` seconds), `load()` it when starting (which
+    gives None unless resuming is enabled and a snapshot exists) and
+    `clear()` it once done. Snapshots are keyed by `name` and the
+    search's `input`, so a changed input starts afresh.
+
+    >>> import tempfile
+    >>> c = Checkpoint('example', [1, 2], interval=0, directory=tempfile.mkdtemp())
+    >>> c.save((1, 'state'))
+    >>> os.environ[VARIABLE] = '1'
+    >>> c.load()
+    (1, 'state')
+    >>> c.clear(); c.load()
+    >>> del os.environ[VARIABLE]
+    """
+
+    def __init__(self, name, input, interval=INTERVAL, directory=CHECKPOINTS):
+        self.name, self.input, self.interval, self.directory = name, input, interval, directory
+        self.due = time.monotonic() + interval
+        self._path = None
+
+    @property
+    def path(self):
+        if self._path is None:
+            import hashlib, pickle
+            digest = hashlib.sha256(pickle.dumps(self.input, pickle.HIGHEST_PROTOCOL)).hexdigest()
+            self._path = os.path.join(self.directory, f'{self.name}.{digest[:32]}.pickle')
+        return self._path
+
+    def load(self):
+        if not os.environ.get(VARIABLE):
+            return None
+        import pickle
+        try:
+            with open(self.path, 'rb') as fd:
+                return pickle.load(fd)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def save(self, state):
+        if time.monotonic() < self.due:
+            return
+        import pickle
+        os.makedirs(self.directory, exist_ok=True)
+        temp = f'{self.path}.{os.getpid()}.tmp'
+        with open(temp, 'wb') as fd:
+            pickle.dump(state, fd, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, self.path)
+        self.due = time.monotonic() + self.interval
+
+    def clear(self):
+        if self._path is None and not os.path.isdir(self.directory):
+            return
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
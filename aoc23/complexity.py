@@ -0,0 +1,74 @@
+import math, statistics
+
+from aoc23 import bench, runner
+
+LADDER = (0.125, 0.25, 0.5, 1.0)
+
+# Expected growth of solve time with input size, where it isn't linear.
+# Part b of day 22 asks, for every brick, how many others would fall;
+# the longest path through day 23's junctions has no better than
+# exponential solution, so it has no expectation to miss.
+EXPECTED = {
+    (22, 'b'): 2.0,
+    (23, 'a'): None,
+    (23, 'b'): None,
+}
+
+
+def exponent(sizes, times):
+    """Least squares fit of k in time ∝ size^k.
+
+    >>> exponent([1, 2, 4], [3.0, 12.0, 48.0])
+    2.0
+    """
+    slope, _ = statistics.linear_regression([math.log(s) for s in sizes], [math.log(t) for t in times])
+    return round(slope, 6)
+
+
+def curve(n, part, ladder=LADDER, repeat=3, seed=0, limit=10.0):
+    """Fastest solve time of a part on generated inputs at each scale of
+    `ladder`, as far up it as the last rung taking under `limit` seconds."""
+    points = []
+    for scale in ladder:
+        result = bench.bench_part(n, part, repeat, 0, scale=scale, seed=seed)
+        if result['status'] != 'ok':
+            return points, result
+        points.append((scale, result['solve']['min']))
+        if result['solve']['min'] > limit:
+            break
+    return points, None
+
+
+def analyse(days, ladder=LADDER, repeat=3, seed=0, limit=10.0, tolerance=0.25):
+    """Fit the scaling exponent of every part of `days`, flagging those
+    growing faster than expected by more than `tolerance`."""
+    for n in days:
+        for part in runner.parts(n):
+            points, failure = curve(n, part, ladder, repeat, seed, limit)
+            expected = EXPECTED.get((n, part), 1.0)
+            result = {'day': n, 'part': part, 'expected': expected, 'points': points,
+                      'exponent': None, 'worse': False}
+            if failure is not None:
+                result |= {'status': failure['status'], 'error': failure.get('error')}
+            elif len(points) < 2:
+                result |= {'status': 'skip', 'error': 'too slow to time more than one size'}
+            else:
+                k = exponent(*zip(*points))
+                result |= {'status': 'ok', 'exponent': k,
+                           'worse': expected is not None and k > expected + tolerance}
+            yield result
+
+
+def format_curve(result):
+    """
+    >>> print(format_curve({'day': 11, 'part': 'a', 'status': 'ok', 'exponent': 2.04, 'expected': 1.0,
+    ...                     'worse': True, 'points': [(0.5, 0.01), (1.0, 0.0412)]}))
+    Day 11a  k  2.04  expected  1.00  WORSE      0.5x    10.000ms      1x    41.200ms
+    """
+    label = f'Day {result["day"]}{result["part"]}'
+    if result['status'] != 'ok':
+        return f'{label:<8} {result["status"]}'
+    expected = '  any' if result['expected'] is None else f'{result["expected"]:5.2f}'
+    points = ''.join(f'  {f"{s:g}x":>6}{bench.ms(t)}' for s, t in result['points'])
+    return (f'{label:<8} k {result["exponent"]:5.2f}  expected {expected}  '
+            f'{"WORSE" if result["worse"] else "":<7}{points}')
@@ -0,0 +1,144 @@
+"""A resident solver, answering requests over a local Unix socket.
+
+Each request is a line of JSON, `{"day": 12, "part": "a", "input": path}`
+(`input` defaults to the puzzle input), answered by a line of JSON in the
+form `aoc batch` writes. A connection can send any number of requests,
+which are answered in order; requests on different connections run
+concurrently on a pool of workers.
+
+The workers import every solver when they start and keep the models
+they have parsed of each input, so a request costs no more than the
+solve itself. The daemon remembers the answers it has given until an
+input changes, and starts a new pool of workers if one dies.
+"""
+
+import hashlib, json, os, signal, socket, socketserver, sys, threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from aoc23 import batch, memo, registry, runner
+
+SOCKET = runner.PACKAGE.parent / '.aoc' / 'daemon.sock'
+
+# each worker's parsed models, by day and input digest
+MODELS = memo.Memo('models', maxsize=32)
+
+
+def locate(module, n, path):
+    """Input loader for `run_part` leaving the input to `warm_model`."""
+    return n, path
+
+
+def warm_model(module, located):
+    """Parser for `run_part` reusing the model this worker made of the
+    same input before."""
+    n, path = located
+    with open(path, 'rb') as fd:
+        digest = hashlib.file_digest(fd, 'sha256').hexdigest()
+    return MODELS.get((n, digest), parse, module, n, path)
+
+
+def parse(module, n, path):
+    return module.parse(runner.load_input(module, n, path))
+
+
+class Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        assert isinstance(self.server, Daemon)
+        for line in self.rfile:
+            if line.strip():
+                self.wfile.write(self.server.answer(line).encode() + b'\n')
+                self.wfile.flush()
+
+
+class Daemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+
+    daemon_threads = True
+
+    def __init__(self, path: str | os.PathLike = SOCKET, jobs=None):
+        self.jobs = jobs
+        self.pool = self.start()
+        self.restarting = threading.Lock()
+        self.answers = {}
+        super().__init__(os.fspath(path), Handler)
+
+    def start(self):
+        return ProcessPoolExecutor(max_workers=self.jobs or None, initializer=batch.preload,
+                                   initargs=(registry.days(),))
+
+    def restart(self, pool):
+        """Start a new pool in place of `pool`, broken by a worker dying,
+        unless another request has already."""
+        with self.restarting:
+            if self.pool is pool:
+                self.pool = self.start()
+                pool.shutdown(wait=False)
+
+    def solve(self, n, part, path):
+        """Run the part on the pool. A part that a worker dies running
+        fails; one sent to a pool already broken goes to a new one."""
+        while True:
+            pool = self.pool
+            try:
+                future = pool.submit(runner.run_part, n, part, (), path, locate, warm_model)
+            except BrokenProcessPool:
+                self.restart(pool)
+                continue
+            try:
+                return future.result()
+            except BrokenProcessPool as e:
+                self.restart(pool)
+                return runner.PartResult(n, part, 'FAIL', error=f'worker died: {e}')
+
+    def answer(self, line):
+        try:
+            request = json.loads(line)
+            n, part = int(request['day']), request['part']
+            path = str(request.get('input') or runner.input_path(n))
+            if part not in runner.parts(n):
+                raise ValueError(f'no part {part!r} for day {n}')
+            stat = os.stat(path)
+        except (KeyError, TypeError, ValueError, OSError) as e:
+            return json.dumps({'status': 'FAIL', 'error': f'bad request: {e}'})
+        key = (n, part, path, stat.st_mtime_ns, stat.st_size)
+        if key in self.answers:
+            return batch.record(runner.PartResult(n, part, 'cached', self.answers[key]), path)
+        result = self.solve(n, part, path)
+        if result.ok:
+            self.answers[key] = result.answer
+        return batch.record(result, path)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(cancel_futures=True)
+
+
+def serve(path=SOCKET, jobs=None):
+    """Run the daemon until interrupted or terminated."""
+    path = os.fspath(path)
+    if os.path.exists(path):
+        with socket.socket(socket.AF_UNIX) as s:
+            if s.connect_ex(path) == 0:
+                raise RuntimeError(f'a daemon is already listening on {path}')
+        os.unlink(path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+    with Daemon(path, jobs) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+
+
+def query(requests, path=SOCKET):
+    """Send `requests` to the daemon, yielding its answer to each."""
+    with socket.socket(socket.AF_UNIX) as s:
+        s.connect(os.fspath(path))
+        with s.makefile('rw') as fd:
+            for request in requests:
+                fd.write(json.dumps(request) + '\n')
+                fd.flush()
+                yield json.loads(fd.readline())
@@ -1,4 +1,6 @@
-import re
+import functools, re
+
+from aoc23 import inputs
 
 
 def process_line_a(line):
@@ -10,21 +12,32 @@ def process_line_a(line):
     return first * 10 + last
 
 
+def parse(lines):
+    return list(lines)
+
+
+def solve_a(lines):
+    return sum([process_line_a(line) for line in lines])
+
+
 def day1a(lines):
     """
     >>> day1a(['1abc2','pqr3stu8vwx','a1b2c3d4e5f','treb7uchet'])
     142
     """
-    return sum([process_line_a(line) for line in lines])
+    return solve_a(parse(lines))
 
 
-digit_matcher = re.compile("one|two|three|four|five|six|seven|eight|nine|[0-9]")
+@functools.cache
+def digit_matcher():
+    return re.compile("one|two|three|four|five|six|seven|eight|nine|[0-9]")
 
 
 def day1b_digit_strings(line):
+    matcher = digit_matcher()
     digit_matches = []
     for i in range(0, len(line)):
-        m = digit_matcher.match(line[i:])
+        m = matcher.match(line[i:])
         if m:
             digit_matches.append(m.group(0))
     return digit_matches
@@ -63,18 +76,26 @@ def process_line_b(line):
     return first * 10 + last
 
 
+def solve_b(lines):
+    return sum([process_line_b(line) for line in lines])
+
+
 def day1b(lines):
     """
     >>> day1b(['two1nine','eightwothree','abcone2threexyz','xtwone3four','4nineeightseven2','zoneight234','7pqrstsixteen'])
     281
     """
-    return sum([process_line_b(line) for line in lines])
+    return solve_b(parse(lines))
+
+
+read_input = inputs.lines
 
 
 def main():
-    lines = list(open("aoc23/data/day1input.txt"))
-    print(f"Day 1a: {day1a(lines)}")
-    print(f"Day 1b: {day1b(lines)}")
+    with open("aoc23/data/day1input.txt") as fd:
+        lines = parse(read_input(fd))
+    print(f"Day 1a: {solve_a(lines)}")
+    print(f"Day 1b: {solve_b(lines)}")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,8 @@
-from typing import NamedTuple, List
-from enum import Enum
 from itertools import takewhile
 from operator import eq
 
+from aoc23.grid import Grid, N, E, S, W
+
 TEST_INPUT_1 = [
     '-L|F7',
     '7S-7|',
@@ -58,72 +58,44 @@ TEST_INPUT_5 = [
 ]
 
 
-class Direction(Enum):
-    N = 0
-    S = 1
-    E = 2
-    W = 4
-
-N,S,E,W = [Direction.N, Direction.S, Direction.E, Direction.W]
-
-class Pos(NamedTuple):
-    x: int
-    y: int
-
-    def move(self, d):
-        match d:
-            case Direction.N: return Pos(self.x, self.y - 1)
-            case Direction.S: return Pos(self.x, self.y + 1)
-            case Direction.E: return Pos(self.x + 1, self.y)
-            case Direction.W: return Pos(self.x - 1, self.y)
+# The direction each pipe is left in, by the direction (N, E, S, W)
+# it is entered travelling in, or None where it can't be entered so.
+PIPES = {
+    '|': (N, None, S, None),
+    '-': (None, E, None, W),
+    'F': (E, None, None, S),
+    '7': (W, S, None, None),
+    'J': (None, N, W, None),
+    'L': (None, None, E, N),
+}
+EXITS = [PIPES.get(chr(c), (None,) * 4) for c in range(256)]
 
 
 class Puzzle:
 
+    # positions are indexes into the grid's cells
+
     def __init__(self, lines):
-        self.lines = [line.strip() for line in lines]
-        self.start = self.find_start()
+        # padded with ground, which no pipe enters, so moves needn't be bounded
+        self.grid = Grid(lines, pad=1)
+        self.start = self.grid.index(*self.grid.find('S'))
         self.dirs = set(self.available_directions(self.start))
 
     def __getitem__(self, pos):
-        return self.lines[pos.y][pos.x]
-
-    def find_start(self):
-        for y, line in enumerate(self.lines):
-            for x, c in enumerate(line):
-                if c == 'S':
-                    return Pos(x, y)
-
-    def available_directions(self, pos) -> List[Direction]:
-        dirs = [
-            self.enter(N, pos.move(N)) and N,
-            self.enter(S, pos.move(S)) and S,
-            self.enter(E, pos.move(E)) and E,
-            self.enter(W, pos.move(W)) and W]
-        return [d for d in dirs if d]
-
-    def enter(self, entry_dir, pos) -> tuple[Direction, Pos] | None:
-
-        match entry_dir, self[pos]:
-            case (Direction.N, '|'): exit_dir = N
-            case (Direction.S, '|'): exit_dir = S
-            case (Direction.E, '-'): exit_dir = E
-            case (Direction.W, '-'): exit_dir = W
-            case (Direction.N, 'F'): exit_dir = E
-            case (Direction.W, 'F'): exit_dir = S
-            case (Direction.E, '7'): exit_dir = S
-            case (Direction.N, '7'): exit_dir = W
-            case (Direction.S, 'J'): exit_dir = W
-            case (Direction.E, 'J'): exit_dir = N
-            case (Direction.S, 'L'): exit_dir = E
-            case (Direction.W, 'L'): exit_dir = N
-            case _: return None
-
-        return (exit_dir, pos.move(exit_dir))
+        return chr(self.grid.cells[pos])
+
+    def available_directions(self, pos):
+        return [d for d in (N, S, E, W) if self.enter(d, pos + self.grid.offsets[d])]
+
+    def enter(self, entry_dir, pos):
+        exit_dir = EXITS[self.grid.cells[pos]][entry_dir]
+        if exit_dir is None:
+            return None
+        return (exit_dir, pos + self.grid.offsets[exit_dir])
 
     def follow(self, init_dir, start):
         dir = init_dir
-        dest = start.move(init_dir)
+        dest = start + self.grid.offsets[init_dir]
         yield dest
         while t := self.enter(dir, dest):
             dir, dest = t
@@ -151,20 +123,21 @@ class Puzzle:
             if pos == self.start:
                 break
             path[pos] = self[pos]
-        width = len(self.lines[0])
-        height = len(self.lines)
-        return LoopMap(width, height, path).inside_count()
+        return LoopMap(self.grid, path).inside_count()
 
 class LoopMap:
 
-    def __init__(self, width, height, path):
-        self.grid = [['.' if Pos(x, y) not in path else path[Pos(x, y)] for x in range(width)] for y in range(height)]
+    def __init__(self, grid, path):
+        # the loop's pipes, at their positions in `grid`, on bare ground
+        self.grid = Grid.blank(grid.width, grid.height, grid.pad)
+        for pos, c in path.items():
+            self.grid.cells[pos] = ord(c)
 
     def __getitem__(self, pos):
-        return self.grid[pos.y][pos.x]
+        return chr(self.grid.cells[pos])
 
     def __setitem__(self, pos, value):
-        self.grid[pos.y][pos.x] = value
+        self.grid.cells[pos] = ord(value)
 
     def count_row_insides(self, row):
         state = []
@@ -184,7 +157,19 @@ class LoopMap:
         return count
 
     def inside_count(self):
-        return sum(self.count_row_insides(r) for r in self.grid)
+        return sum(self.count_row_insides(r) for r in self.grid.rows())
+
+def parse(lines):
+    return Puzzle(lines)
+
+
+def solve_a(puzzle):
+    return puzzle.a()
+
+
+def solve_b(puzzle):
+    return puzzle.b()
+
 
 def day10a(lines):
     """
@@ -193,7 +178,7 @@ def day10a(lines):
     >>> day10a(TEST_INPUT_2)
     8
     """
-    return Puzzle(lines).a()
+    return solve_a(parse(lines))
 
 
 def day10b(lines):
@@ -205,14 +190,14 @@ def day10b(lines):
     >>> day10b(TEST_INPUT_5)
     10
     """
-    return Puzzle(lines).b()
+    return solve_b(parse(lines))
 
 
 def main():
     with open('aoc23/data/day10input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 10a: {day10a(lines)}')
-    print(f'Day 10b: {day10b(lines)}')
+        puzzle = parse(list(fd))
+    print(f'Day 10a: {solve_a(puzzle)}')
+    print(f'Day 10b: {solve_b(puzzle)}')
 
 
 if __name__ == '__main__':
@@ -2,6 +2,8 @@ import re
 from typing import NamedTuple
 from itertools import accumulate, combinations
 
+from aoc23 import cache
+
 TEST_INPUT = [
     '...#......',
     '.......#..',
@@ -38,15 +40,25 @@ class Universe:
         return (manhattan_distance(a, b) for a, b in combinations(self.galaxies, 2))
 
     @staticmethod
+    @cache.parsed
     def parse(lines):
         return Universe(sum([[(m.start(), y) for m in re.finditer(r'\#', line)] for y, line in enumerate(lines)], []))
 
+def parse(lines):
+    return Universe.parse(lines)
+
+def solve_a(universe):
+    return sum(universe.expanded().distances())
+
+def solve_b(universe, n = 1_000_000):
+    return sum(universe.expanded(n).distances())
+
 def day11a(lines):
     """
     >>> day11a(TEST_INPUT)
     374
     """
-    return sum(Universe.parse(lines).expanded().distances())
+    return solve_a(parse(lines))
 
 
 def day11b(lines, n = 1_000_000):
@@ -56,14 +68,14 @@ def day11b(lines, n = 1_000_000):
     >>> day11b(TEST_INPUT, 100)
     8410
     """
-    return sum(Universe.parse(lines).expanded(n).distances())
+    return solve_b(parse(lines), n)
 
 
 def main():
     with open('aoc23/data/day11input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 11a: {day11a(lines)}')
-    print(f'Day 11b: {day11b(lines)}')
+        universe = parse(list(fd))
+    print(f'Day 11a: {solve_a(universe)}')
+    print(f'Day 11b: {solve_b(universe)}')
 
 
 if __name__ == '__main__':
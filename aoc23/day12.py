@@ -2,6 +2,8 @@ import re
 from functools import reduce
 import operator
 
+from aoc23 import checkpoint, inputs, memo, progress
+
 TEST_INPUT = [
     '???.### 1,1,3',
     '.??..??...?##. 1,1,3',
@@ -91,13 +93,13 @@ class FloorPlan:
     """(Degraded) floorplan of one unit of the hot spring (consisting
     of '.', '#', '?).
 
-    Also caches results of pattern matches against the plan to track
-    number of ways that a given pattern can match against this plan.
+    The number of ways that a given pattern can match against a plan
+    is held in `WAYS`, by the plan's text, so that rows sharing a plan
+    (and later runs, with `aoc run --memo`) share the matching.
     """
 
     def __init__(self, text):
         self.text = text
-        self.ways = {}
 
     def accommodations(self, counts) -> int:
         """
@@ -106,13 +108,16 @@ class FloorPlan:
         >>> FloorPlan('???').accommodations((0, '-'))
         1
         """
-        if counts not in self.ways:
-            self.ways[counts] = len(list(Pattern(counts).matches(self.text)))
-        return self.ways[counts]
+        return WAYS.get((self.text, counts), self.ways, counts)
+
+    def ways(self, counts):
+        return len(list(Pattern(counts).matches(self.text)))
 
     def __repr__(self):
         return f'<FloorPlan {self.text}>'
 
+WAYS = memo.Memo('ways', maxsize=1 << 19, persist=__name__)
+
 def matches(plan: str, pattern: list[str], prefix: str):
 
     """
@@ -260,12 +265,34 @@ class UnfoldedRow:
         return UnfoldedRow(plan, [int(n) for n in counts.split(',')])
 
 
+def parse(lines):
+    return [(plan, [int(n) for n in counts.split(',')]) for plan, counts in (line.split() for line in lines)]
+
+
+def solve_a(rows):
+    return sum(len(SimpleRow(*row).solutions()) for row in rows)
+
+
+def solve_b(rows):
+    # This one takes a long time but does return... there were better
+    # ways to do it
+    saved = checkpoint.Checkpoint('day12b', rows)
+    done, total = saved.load() or (0, 0)
+    for i, row in enumerate(rows[done:], start=done + 1):
+        total += UnfoldedRow(*row).possibilities()
+        progress.report('rows', i, len(rows), partial_sum=total)
+        saved.save((i, total))
+    saved.clear()
+    WAYS.save()
+    return total
+
+
 def day12a(lines):
     """
     >>> day12a(TEST_INPUT)
     21
     """
-    return sum(len(SimpleRow.parse(line).solutions()) for line in lines)
+    return solve_a(parse(lines))
 
 
 def day12b(lines):
@@ -273,16 +300,17 @@ def day12b(lines):
     >>> day12b(TEST_INPUT)
     525152
     """
-    # This one takes a long time but does return... there were better
-    # ways to do it
-    return sum(UnfoldedRow.parse(line).possibilities() for line in lines)
+    return solve_b(parse(lines))
+
+
+read_input = inputs.lines
 
 
 def main():
     with open('aoc23/data/day12input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 12a: {day12a(lines)}')
-    print(f'Day 12b: {day12b(lines)}')
+        rows = parse(read_input(fd))
+    print(f'Day 12a: {solve_a(rows)}')
+    print(f'Day 12b: {solve_b(rows)}')
 
 
 if __name__ == '__main__':
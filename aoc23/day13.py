@@ -1,5 +1,7 @@
 from itertools import groupby
 
+from aoc23.grid import Grid
+
 TEST_INPUT = [
     '#.##..##.',
     '..#.##.#.',
@@ -66,8 +68,9 @@ def find_smudged_reflection(values):
 class Puzzle:
 
     def __init__(self, lines):
-        self.rows = [line.strip() for line in lines]
-        self.cols = [''.join(row[n] for row in self.rows) for n in range(len(self.rows[0]))]
+        grid = Grid(lines)
+        self.rows = [grid.row(y).tobytes() for y in range(grid.height)]
+        self.cols = [grid.column(x).tobytes() for x in range(grid.width)]
 
     def solution_a(self):
         return find_reflection([hash(c) for c in self.cols]) or (100 * (find_reflection([hash(r) for r in self.rows]) or 0))
@@ -75,13 +78,21 @@ class Puzzle:
     def solution_b(self):
         return find_smudged_reflection(self.cols) or (100 * (find_smudged_reflection(self.rows) or 0))
 
+def parse(lines):
+    return [Puzzle(block) for k, block in groupby((x.strip() for x in lines), key = lambda x: len(x)) if k]
+
+def solve_a(puzzles):
+    return sum(puzzle.solution_a() for puzzle in puzzles)
+
+def solve_b(puzzles):
+    return sum(puzzle.solution_b() for puzzle in puzzles)
+
 def day13a(lines):
     """
     >>> day13a(TEST_INPUT)
     405
     """
-    puzzles = [Puzzle(block) for k, block in groupby((x.strip() for x in lines), key = lambda x: len(x)) if k]
-    return sum(puzzle.solution_a() for puzzle in puzzles)
+    return solve_a(parse(lines))
 
 
 def day13b(lines):
@@ -89,14 +100,13 @@ def day13b(lines):
     >>> day13b(TEST_INPUT)
     400
     """
-    puzzles = [Puzzle(block) for k, block in groupby((x.strip() for x in lines), key = lambda x: len(x)) if k]
-    return sum(puzzle.solution_b() for puzzle in puzzles)
+    return solve_b(parse(lines))
 
 def main():
     with open('aoc23/data/day13input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 13a: {day13a(lines)}')
-    print(f'Day 13b: {day13b(lines)}')
+        puzzles = parse(list(fd))
+    print(f'Day 13a: {solve_a(puzzles)}')
+    print(f'Day 13b: {solve_b(puzzles)}')
 
 if __name__ == '__main__':
     main()
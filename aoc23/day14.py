@@ -1,5 +1,6 @@
 from typing import NamedTuple
-from collections import Counter
+
+from aoc23.grid import Grid
 
 TEST_INPUT = [
     'O....#....',
@@ -54,53 +55,38 @@ CYCLE_3 = [
 ]
 
 def tilt(items):
-    balls = gaps = 0
-    output = []
-    for item in items:
-        match item:
-            case '.': gaps += 1
-            case 'O': balls += 1
-            case '#':
-                output.extend(gaps * ['.'] + balls * ['O'] + ['#'])
-                gaps = balls = 0
-    output.extend(gaps * ['.'] + balls * ['O'])
-
-    return output
+    """Roll the balls of `items` (a view of a row or column of the
+    platform) to its end, in place.
+
+    >>> items = memoryview(bytearray(b'O.O#.O.'))
+    >>> tilt(items); bytes(items)
+    b'.OO#..O'
+    """
+    items[:] = b'#'.join(b'.' * (len(run) - run.count(b'O')) + b'O' * run.count(b'O')
+                         for run in items.tobytes().split(b'#'))
 
 class Puzzle:
 
     def __init__(self, lines):
-        self.rows = [list(row.strip()) for row in lines]
-
-    def __getitem__(self, key):
-        x, y = key
-        if isinstance(y, slice):
-            return [r[x] for r in self.rows[y]]
-        else:
-            return self.rows[y][x]
-
-    def __setitem__(self, key, val):
-        x, y = key
-        if isinstance(y, slice):
-            for i, r in enumerate(self.rows[y]):
-                 r[x] = val[i]
-        else:
-            self.rows[y][x] = val
+        self.grid = Grid(lines)
+
+    def copy(self):
+        return Puzzle(self.grid.rows())
 
     def tilt_n(self):
-        for x in range(len(self.rows[0])): self[x, ::-1] = tilt(self[x, ::-1])
+        for x in range(self.grid.width): tilt(self.grid.column(x)[::-1])
         return self
 
     def tilt_s(self):
-        for x in range(len(self.rows[0])): self[x, :] = tilt(self[x, :])
+        for x in range(self.grid.width): tilt(self.grid.column(x))
         return self
 
     def tilt_e(self):
-        for y in range(len(self.rows)): self[:, y] = tilt(self[:, y])
+        for y in range(self.grid.height): tilt(self.grid.row(y))
         return self
 
     def tilt_w(self):
-        for y in range(len(self.rows)): self[::-1, y] = tilt(self[::-1, y])
+        for y in range(self.grid.height): tilt(self.grid.row(y)[::-1])
         return self
 
     def step(self):
@@ -141,20 +127,31 @@ class Puzzle:
         return self
 
     def evaluate_load(self):
-        return sum((i+1) * Counter(r)['O'] for i, r in enumerate(self.rows[::-1]))
+        return sum((self.grid.height - y) * self.grid.row(y).tobytes().count(b'O') for y in range(self.grid.height))
 
     def __eq__(self, other):
-        return self.rows == other.rows
+        return self.grid == other.grid
 
     def __hash__(self):
-        return hash(tuple(tuple(row) for row in self.rows))
+        return hash(bytes(self.grid.cells))
+
+def parse(lines):
+    return Puzzle(lines)
+
+# tilting works in place, so each part tilts a copy of the platform
+
+def solve_a(puzzle):
+    return puzzle.copy().tilt_n().evaluate_load()
+
+def solve_b(puzzle):
+    return puzzle.copy().run(1_000_000_000).evaluate_load()
 
 def day14a(lines):
     """
     >>> day14a(TEST_INPUT)
     136
     """
-    return Puzzle(lines).tilt_n().evaluate_load()
+    return solve_a(parse(lines))
 
 
 def day14b(lines):
@@ -162,13 +159,13 @@ def day14b(lines):
     >>> day14b(TEST_INPUT)
     64
     """
-    return Puzzle(lines).run(1_000_000_000).evaluate_load()
+    return solve_b(parse(lines))
 
 def main():
     with open('aoc23/data/day14input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 14a: {day14a(lines)}')
-    print(f'Day 14b: {day14b(lines)}')
+        puzzle = parse(list(fd))
+    print(f'Day 14a: {solve_a(puzzle)}')
+    print(f'Day 14b: {solve_b(puzzle)}')
 
 if __name__ == '__main__':
     main()
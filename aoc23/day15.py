@@ -1,4 +1,4 @@
-import re
+import functools, re
 
 TEST_INPUT = [
     'rn=1',
@@ -30,17 +30,19 @@ def hash(step):
     return val
 
 
-op_re = re.compile(r'(.+?)(?:(-)|=(\d+))')
+@functools.cache
+def op_re():
+    return re.compile(r'(.+?)(?:(-)|=(\d+))')
 
 
-def parse(step):
+def parse_step(step):
     """
-    >>> parse('rn=1')
+    >>> parse_step('rn=1')
     ('rn', 1)
-    >>> parse('qp-')
+    >>> parse_step('qp-')
     ('qp', '-')
     """
-    k, pop, put = op_re.match(step).groups()
+    k, pop, put = op_re().match(step).groups()
     return (k, pop or int(put))
 
 
@@ -73,12 +75,32 @@ class HashMap:
         return n
 
 
+def parse(steps):
+    return list(steps)
+
+
+def solve_a(steps):
+    return sum(hash(step) for step in steps)
+
+
+def solve_b(steps):
+    m = HashMap()
+    for s in steps:
+        k, v = parse_step(s)
+        if v == '-':
+            del m[k]
+        else:
+            m[k] = v
+
+    return m.power()
+
+
 def day15a(steps):
     """
     >>> day15a(TEST_INPUT)
     1320
     """
-    return sum(hash(step) for step in steps)
+    return solve_a(parse(steps))
 
 
 def day15b(steps):
@@ -86,22 +108,18 @@ def day15b(steps):
     >>> day15b(TEST_INPUT)
     145
     """
-    m = HashMap()
-    for s in steps:
-        k, v = parse(s)
-        if v == '-':
-            del m[k]
-        else:
-            m[k] = v
+    return solve_b(parse(steps))
 
-    return m.power()
+
+def read_input(fd):
+    return [s.strip() for s in fd.read().split(',')]
 
 
 def main():
     with open('aoc23/data/day15input.txt') as fd:
-        steps = [s.strip() for s in fd.read().split(',')]
-    print(f'Day 15a: {day15a(steps)}')
-    print(f'Day 15b: {day15b(steps)}')
+        steps = parse(read_input(fd))
+    print(f'Day 15a: {solve_a(steps)}')
+    print(f'Day 15b: {solve_b(steps)}')
 
 
 if __name__ == '__main__':
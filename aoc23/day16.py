@@ -1,5 +1,5 @@
-from enum import IntFlag, auto
-from typing import NamedTuple
+from aoc23 import progress
+from aoc23.grid import Grid, N, E, S, W, REVERSE
 
 TEST_INPUT = [
     r'.|...\....',
@@ -14,144 +14,116 @@ TEST_INPUT = [
     r'..//.|....',
 ]
 
-class Direction(IntFlag):
-    N = auto()
-    S = auto()
-    E = auto()
-    W = auto()
-
-    def exits(self, widget):
-        match widget:
-            case '.':
-                return self
-            case '\\':
-                match self:
-                    case Direction.N: return Direction.W
-                    case Direction.S: return Direction.E
-                    case Direction.E: return Direction.S
-                    case Direction.W: return Direction.N
-            case '/':
-                match self:
-                    case Direction.N: return Direction.E
-                    case Direction.S: return Direction.W
-                    case Direction.E: return Direction.N
-                    case Direction.W: return Direction.S
-            case '-':
-                match self:
-                    case Direction.N: return [Direction.W, Direction.E]
-                    case Direction.S: return [Direction.W, Direction.E]
-                    case _: return self
-            case '|':
-                match self:
-                    case Direction.E: return [Direction.N, Direction.S]
-                    case Direction.W: return [Direction.N, Direction.S]
-                    case _: return self
-            case _:
-                print(self, widget)
-
-
-    def __str__(self):
-        if self ==  Direction(0):
-            return '.'
-        else:
-            n = len(list(self))
-            if n == 1:
-                return '#'
-            else:
-                return f'{n}'
-
-class Pos(NamedTuple):
-    x: int
-    y: int
-
-    def move(self, direction):
-        match direction:
-            case Direction.N: return Pos(self.x, self.y - 1)
-            case Direction.S: return Pos(self.x, self.y + 1)
-            case Direction.E: return Pos(self.x + 1, self.y)
-            case Direction.W: return Pos(self.x - 1, self.y)
-
-    def in_bounds(self, width, height):
-        return (0 <= self.x < width) and (0 <= self.y < height)
+# The directions a beam leaves each widget in, by the direction (N, E,
+# S, W) it enters it travelling in; nothing leaves the border.
+WIDGETS = {
+    '.': ((N,), (E,), (S,), (W,)),
+    '\\': ((W,), (S,), (E,), (N,)),
+    '/': ((E,), (N,), (W,), (S,)),
+    '-': ((W, E), (E,), (W, E), (W,)),
+    '|': ((N,), (N, S), (S,), (N, S)),
+}
+EDGE = ' '
+EXITS = [WIDGETS.get(chr(c), ((), (), (), ())) for c in range(256)]
 
 class Track:
 
-    def __init__(self, width, height):
-        self.track = [[Direction(0)] * width for i in range(height)]
+    # each cell holds a bit for each direction followed through it
+
+    def __init__(self, grid):
+        self.track = Grid.blank(grid.width, grid.height, grid.pad, fill='\0')
         self.entries = []
 
     def __getitem__(self, pos):
-        x, y = pos
-        return self.track[y][x]
+        return self.track.cells[pos]
 
     def __setitem__(self, pos, val):
-        x, y = pos
-        self.track[y][x] = val
+        self.track.cells[pos] = val
 
     def active_count(self):
-        n = 0
-        for row in self.track:
-            for d in row:
-                if d != Direction(0):
-                    n += 1
-        return n
+        return self.track.width * self.track.height - self.track.count('\0')
 
     def add_entry(self, entry):
         self.entries.append(entry)
 
     def dump(self):
-        for line in self.track:
-            print(''.join(str(dir) for dir in line))
-
-def flip_to_entry(pos, direction):
-    match direction:
-        case Direction.N:
-            return (pos.move(Direction.S), Direction.S)
-        case Direction.S:
-            return (pos.move(Direction.N), Direction.N)
-        case Direction.E:
-            return (pos.move(Direction.W), Direction.W)
-        case Direction.W:
-            return (pos.move(Direction.E), Direction.E)
+        for y in range(self.track.height):
+            print(''.join('.' if d == 0 else '#' if d.bit_count() == 1 else str(d.bit_count())
+                          for d in self.track.row(y)))
 
 class Puzzle:
 
+    # positions are indexes into the grid's cells
+
     def __init__(self, lines):
-        self.lines = [list(line.strip()) for line in lines]
-        self.height = len(self.lines)
-        self.width = len(self.lines[0])
-        self.track = Track(self.width, self.height)
+        # bordered so that a beam leaving the grid can be seen to
+        self.grid = Grid(lines, pad=1, fill=EDGE)
+        self.height = self.grid.height
+        self.width = self.grid.width
+        self.track = Track(self.grid)
 
     def __getitem__(self, pos):
-        x, y = pos
-        return self.lines[y][x]
+        return chr(self.grid.cells[pos])
 
     def enter(self, pos, direction):
-        if not pos.in_bounds(self.width, self.height):
-            self.track.add_entry(flip_to_entry(pos, direction))
-            return []
-        if self.track[pos] & direction: # already followed
-            return []
-        self.track[pos] |= direction
-        return direction.exits(self[pos])
+        widget = self.grid.cells[pos]
+        if widget == ord(EDGE):
+            # a beam could enter where this one left, going the other way
+            back = REVERSE[direction]
+            self.track.add_entry((pos + self.grid.offsets[back], back))
+            return ()
+        followed = self.track[pos]
+        if followed >> direction & 1: # already followed
+            return ()
+        self.track[pos] = followed | 1 << direction
+        return EXITS[widget][direction]
 
     def reset(self):
-        self.track = Track(self.width, self.height)
+        self.track = Track(self.grid)
 
-    def trace(self, start = (Pos(0, 0), Direction.E)):
-        todo = [start]
+    def trace(self, start = None):
+        offsets = self.grid.offsets
+        todo = [start or (self.grid.index(0, 0), E)]
         while todo:
             pos, dir = todo.pop(0)
-            todo.extend((pos.move(dir), dir) for dir in self.enter(pos, dir))
+            todo.extend((pos + offsets[dir], dir) for dir in self.enter(pos, dir))
         return self.track
 
 
+def parse(lines):
+    return Puzzle(lines)
+
+
+def solve_a(p):
+    p.reset()
+    return p.trace().active_count()
+
+
+def solve_b(p):
+    tracks = {}
+
+    index = p.grid.index
+    entries = [(index(x, 0), S) for x in range(p.width)] + \
+        [(index(x, p.height - 1), N) for x in range(p.width)] + \
+        [(index(0, y), E) for y in range(p.height)] + \
+        [(index(p.width - 1, y), W) for y in range(p.height)]
+
+    for i, e in enumerate(entries, start=1):
+        progress.report('entries', i, len(entries))
+        if e not in tracks:
+            p.reset()
+            p.trace(start = e)
+            tracks |= {k: p.track for k in p.track.entries}
+
+    return max(t.active_count() for t in tracks.values())
+
+
 def day16a(lines):
     """
     >>> day16a(TEST_INPUT)
     46
     """
-    return Puzzle(lines).trace().active_count()
+    return solve_a(parse(lines))
 
 
 def day16b(lines):
@@ -159,28 +131,14 @@ def day16b(lines):
     >>> day16b(TEST_INPUT)
     51
     """
-    p = Puzzle(lines)
-    tracks = {}
-
-    entries = [(Pos(x, 0), Direction.S) for x in range(p.width)] + \
-        [(Pos(x, p.height - 1), Direction.N) for x in range(p.width)] + \
-        [(Pos(0, y), Direction.E) for y in range(p.height)] + \
-        [(Pos(p.width - 1, y), Direction.W) for y in range(p.height)]
-
-    for e in entries:
-        if e not in tracks:
-            p.reset()
-            p.trace(start = e)
-            tracks |= {k: p.track for k in p.track.entries}
-
-    return max(t.active_count() for t in tracks.values())
+    return solve_b(parse(lines))
 
 
 def main():
     with open('aoc23/data/day16input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 16a: {day16a(lines)}')
-    print(f'Day 16b: {day16b(lines)}')
+        p = parse(list(fd))
+    print(f'Day 16a: {solve_a(p)}')
+    print(f'Day 16b: {solve_b(p)}')
 
 
 # if __name__ == '__main__':
@@ -1,8 +1,5 @@
-import heapq, functools
-from typing import NamedTuple
-from enum import Enum
-from dataclasses import dataclass
-from itertools import count
+from aoc23 import search
+from aoc23.grid import Grid, N, E, S, W
 
 TEST_INPUT = [
     '2413432311323',
@@ -20,153 +17,84 @@ TEST_INPUT = [
     '4322674655533',
 ]
 
-class Pos(NamedTuple):
-    x: int
-    y: int
+OUTSIDE = '\0'
 
-    def move_n(self, m):
-        d, n = m
-        dx, dy = d.value
-        return Pos(self.x + n * dx, self.y + n * dy)
+# A state of the search is the block the crucible is on and whether it
+# got there moving across (0) or up and down (1), packed into an int
+# as pos * 2 + axis. From one it must turn, moving along the other axis.
+TURNS = ((N, S), (E, W))
 
-class Dir(Enum):
-    N = (0, -1)
-    S = (0, +1)
-    E = (+1, 0)
-    W = (-1, 0)
+class Plan:
 
-    def reverse(self):
-        x, y = self.value
-        return Dir((-x, -y))
+    # positions are indexes into the grid's cells
 
-    def __repr__(self):
-        return self.name
+    def __init__(self, lines):
+        # bordered so that a move running off the edge can be seen to
+        self.grid = Grid(lines, pad=1, fill=OUTSIDE)
+        self.width = self.grid.width
+        self.height = self.grid.height
+        self.start = self.grid.index(0, 0)
+        self.end = self.grid.index(self.width - 1, self.height - 1)
 
-class Move(NamedTuple):
-    direction: Dir
-    count: int
+    def __getitem__(self, pos):
+        return self.grid.cells[pos] - ord('0')
 
-    def with_intermediates(self):
-        return [Move(self.direction, n) for n in range(1,self.count + 1)]
+    def moves(self, min_travel, max_travel):
+        """Neighbours of a state for `search`: the states a move of
+        `min_travel` to `max_travel` blocks leads to, with the heat lost."""
 
-    def __repr__(self):
-        return f'{self.direction.name}({self.count})'
+        cells, offsets, outside, zero = self.grid.cells, self.grid.offsets, ord(OUTSIDE), ord('0')
 
-class Plan:
+        def neighbours(state):
+            pos, axis = divmod(state, 2)
+            for d in TURNS[axis]:
+                step, p, cost = offsets[d], pos, 0
+                for n in range(1, max_travel + 1):
+                    p += step
+                    c = cells[p]
+                    if c == outside:
+                        break
+                    cost += c - zero
+                    if n >= min_travel:
+                        yield p * 2 + 1 - axis, cost
 
-    def __init__(self, lines):
-        self.rows = [list(map(int, list(line.strip()))) for line in lines]
-        self.width = len(self.rows[0])
-        self.height = len(self.rows)
-        self.end = Pos(self.width - 1, self.height - 1)
+        return neighbours
 
-    def __getitem__(self, pos):
-        x, y = pos
-        return self.rows[y][x]
-
-    def in_bounds(self, pos):
-        return 0 <= pos.x < self.width and 0 <= pos.y < self.height
-
-    def a_star(self, min_travel=1, max_travel=3, show_progress=False):
-        route0 = Route.blank(self)
-        frontier = route0.options(Pos(0,0), min_travel=min_travel, max_travel=max_travel)
-        heapq.heapify(frontier)
-        seen = {}
-        for n in count(start=1):
-            route = heapq.heappop(frontier)
-            if show_progress and n % 10000 == 0:
-                print(f'Frontier size: {len(frontier)}')
-                print(f'Best: {route.estimated_cost}')
-            if route.pos == self.end:
-                return route
-            for r in route.options(min_travel=min_travel, max_travel=max_travel):
-                if r.key in seen:
-                    if seen[r.key] <= r.estimated_cost:
-                        continue
-                seen[r.key] = r.estimated_cost
-                heapq.heappush(frontier, r)
-
-@dataclass
-class Route:
-
-    plan: Plan
-    sequence: list[Move]
-    pos_sequence: list[Pos]
-    costs_incurred: list[int]
-
-    @classmethod
-    def blank(cls, plan: Plan):
-        return Route(plan, [], [], [])
-
-    @functools.cached_property
-    def pos(self):
-        return self.pos_sequence[-1]
-
-    @functools.cached_property
-    def path(self):
-        return ''.join(repr(s) for s in self.sequence)
-
-    @functools.cached_property
-    def heuristic(self):
-        x, y = self.pos
-        return (self.plan.width - x - 1) + (self.plan.height - y - 1)
-
-    @functools.cached_property
-    def estimated_cost(self):
-        return self.realised_cost + self.heuristic
-
-    @functools.cached_property
-    def realised_cost(self):
-        return sum(self.costs_incurred)
-
-    def __lt__(self, other):
-        return self.estimated_cost < other.estimated_cost
-
-    @functools.cached_property
-    def key(self):
-        return (self.sequence[-1].direction, self.pos)
-
-    def options(self, pos = None, min_travel = 1, max_travel = 3):
-
-        start_pos = pos or self.pos
-        disallowed = set()
-        if self.sequence:
-            disallowed.add(self.sequence[-1].direction)
-            disallowed.add(self.sequence[-1].direction.reverse())
-        directions = [d for d in Dir if d not in disallowed]
-        moves = sum(([Move(d, n) for n in range(min_travel, max_travel+1)] for d in directions), [])
-
-        next_routes = []
-        for m in moves:
-            p = start_pos.move_n(m)
-            if self.plan.in_bounds(p):
-                cost = sum(self.plan[start_pos.move_n(mm)] for mm in m.with_intermediates())
-                next_routes.append(Route(self.plan,
-                                          self.sequence + [m],
-                                          self.pos_sequence + [p],
-                                          self.costs_incurred + [cost]))
-
-        return next_routes
+    def least_heat_loss(self, min_travel=1, max_travel=3):
+        # heat lost per move is small, so a bucket queue beats a heap
+        # (even with a distance heuristic steering it)
+        found = search.buckets([self.start * 2, self.start * 2 + 1], self.moves(min_travel, max_travel),
+                               lambda state: state // 2 == self.end)
+        return found.costs[found.goal]
+
+def parse(lines):
+    return Plan(lines)
+
+def solve_a(plan):
+    return plan.least_heat_loss()
+
+def solve_b(plan):
+    return plan.least_heat_loss(min_travel=4, max_travel=10)
 
 def day17a(lines):
     """
     >>> day17a(TEST_INPUT)
     102
     """
-    return Plan(lines).a_star().realised_cost
+    return solve_a(parse(lines))
 
 def day17b(lines):
     """
     >>> day17b(TEST_INPUT)
     94
     """
-    return Plan(lines).a_star(min_travel=4, max_travel=10).realised_cost
+    return solve_b(parse(lines))
 
 def main():
     with open('aoc23/data/day17input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 17a: {day17a(lines)}')
-    print(f'Day 17b: {day17b(lines)}')
+        plan = parse(list(fd))
+    print(f'Day 17a: {solve_a(plan)}')
+    print(f'Day 17b: {solve_b(plan)}')
 
 if __name__ == '__main__':
     main()
@@ -6,6 +6,8 @@ from collections import defaultdict
 from functools import cached_property
 from itertools import pairwise
 
+from aoc23 import cache
+
 
 TEST_INPUT = [
     'R 6 (#70c710)',
@@ -113,10 +115,12 @@ class DigPlan:
         return DigPaths(paths)
 
     @classmethod
+    @cache.parsed
     def parse(cls, lines):
         return DigPlan([Step.parse(line.strip()) for line in lines])
 
     @classmethod
+    @cache.parsed
     def parse_b(cls, lines):
         return DigPlan([Step.parse_b(line.strip()) for line in lines])
 
@@ -211,12 +215,26 @@ def count_interior(ray_corners_classified):
     return count
 
 
+def parse(lines):
+    # each line holds a step of both plans: one in plain sight, the
+    # other in its colour code
+    return DigPlan.parse(lines), DigPlan.parse_b(lines)
+
+
+def solve_a(plans):
+    return plans[0].dig().raycast_interior()
+
+
+def solve_b(plans):
+    return plans[1].dig().raycast_interior()
+
+
 def day18a(lines):
     """
     >>> day18a(TEST_INPUT)
     62
     """
-    return DigPlan.parse(lines).dig().raycast_interior()
+    return solve_a(parse(lines))
 
 
 def day18b(lines):
@@ -224,14 +242,14 @@ def day18b(lines):
     >>> day18b(TEST_INPUT)
     952408144115
     """
-    return DigPlan.parse_b(lines).dig().raycast_interior()
+    return solve_b(parse(lines))
 
 
 def main():
     with open('aoc23/data/day18input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 18a: {day18a(lines)}')
-    print(f'Day 18b: {day18b(lines)}')
+        plans = parse(list(fd))
+    print(f'Day 18a: {solve_a(plans)}')
+    print(f'Day 18b: {solve_b(plans)}')
 
 
 if __name__ == '__main__':
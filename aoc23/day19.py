@@ -5,6 +5,8 @@ import operator
 from itertools import takewhile
 from copy import deepcopy
 
+from aoc23 import cache
+
 TEST_INPUT = [
     'px{a<2006:qkq,m>2090:A,rfg}',
     'pv{a>1716:R,A}',
@@ -149,35 +151,42 @@ class Program:
                 worlds.extend(self.workflows[wf].analyse(c))
         return accept
 
-def parse_puzzle(lines):
+@cache.parsed
+def parse(lines):
     i = iter(lines)
     program = Program(list(Workflow(line.strip()) for line in takewhile(lambda x: x.strip(), i)))
     takewhile(lambda x: not x.strip(), i)
     parts = [Part.parse(line.strip()) for line in list(i)]
     return (program, parts)
 
+def solve_a(puzzle):
+    program, parts = puzzle
+    return sum(p.total() for p in parts if program.evaluate(p) == 'A')
+
+def solve_b(puzzle):
+    program, _ = puzzle
+    return sum(p.count() for p in program.analyse())
+
 def day19a(lines):
     """
     >>> day19a(TEST_INPUT)
     19114
     """
-    program, parts = parse_puzzle(lines)
-    return sum(p.total() for p in parts if program.evaluate(p) == 'A')
+    return solve_a(parse(lines))
 
 def day19b(lines, n = 1_000_000):
     """
     >>> day19b(TEST_INPUT)
     167409079868000
     """
-    program, _ = parse_puzzle(lines)
-    return sum(p.count() for p in program.analyse())
+    return solve_b(parse(lines))
 
 
 def main():
     with open('aoc23/data/day19input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 19a: {day19a(lines)}')
-    print(f'Day 19b: {day19b(lines)}')
+        puzzle = parse(list(fd))
+    print(f'Day 19a: {solve_a(puzzle)}')
+    print(f'Day 19b: {solve_b(puzzle)}')
 
 
 if __name__ == '__main__':
@@ -1,7 +1,9 @@
 from typing import NamedTuple
-from functools import reduce
+from functools import cache, reduce
 import re
 
+from aoc23 import inputs
+
 
 class RGB(NamedTuple):
     red: int
@@ -21,23 +23,27 @@ def upper(left_rgb, right_rgb) -> RGB:
     )
 
 
-evidence_regex = re.compile(r'(\d+) (blue|green|red)')
+@cache
+def evidence_regex():
+    return re.compile(r'(\d+) (blue|green|red)')
 
 
 def to_rgb(text) -> RGB:
-    pairs = evidence_regex.findall(text)
+    pairs = evidence_regex().findall(text)
     dictionary = {'red': 0, 'green': 0, 'blue': 0} | {
         colour: int(number) for (number, colour) in pairs
     }
     return RGB(**dictionary)
 
 
-game_regex = re.compile(r'Game (\d+): (.*)')
+@cache
+def game_regex():
+    return re.compile(r'Game (\d+): (.*)')
 
 
 class Game:
     def __init__(self, text):
-        if m := game_regex.match(text):
+        if m := game_regex().match(text):
             id, evidence = m.groups()
             self.id = id
             self.evidence = list(map(to_rgb, evidence.split(';')))
@@ -67,12 +73,24 @@ TEST_DATA = [
 CANDIDATE = RGB(red=12, green=13, blue=14)
 
 
+def parse(lines):
+    return list(map(Game, lines))
+
+
+def solve_a(games):
+    return sum(int(game.id) for game in games if game.possible(CANDIDATE))
+
+
+def solve_b(games):
+    return sum(game.minimums.power() for game in games)
+
+
 def day2a(lines):
     """
     >>> day2a(TEST_DATA)
     8
     """
-    return sum(int(game.id) for game in map(Game, lines) if game.possible(CANDIDATE))
+    return solve_a(parse(lines))
 
 
 def day2b(lines):
@@ -80,13 +98,17 @@ def day2b(lines):
     >>> day2b(TEST_DATA)
     2286
     """
-    return sum(Game(line).minimums.power() for line in lines)
+    return solve_b(parse(lines))
+
+
+read_input = inputs.lines
 
 
 def main():
-    lines = list(open('aoc23/data/day2input.txt'))
-    print(f'Day 2a: {day2a(lines)}')
-    print(f'Day 2b: {day2b(lines)}')
+    with open('aoc23/data/day2input.txt') as fd:
+        games = parse(read_input(fd))
+    print(f'Day 2a: {solve_a(games)}')
+    print(f'Day 2b: {solve_b(games)}')
 
 
 if __name__ == '__main__':
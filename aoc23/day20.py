@@ -1,7 +1,9 @@
 import re
 from dataclasses import dataclass, field
 from collections import OrderedDict
-from functools import reduce
+from functools import cache, reduce
+
+from aoc23 import metrics, progress, spans
 
 TEST_INPUT_1 = [
     'broadcaster -> a, b, c',
@@ -156,6 +158,7 @@ class EventBus:
             components[receiver].signal(self, source, value)
 
         # dump_component_state(components)
+        metrics.count('pulses', lo + hi)
         return (lo, hi)
 
     def push_and_pump_n(self, components, n = None):
@@ -165,17 +168,22 @@ class EventBus:
             self.push_button(components)
             lo, hi = self.pump(components)
             presses += 1
+            progress.report('presses', presses, n)
             total_lo += lo
             total_hi += hi
         return total_lo, total_hi, presses
 
-comp_re = re.compile(r'([&%]?)(\w+) -> (.*)')
+@cache
+def comp_re():
+    return re.compile(r'([&%]?)(\w+) -> (.*)')
 
+@spans.span('wire')
 def wire(lines):
+    comp = comp_re()
     components = OrderedDict()
     wires = []
     for line in lines:
-        t, n, ws = comp_re.match(line.strip()).groups()
+        t, n, ws = comp.match(line.strip()).groups()
         if t == '&':
             t = Conjunction
         elif t == '%':
@@ -201,6 +209,19 @@ def wire(lines):
 
     return components
 
+def parse(lines):
+    return wire(lines)
+
+def solve_a(components):
+    reset(components)
+    bus = EventBus()
+    with spans.span('pump', presses=1000):
+        lo, hi, _ = bus.push_and_pump_n(components, 1000)
+    return lo * hi
+
+def solve_b(components):
+    pass
+
 def day20a(lines):
     """
     >>> day20a(TEST_INPUT_1)
@@ -208,22 +229,19 @@ def day20a(lines):
     >>> day20a(TEST_INPUT_2)
     11687500
     """
-    components = wire(lines)
-    bus = EventBus()
-    lo, hi, _ = bus.push_and_pump_n(components, 1000)
-    return lo * hi
+    return solve_a(parse(lines))
 
 def day20b(lines):
     """
     This one was worked out manually by studying the graph...
     """
-    pass
+    return solve_b(parse(lines))
 
 def main():
     with open('aoc23/data/day20input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 20a: {day20a(lines)}')
-    print(f'Day 20b: {day20b(lines)}')
+        components = parse(list(fd))
+    print(f'Day 20a: {solve_a(components)}')
+    print(f'Day 20b: {solve_b(components)}')
 
 
 if __name__ == '__main__':
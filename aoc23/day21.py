@@ -1,10 +1,12 @@
 from typing import NamedTuple
 from enum import Enum
-from functools import reduce
-import hashlib
-from collections import defaultdict
+from itertools import islice
+from collections import Counter, defaultdict
 from dataclasses import dataclass
 
+from aoc23 import search
+from aoc23.grid import Grid
+
 TEST_INPUT = [
     '...........',
     '.....###.#.',
@@ -32,89 +34,78 @@ class Dir(Enum):
     E = (+1, 0)
     W = (-1, 0)
 
+GARDEN = ord('.')
+
 class Plan:
 
+    # Positions are indexes into the grid's cells when the plan is
+    # bounded, and Pos otherwise, where it repeats without end.
+
     def __init__(self, lines, bounded = True, start = None):
         self.bounded = bounded
-        self.rows = [list(line.strip()) for line in lines]
-        self.width = len(self.rows[0])
-        self.height = len(self.rows)
-        self.end = Pos(self.width - 1, self.height - 1)
-        for y, row in enumerate(self.rows):
-            for x, c in enumerate(row):
-                if c == 'S':
-                    self.start = Pos(x, y)
-        self[self.start] = '.'
-        self.start = start or self.start
-        self.blank = self.subgrid_hash(Pos(0, 0), set())
+        # bordered by rock, so that bounded steps needn't be checked
+        self.grid = Grid(lines, pad=1, fill='#')
+        self.width = self.grid.width
+        self.height = self.grid.height
+        self.end = self.position(self.width - 1, self.height - 1)
+        x, y = self.grid.find('S')
+        self.grid[x, y] = '.'
+        self.start = self.position(*(start or (x, y)))
+
+    def position(self, x, y):
+        return self.grid.index(x, y) if self.bounded else Pos(x, y)
 
     def __getitem__(self, pos):
-        x, y = pos
         if self.bounded:
-            return self.rows[y][x]
+            return chr(self.grid.cells[pos])
         else:
-            return self.rows[y % self.height][x % self.width]
+            x, y = pos
+            return self.grid[x % self.width, y % self.height]
 
     def __setitem__(self, pos, c):
-        x, y = pos
         if self.bounded:
-            self.rows[y][x] = c
+            self.grid.cells[pos] = ord(c)
         else:
-            self.rows[y % self.height][x % self.width] = c
+            x, y = pos
+            self.grid[x % self.width, y % self.height] = c
 
     def subgrids(self, accessible):
         for y in range(min(p.y for p in accessible) // self.height - 1, max(p.y for p in accessible) // self.height + 2):
             for x in range(min(p.x for p in accessible) // self.width - 1, max(p.x for p in accessible) // self.width + 2):
                 yield (x, y)
 
-    def subgrid_hash(self, coord, accessible):
-        m = hashlib.sha1()
-        x, y = coord
-        for yy in range(y * self.height, (y + 1) * self.height):
-            for xx in range(x * self.width, (x + 1) * (self.width)):
-                if Pos(xx, yy) in accessible:
-                    m.update(b'O')
-                else:
-                    m.update(b'-')
-        return m.digest()
-
     def dump(self, frontier):
         y_positions = range(self.height) if self.bounded else range(-self.height - 1, self.height + 1)
         for y in y_positions:
-            x_positions = (Pos(x, y) for x in (range(self.width) if self.bounded else range(-self.width - 1, self.width + 1)))
+            x_positions = (self.position(x, y) for x in (range(self.width) if self.bounded else range(-self.width - 1, self.width + 1)))
             print(''.join('O' if p in frontier else 'S' if p == self.start else self[p] for p in x_positions))
 
-    def in_bounds(self, pos):
-        return self.bounded == False or (0<= pos.x < self.width and 0<= pos.y < self.height)
-
     def accessible_neighbours(self, pos):
-        return set(p for p in [pos.move(d) for d in Dir] if self.in_bounds(p) and self[p] == '.')
+        if self.bounded:
+            cells = self.grid.cells
+            return set(p for p in [pos + offset for offset in self.grid.offsets] if cells[p] == GARDEN)
+        return set(p for p in [pos.move(d) for d in Dir] if self[p] == '.')
+
+    def distances(self, n):
+        """Fewest steps to each plot within `n` steps of the start."""
+        return search.bfs([self.start], self.accessible_neighbours, limit=n).costs
+
+    # The plots reachable in exactly i steps are those within i steps
+    # an even number of steps short of i, which can be made up by
+    # stepping back and forth.
 
     def step(self, n):
-        accessible = {self.start}
-        for i in range(1, n+1):
-            accessible = reduce(lambda a, b: a.union(b), [self.accessible_neighbours(f) for f in accessible])
-        return accessible
+        return set(p for p, d in self.distances(n).items() if d % 2 == n % 2)
 
     def step_counts(self, n):
-        accessible = {self.start}
-        for i in range(1, n+1):
-            accessible = reduce(lambda a, b: a.union(b), [self.accessible_neighbours(f) for f in accessible])
-            yield len(accessible)
+        yield from islice(self.step_outward(n), 1, None)
 
     def step_outward(self, n):
-        last_frontier = set()
-        frontier = {self.start}
-        count = 1
-        prior_count = 0
-        yield count
-        for i in range(1, n+1):
-            last_frontier, frontier = frontier, reduce(lambda a, b: a.union(b), [self.accessible_neighbours(f) for f in frontier], set()) - last_frontier
-            frontier_size = len(frontier)
-            # print(f'{i:16}: {prior_count} + {frontier_size}')
-            prior_count, count = count, (prior_count + frontier_size)
-            # print(f'{i:16}:     -> {count}')
-            yield count
+        within = Counter(self.distances(n).values())
+        counts = [0, 0]
+        for i in range(n + 1):
+            counts[i % 2] += within[i]
+            yield counts[i % 2]
 
 def count_at_age(counts, n):
     if n >= len(counts):
@@ -131,13 +122,14 @@ class Solver:
         self.plan_centre = Plan(lines)
         self.w = self.plan_centre.width
         self.h = self.plan_centre.height
-        self.plan_s = Plan(lines, start = Pos(self.plan_centre.start.x, 0))
+        self.start = Pos(*self.plan_centre.grid.xy(self.plan_centre.start))
+        self.plan_s = Plan(lines, start = Pos(self.start.x, 0))
         self.plan_sw = Plan(lines, start = Pos(self.plan_centre.width - 1, 0))
-        self.plan_w = Plan(lines, start = Pos(self.plan_centre.width - 1, self.plan_centre.start.y))
+        self.plan_w = Plan(lines, start = Pos(self.plan_centre.width - 1, self.start.y))
         self.plan_nw = Plan(lines, start = Pos(self.plan_centre.width - 1, self.plan_centre.height - 1))
-        self.plan_n = Plan(lines, start = Pos(self.plan_centre.start.x, self.plan_centre.height - 1))
+        self.plan_n = Plan(lines, start = Pos(self.start.x, self.plan_centre.height - 1))
         self.plan_ne = Plan(lines, start = Pos(0, self.plan_centre.height - 1))
-        self.plan_e = Plan(lines, start = Pos(0, self.plan_centre.start.y))
+        self.plan_e = Plan(lines, start = Pos(0, self.start.y))
         self.plan_se = Plan(lines, start = Pos(0, 0))
 
         self.counts_centre = list(self.plan_centre.step_outward(self.w))
@@ -152,7 +144,7 @@ class Solver:
 
 
     def solve(self, n):
-        wq, wr = divmod(self.plan_centre.start.x + n + 1, self.w)
+        wq, wr = divmod(self.start.x + n + 1, self.w)
         axis_blocks = wq + int(wr > 0) - 1
 
         c_count = count_at_age(self.counts_centre, n+1) #centre has aged 1
@@ -188,13 +180,27 @@ class Solver:
         return total
 
 
+def parse(lines):
+    # the plans each part walks are marked as they go, so the parts
+    # share only the rows they are built from
+    return [line.strip() for line in lines]
+
+
+def solve_a(rows, n = 64):
+    plan = Plan(rows)
+    return len(plan.step(n))
+
+
+def solve_b(rows, n = 26501365):
+    return Solver(rows).solve(n)
+
+
 def day21a(lines, n = 64):
     """
     >>> day21a(TEST_INPUT, 6)
     16
     """
-    plan = Plan(lines)
-    return len(plan.step(n))
+    return solve_a(parse(lines), n)
 
 
 def day21b(lines, n = 26501365):
@@ -224,13 +230,13 @@ def day21b(lines, n = 26501365):
     # """
     # plan = Plan(lines, bounded = False)
     # return list(plan.step_outward(n))[-1]
-    return Solver(lines).solve(n)
+    return solve_b(parse(lines), n)
 
 def main():
     with open('aoc23/data/day21input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 21a: {day21a(lines)}')
-    print(f'Day 21b: {day21b(lines)}')
+        rows = parse(list(fd))
+    print(f'Day 21a: {solve_a(rows)}')
+    print(f'Day 21b: {solve_b(rows)}')
 
 if __name__ == '__main__':
     main()
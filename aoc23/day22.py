@@ -3,6 +3,8 @@ from dataclasses import dataclass
 from graphlib import TopologicalSorter
 from collections import defaultdict
 
+from aoc23 import cache, inputs, progress, spans, tokens
+
 TEST_INPUT = [
     '1,0,1~1,2,1',
     '0,0,2~2,0,2',
@@ -56,13 +58,10 @@ class Brick:
         self.end = Pos(self.end.x, self.end.y, self.end.z - drop)
 
     @staticmethod
-    def parse(i, line):
-        start, end = line.strip().split('~')
-        id = i
-        start = Pos(*(int(i) for i in start.split(',')))
-        end = Pos(*(int(i) for i in end.split(',')))
-        return Brick(id, start, end)
+    def parse(lines):
+        return [Brick(i, Pos(*row[:3]), Pos(*row[3:])) for i, row in enumerate(tokens.table(lines, 6))]
 
+@spans.span('condense')
 def condense(bricks):
     # bricks are lying flat
     bricks.sort(key = lambda b: b.min_z)
@@ -89,6 +88,11 @@ def condense(bricks):
 
     return bricks
 
+@cache.parsed
+def parse(lines):
+    """Parse the snapshot and let the bricks fall into place."""
+    return condense(Brick.parse(lines))
+
 def number_of_supports(s, bricks):
     return len([t for t in bricks if t.in_layer(s.min_z - 1) and t.xy_intersects(s)])
 
@@ -112,6 +116,7 @@ class BrickNode:
     path_matrix: Mapping[tuple[int, int], int]
     tags: set
 
+@spans.span('to_nodes')
 def to_nodes(condensed_bricks):
     nodes = []
     for b in condensed_bricks:
@@ -134,6 +139,7 @@ def tag_dependents(i, nodes):
     if i in nodes[i].tags:
         nodes[i].tags.remove(i)
 
+@spans.span('direct')
 def direct(nodes):
 
     """This replaces one hundred lines of complex graph-theoretic
@@ -141,28 +147,37 @@ def direct(nodes):
 
     for i in range(0, len(nodes)):
         tag_dependents(i, nodes)
+        progress.report('bricks', i + 1, len(nodes))
     counts = list(sum(1 for n in nodes if i in n.tags) for i in range(0, len(nodes)))
     return counts
 
+def solve_a(bricks):
+    return unburdened(bricks)
+
+def solve_b(bricks):
+    return sum(direct(to_nodes(bricks)))
+
 def day22a(lines):
     """
     >>> day22a(lines)
     5
     """
-    return unburdened(condense([Brick.parse(i, line) for i, line in enumerate(lines)]))
+    return solve_a(parse(lines))
 
 def day22b(lines, n = 26501365):
     """
     >>> day22b(lines)
     7
     """
-    return sum(direct(to_nodes(condense([Brick.parse(i, line) for i, line in enumerate(lines)]))))
+    return solve_b(parse(lines))
+
+read_input = inputs.lines
 
 def main():
     with open('aoc23/data/day22input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 22a: {day22a(lines)}')
-    print(f'Day 22b: {day22b(lines)}')
+        bricks = parse(read_input(fd))
+    print(f'Day 22a: {solve_a(bricks)}')
+    print(f'Day 22b: {solve_b(bricks)}')
 
 if __name__ == '__main__':
     main()
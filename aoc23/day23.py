@@ -1,10 +1,10 @@
 from typing import NamedTuple, Mapping
 from dataclasses import dataclass
-from enum import Enum
 from functools import cached_property
 import heapq
 from itertools import pairwise
-from aoc23.day22 import Pos
+from aoc23 import cache, checkpoint, metrics, progress, search, spans
+from aoc23.grid import Grid, N, E, S, W
 
 TEST_INPUT = [
     '#.#####################',
@@ -32,36 +32,33 @@ TEST_INPUT = [
     '#####################.#',
 ]
 
-class Dir(Enum):
-    E = (+1, 0)
-    S = (0, +1)
-    W = (-1, 0)
-    N = (0, -1)
-
-    @staticmethod
-    def of(ch):
-        return list(Dir)['>v<^'.index(ch)]
+DIRS = (E, S, W, N)
+SLOPES = {ord('>'): E, ord('v'): S, ord('<'): W, ord('^'): N}
+PATH = ord('.')
+FOREST = ord('#')
 
 class Plan:
 
+    # positions are indexes into the grid's cells
+
     def __init__(self, lines):
-        self.rows = [list(line.strip()) for line in lines]
-        self.width = len(self.rows[0])
-        self.height = len(self.rows)
-        self.start = [(x, 0) for x in range(0, self.width) if self[x, 0] == '.'][0]
-        self.end = [(x, self.height-1) for x in range(0, self.width) if self[x, self.height-1] == '.'][0]
+        # bordered by forest, so the way out of the start and end is blocked
+        self.grid = Grid(lines, pad=1, fill='#')
+        self.width = self.grid.width
+        self.height = self.grid.height
+        self.start = self.grid.index(self.grid.row(0).tobytes().index(PATH), 0)
+        self.end = self.grid.index(self.grid.row(self.height - 1).tobytes().index(PATH), self.height - 1)
 
     def __getitem__(self, pos):
-        x, y = pos
-        return self.rows[y][x]
+        return chr(self.grid.cells[pos])
 
     @cached_property
     def walls(self):
-        return sum(sum(1 for c in row if c == '#') for row in self.rows)
+        return self.grid.count('#')
 
     @cached_property
     def dots(self):
-        return sum(sum(1 for c in row if c == '.') for row in self.rows)
+        return self.grid.count('.')
 
     def dots_inaccessible(self, path):
         # blocked_y = 1
@@ -79,15 +76,16 @@ class Plan:
         #         if self[x, y] == '.' and self.path_adjacent((x, y), path):
         #             missed_dots += 1
 
+        index = self.grid.index
         blocked_radius = 1
-        for r in range(1, path[-1][0]):
-            border = [(x, r) for x in range(0, r)] + [(r, y) for y in range(0, r)]
+        for r in range(1, self.grid.xy(path[-1])[0]):
+            border = [index(x, r) for x in range(0, r)] + [index(r, y) for y in range(0, r)]
             if all(self[pos] == '#' or pos in path for pos in border):
                 blocked_radius = r
 
         missed_dots = 0
         for y in range(blocked_radius - 1, 0, -1):
-            missed_dots += sum(int(self[x, y] == '.' and (x, y) not in path) for x in range(0, blocked_radius))
+            missed_dots += sum(int(self[index(x, y)] == '.' and index(x, y) not in path) for x in range(0, blocked_radius))
 
         return missed_dots
 
@@ -95,135 +93,147 @@ class Plan:
         return pos != path and any(self.move(pos, d) in path[:-1] for d in self.options(pos))
 
     def options(self, pos):
-        x, y = pos
-        return [d for d in Dir if (0 <= x + d.value[0] < self.width) and (0<= y + d.value[1] < self.width) and self[(x + d.value[0], y + d.value[1])] != '#']
+        cells, offsets = self.grid.cells, self.grid.offsets
+        return [d for d in DIRS if cells[pos + offsets[d]] != FOREST]
 
     def move(self, pos, d):
-        x, y = pos
-        dx, dy = d.value
-        x1, y1 = x + dx, y + dy
-        n = self[x1, y1]
-        if n == '.':
-            return [(x1, y1)]
-        elif n in {'>', '<', '^', 'v'}:
-            return [(x1, y1)] + self.move((x1, y1), Dir.of(n))
+        p = pos + self.grid.offsets[d]
+        n = self.grid.cells[p]
+        if n == PATH:
+            return [p]
+        elif n in SLOPES:
+            return [p] + self.move(p, SLOPES[n])
         else:
             return []
 
     def move_b(self, pos, d):
-        x, y = pos
-        dx, dy = d.value
-        x1, y1 = x + dx, y + dy
-        n = self[x1, y1]
-        if n != '#':
-            return [(x1, y1)]
+        p = pos + self.grid.offsets[d]
+        if self.grid.cells[p] != FOREST:
+            return [p]
         else:
             return []
 
-def bfs(plan):
-    queue = [[plan.start]]
-    while queue:
-        path = queue.pop()
-        if path[-1] == plan.end:
-            yield path
-        else:
-            for d in plan.options(path[-1]):
-                extension = plan.move(path[-1], d)
-                if extension and extension[-1] not in path:
-                    queue.append(path + extension)
+    def steps(self, pos):
+        """Where a step from `pos` can lead, paying no heed to slopes."""
+        cells = self.grid.cells
+        return [p for p in [pos + offset for offset in self.grid.offsets] if cells[p] != FOREST]
+
+    def downhill(self, pos):
+        """Where a step from `pos` can lead, only down the slope if on one."""
+        if (d := SLOPES.get(self.grid.cells[pos])) is not None:
+            return self.move_b(pos, d)
+        return self.steps(pos)
+
+    def cache_key(self):
+        # the grid alone, not whichever cached properties have been filled in
+        return self.width, bytes(self.grid.cells)
+
+    @cached_property
+    def junctions(self):
+        """The start, the end and where three or more paths meet."""
+        cells, offsets = self.grid.cells, self.grid.offsets
+        return {self.start, self.end} | set(
+            pos for pos, c in enumerate(cells) if c != FOREST and sum(cells[pos + o] != FOREST for o in offsets) > 2)
 
 @dataclass
 class Connection:
 
     """A connection between junctions. Non-junctions are irrelevant to the search."""
 
-    source: Pos
-    target: Pos
+    source: int
+    target: int
     distance: int
 
-    def reversed(self):
-        return Connection(self. target, self.source, self.distance)
 
-def extract_connections(plan: Plan):
+@cache.parsed
+@spans.span('extract_connections')
+def extract_connections(plan: Plan, slopes=False):
 
     """Represent the problem as network of connections between
     junctions to eliminate any computation associated with single
-    square moves."""
+    square moves. Connections go only one way if `slopes` are
+    followed down."""
 
-    path = [plan.start]
+    neighbours = plan.downhill if slopes else plan.steps
+    junctions = plan.junctions
     connections = {}
 
-    def explore(path, start):
-        start = start or path[-1]
-        path = path[:]
-        steps = 0
-        while extensions := [ext for ext in [plan.move_b(path[-1], d) for d in plan.options(path[-1])] if ext[-1] not in path]:
-            if len(extensions) == 1:
-                path += extensions[0]
-                steps += 1
-                if path[-1] == plan.end:
-                    connections[(start, path[-1])] = Connection(start, path[-1], steps)
-                    return
-            else:
-                if (start, path[-1]) not in connections:
-                    connections[(start, path[-1])] = Connection(start, path[-1], steps)
-                    for ext in extensions:
-                        explore(path + ext, path[-1])
-                return
-
-    explore(path, None)
-    for (s, e) in list(connections.keys()):
-        connections[(e, s)] = connections[(s, e)].reversed()
+    for j in junctions:
+        # junctions other than j end a path rather than leading on
+        reached = search.bfs([j], lambda p: () if p != j and p in junctions else neighbours(p)).costs
+        for k in junctions:
+            if k != j and k in reached:
+                connections[(j, k)] = Connection(j, k, reached[k])
     return connections
 
 
-def dfs_connections(plan, conns):
+def dfs_connections(plan, conns, stack=None):
 
-    """Yield all possible paths from entry to exit so we can find the longest."""
+    """Yield all possible paths from entry to exit so we can find the
+    longest. The search works through `stack` in place, so it can be
+    saved between paths and the search taken up again from it later."""
 
-    stack = [[plan.start]]
+    stack = [[plan.start]] if stack is None else stack
+    exits = {}
+    for (s, e), conn in conns.items():
+        exits.setdefault(s, []).append(conn)
 
     while stack:
         path = stack.pop()
+        metrics.count('paths')
         pos = path[-1]
         if pos == plan.end:
             yield path
         else:
-            nexts = [conn for (s, e), conn in conns.items() if s == pos]
-            for n in nexts:
+            for n in exits.get(pos, ()):
                 if n.target not in path:
                     stack.append(path + [n.target])
 
+def parse(lines):
+    return Plan(lines)
+
+def length(path, conns):
+    return sum(conns[k].distance for k in pairwise(path))
+
+def solve_a(plan):
+    conns = extract_connections(plan, slopes=True)
+    return max(length(path, conns) for path in dfs_connections(plan, conns))
+
+def solve_b(plan):
+    # another slow one, but does terminate eventually...
+
+    conns = extract_connections(plan)
+    saved = checkpoint.Checkpoint('day23b', bytes(plan.grid.cells))
+    max_so_far, stack = saved.load() or (0, [[plan.start]])
+    with spans.span('dfs', resumed=max_so_far > 0):
+        for n, path in enumerate(dfs_connections(plan, conns, stack), start=1):
+            if (steps := length(path, conns)) > max_so_far:
+                max_so_far = steps
+            if n % 1000 == 0:
+                progress.report('paths', n, best=max_so_far)
+                saved.save((max_so_far, stack))
+    saved.clear()
+    return max_so_far
+
 def day23a(lines):
     """
     >>> day23a(TEST_INPUT)
     94
     """
-    return max(len(path) - 1 for path in bfs(Plan(lines)))
+    return solve_a(parse(lines))
 
-def day23b(lines, show_progress=False):
+def day23b(lines):
     """
     >>> day23b(TEST_INPUT)
     154
     """
-    # another slow one, but does terminate eventually...
-
-    max_so_far = 0
-    plan = Plan(lines)
-    conns = extract_connections(plan)
-    for path in dfs_connections(plan, conns):
-        length = sum(conns[k].distance + 1 for k in  pairwise(path)) - 1
-        if length > max_so_far:
-            max_so_far = length
-            if show_progress:
-                print(f'best: {max_so_far}')
-    return max_so_far
+    return solve_b(parse(lines))
 
 def main():
     with open('aoc23/data/day23input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 23a: {day23a(lines)}')
-    print(f'Day 23b: {day23b(lines)}')
+        plan = parse(list(fd))
+    print(f'Day 23a: {solve_a(plan)}')
+    print(f'Day 23b: {solve_b(plan)}')
 
 if __name__ == '__main__':
     main()
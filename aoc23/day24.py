@@ -3,6 +3,8 @@ from typing import NamedTuple, Optional
 from itertools import combinations, groupby
 import math
 
+from aoc23 import inputs, tokens
+
 TEST_INPUT = [
     '19, 13, 30 @ -2,  1, -2',
     '18, 19, 22 @ -1, -1, -2',
@@ -69,11 +71,8 @@ class Trajectory:
             return False
 
     @staticmethod
-    def parse(line):
-        p, v = line.split('@')
-        pos = Vector3(*(int(c.strip()) for c in p.split(',')))
-        vel = Vector3(*(int(c.strip()) for c in v.split(',')))
-        return Trajectory(pos, vel)
+    def parse(lines):
+        return [Trajectory(Vector3(*row[:3]), Vector3(*row[3:])) for row in tokens.table(lines, 6)]
 
 def solve_xy(a: Trajectory, b: Trajectory):
 
@@ -98,21 +97,14 @@ def solve_xy(a: Trajectory, b: Trajectory):
     if a.in_future(result) and b.in_future(result):
         return Vector3(C1, C2, 0)
 
-def day24a(lines, min_bound = 200000000000000, max_bound = 400000000000000):
-    """
-    >>> day24a(TEST_INPUT, min_bound = 7, max_bound = 27)
-    2
-    """
-    trajectories = [Trajectory.parse(line) for line in lines]
+def parse(lines):
+    return Trajectory.parse(lines)
+
+def solve_a(trajectories, min_bound = 200000000000000, max_bound = 400000000000000):
     solutions = (solve_xy(a, b) for (a, b) in combinations(trajectories, 2) if a is not b)
     return len(list(s for s in solutions if s is not None and s.in_bounds_xy(min_bound, max_bound)))
 
-def day24b(lines):
-    """
-    >>> day24b(TEST_INPUT)
-    """
-    trajectories = [Trajectory.parse(line) for line in lines]
-
+def solve_b(trajectories):
     # cheat! in the data there are two stones that are identical on
     # the x axis... find them and any two other stones
     a1: Optional[Trajectory] = None
@@ -155,11 +147,26 @@ def day24b(lines):
 
     return x0 + y0 + z0
 
+def day24a(lines, min_bound = 200000000000000, max_bound = 400000000000000):
+    """
+    >>> day24a(TEST_INPUT, min_bound = 7, max_bound = 27)
+    2
+    """
+    return solve_a(parse(lines), min_bound, max_bound)
+
+def day24b(lines):
+    """
+    >>> day24b(TEST_INPUT)
+    """
+    return solve_b(parse(lines))
+
+read_input = inputs.lines
+
 def main():
     with open('aoc23/data/day24input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 24a: {day24a(lines)}')
-    print(f'Day 24b: {day24b(lines)}')
+        trajectories = parse(read_input(fd))
+    print(f'Day 24a: {solve_a(trajectories)}')
+    print(f'Day 24b: {solve_b(trajectories)}')
 
 if __name__ == '__main__':
     main()
@@ -3,6 +3,8 @@ from itertools import pairwise
 from functools import reduce
 from typing import List, Optional
 
+from aoc23 import cache, search
+
 TEST_INPUT = [
     'jqt: rhn xhk nvd',
     'rsh: frs pzl lsr',
@@ -22,65 +24,61 @@ TEST_INPUT = [
 
 @dataclass
 class G:
-    edges: set[tuple[str, str]]
-    vertices: set[str]
+
+    """Components (vertices) numbered in the order they are named, with
+    the neighbours of each."""
+
+    names: list[str]
+    adjacent: list[set[int]]
+
+    @property
+    def vertices(self):
+        return range(len(self.names))
 
     def neighbours(self, v):
-        return set(d for s, d in self.edges if s == v) | set(s for s, d in self.edges if d == v)
+        return self.adjacent[v]
 
     def without(self, edges):
-        es = edges + [(d, s) for s, d in edges]
-        return G(self.edges.difference(es), self.vertices)
+        adjacent = [set(a) for a in self.adjacent]
+        for s, d in edges:
+            adjacent[s].discard(d)
+            adjacent[d].discard(s)
+        return G(self.names, adjacent)
 
     @staticmethod
+    @cache.parsed
     def parse(lines):
-        g = G(set(), set())
+        g = G([], [])
+        ids = {}
+
+        def vertex(name):
+            if name not in ids:
+                ids[name] = len(g.names)
+                g.names.append(name)
+                g.adjacent.append(set())
+            return ids[name]
+
         for line in lines:
             source, targets = line.split(':')
-            source = source.strip()
-            g.vertices.add(source)
+            s = vertex(source.strip())
             for t in targets.split():
-                g.edges.add((source, t.strip()))
+                d = vertex(t.strip())
+                g.adjacent[s].add(d)
+                g.adjacent[d].add(s)
         return g
 
     def bfs_gather(self, v):
-        visited = set()
-        queue = [v]
-        while queue:
-            n = queue.pop(0)
-            for nn in self.neighbours(n):
-                if nn not in visited:
-                    visited.add(nn)
-                    queue.append(nn)
-        return visited
-
-    def bfs_shortest_path_to_furthest_node(self, u) -> Optional[List[str]]:
-        visited = set()
-        queue = [[u]]
-        last_path = None
-        while queue:
-            path = queue.pop(0)
-            last_path = path
-            neighbours = self.neighbours(path[-1])
-            for nn in neighbours:
-                if nn not in visited:
-                    visited.add(nn)
-                    queue.append(path + [nn])
-        return last_path
-
-    def bfs_next_augmenting_path_to(self, u: str, dest, used_paths) -> Optional[List[str]]:
-        visited = set()
-        queue = [[u]]
+        return set(search.bfs([v], self.neighbours).costs)
+
+    def bfs_shortest_path_to_furthest_node(self, u) -> Optional[List[int]]:
+        reached = search.bfs([u], self.neighbours)
+        return reached.path(next(reversed(reached.costs)))
+
+    def bfs_next_augmenting_path_to(self, u: int, dest, used_paths) -> Optional[List[int]]:
         out_of_bounds = reduce(lambda a, e: a.union(e), (set(p) for p in used_paths)).difference({dest})
-        while queue:
-            path = queue.pop(0)
-            if path[-1] == dest:
-                return path
-            neighbours = [o for o in self.neighbours(path[-1]) if o not in out_of_bounds]
-            for nn in neighbours:
-                if nn not in visited:
-                    visited.add(nn)
-                    queue.append(path + [nn])
+        reached = search.bfs([u], lambda v: [o for o in self.adjacent[v] if o not in out_of_bounds],
+                             goal=lambda v: v == dest)
+        return None if reached.goal is None else reached.path()
 
 
     def components(self):
@@ -94,13 +92,11 @@ class G:
         return cs
 
 
-def day25a(lines):
-    """
-    >>> day25a(TEST_INPUT)
-    54
-    """
-    g = G.parse(lines)
+def parse(lines):
+    return G.parse(lines)
 
+
+def solve_a(g):
     # Use variation on max-flow min-cut... repeated bfs to find
     # shortest path to end which doesn't use nodes already at
     # capacity. If capacity is just one, the min-flow aspect
@@ -146,10 +142,17 @@ def day25a(lines):
 
     return a * b
 
+def day25a(lines):
+    """
+    >>> day25a(TEST_INPUT)
+    54
+    """
+    return solve_a(parse(lines))
+
 def main():
     with open('aoc23/data/day25input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 25a: {day25a(lines)}')
+        g = parse(list(fd))
+    print(f'Day 25a: {solve_a(g)}')
 
 if __name__ == '__main__':
     main()
@@ -4,6 +4,8 @@ from operator import mul
 from typing import NamedTuple
 from collections import defaultdict
 
+from aoc23.grid import Grid
+
 TEST_LINES = [
     "467..114..",
     "...*......",
@@ -42,30 +44,32 @@ class Part:
 
 
 def to_parts(row, line):
-    return list(map(partial(Part, row), re.finditer(r'\d+', line)))
+    return list(map(partial(Part, row), re.finditer(rb'\d+', line)))
 
 
 class Spigot:
     def __init__(self, row, match):
         self.pos = Pos(match.start(0), row)
-        self.value = match.group(0)
+        self.value = match.group(0).decode()
 
     def __repr__(self):
         return f'<Spigot: {self.pos}: {self.value}>'
 
 
 def to_spigots(row, line):
-    return list(map(partial(Spigot, row), re.finditer(r'[^0-9.]', line)))
+    return list(map(partial(Spigot, row), re.finditer(rb'[^0-9.]', line)))
 
 
 class Schematic:
     def __init__(self, lines):
-        self.parts = sum(list(map(lambda t: to_parts(*t), enumerate(lines))), [])
-        self.spigots = sum(list(map(lambda t: to_spigots(*t), enumerate(lines))), [])
-        self.spigot_positions = set(s.pos for s in self.spigots)
+        # padded so that the halos of parts on the edge can be looked up
+        self.grid = Grid(lines, pad=1)
+        rows = [self.grid.row(y) for y in range(self.grid.height)]
+        self.parts = sum(list(map(lambda t: to_parts(*t), enumerate(rows))), [])
+        self.spigots = sum(list(map(lambda t: to_spigots(*t), enumerate(rows))), [])
 
     def candidate_parts(self):
-        return filter(lambda part: part.halo & self.spigot_positions, self.parts)
+        return filter(lambda part: any(self.grid[h] not in '0123456789.' for h in part.halo), self.parts)
 
     def identify_geared_pairs(self):
         stars = filter(lambda s: s.value == '*', self.spigots)
@@ -77,12 +81,27 @@ class Schematic:
         return [pair for pair in star_adjencencies if len(pair) == 2]
 
 
+def parse(lines):
+    return Schematic(lines)
+
+
+def solve_a(schematic):
+    return sum(map(lambda p: p.value, schematic.candidate_parts()))
+
+
+def solve_b(schematic):
+    return sum(
+        mul(*map(lambda p: p.value, pair))
+        for pair in schematic.identify_geared_pairs()
+    )
+
+
 def day3a(lines):
     """
     >>> day3a(TEST_LINES)
     4361
     """
-    return sum(map(lambda p: p.value, Schematic(lines).candidate_parts()))
+    return solve_a(parse(lines))
 
 
 def day3b(lines):
@@ -90,16 +109,13 @@ def day3b(lines):
     >>> day3b(TEST_LINES)
     467835
     """
-    return sum(
-        mul(*map(lambda p: p.value, pair))
-        for pair in Schematic(lines).identify_geared_pairs()
-    )
+    return solve_b(parse(lines))
 
 
 def main():
-    lines = list(open('aoc23/data/day3input.txt'))
-    print(f'Day 3a: {day3a(lines)}')
-    print(f'Day 3b: {day3b(lines)}')
+    schematic = parse(list(open('aoc23/data/day3input.txt')))
+    print(f'Day 3a: {solve_a(schematic)}')
+    print(f'Day 3b: {solve_b(schematic)}')
 
 
 if __name__ == '__main__':
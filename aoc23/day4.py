@@ -1,11 +1,16 @@
-import re
+import functools, re
 
-card_re = re.compile(r'Card\s+(\d+):\s+(.*)\s+\|\s+(.*)\s*$')
+from aoc23 import inputs
+
+
+@functools.cache
+def card_re():
+    return re.compile(r'Card\s+(\d+):\s+(.*)\s+\|\s+(.*)\s*$')
 
 
 class Card:
     def __init__(self, line):
-        if m := card_re.match(line):
+        if m := card_re().match(line):
             self.id = int(m.group(1))
             self.winners = set(int(s) for s in m.group(2).split())
             self.revealed = set(int(s) for s in m.group(3).split())
@@ -34,12 +39,31 @@ TEST_LINES = [
 ]
 
 
+def parse(lines):
+    return [Card(line) for line in lines]
+
+
+def solve_a(cards):
+    return sum(card.score() for card in cards)
+
+
+def solve_b(cards):
+    counts = [1] * len(cards)
+    for i in range(0, len(cards)):
+        hits = cards[i].matches()
+        if hits:
+            for offset in range(1, hits + 1):
+                if i + offset < len(cards):
+                    counts[i + offset] += counts[i]
+    return sum(counts)
+
+
 def day4a(lines):
     """
     >>> day4a(TEST_LINES)
     13
     """
-    return sum(Card(line).score() for line in lines)
+    return solve_a(parse(lines))
 
 
 def day4b(lines):
@@ -47,21 +71,17 @@ def day4b(lines):
     >>> day4b(TEST_LINES)
     30
     """
-    counts = [1] * len(lines)
-    for i in range(0, len(lines)):
-        hits = Card(lines[i]).matches()
-        if hits:
-            for offset in range(1, hits + 1):
-                if i + offset < len(lines):
-                    counts[i + offset] += counts[i]
-    return sum(counts)
+    return solve_b(parse(lines))
+
+
+read_input = inputs.lines
 
 
 def main():
-    with open('aoc23/data/day4input.txt') as f:
-        lines = list(f)
-    print(f'Day 4a: {day4a(lines)}')
-    print(f'Day 4b: {day4b(lines)}')
+    with open('aoc23/data/day4input.txt') as fd:
+        cards = parse(read_input(fd))
+    print(f'Day 4a: {solve_a(cards)}')
+    print(f'Day 4b: {solve_b(cards)}')
 
 
 if __name__ == '__main__':
@@ -1,8 +1,10 @@
-import re
+import functools, re
 from dataclasses import dataclass
 from functools import reduce
 from itertools import batched, chain, count
 
+from aoc23 import cache, tokens
+
 TEST_INPUT = [
     'seeds: 79 14 55 13',
     '',
@@ -134,7 +136,7 @@ def parse_mapping(line_iter) -> RangeMapping:
     perturbations = []
     for line in line_iter:
         if line.strip():
-            (to, fr, n) = map(int, line.split())
+            (to, fr, n) = tokens.ints(line)
             perturbations.append(RangePerturbation(fr, to, n))
         else:
             break
@@ -153,29 +155,29 @@ def parse_mappings(line_iter) -> list[RangeMapping]:
     return mappings
 
 
-seeds_re = re.compile(r'seeds: (.*)')
+@functools.cache
+def seeds_re():
+    return re.compile(r'seeds: (.*)')
 
 
 def parse_seeds(line_iter) -> list[int]:
-    if m := seeds_re.match(next(line_iter)):
-        return list(map(int, m.group(1).split()))
+    if m := seeds_re().match(next(line_iter)):
+        return list(tokens.ints(m.group(1)))
     else:
         return []
 
 
-def parse_seed_ranges(line_iter) -> list[range]:
-    if m := seeds_re.match(next(line_iter)):
-        return list(
-            map(
-                lambda p: range(p[0], p[0] + p[1]),
-                iter(batched(map(int, m.group(1).split()), 2)),
-            )
+def seed_ranges(seeds) -> list[range]:
+    return list(
+        map(
+            lambda p: range(p[0], p[0] + p[1]),
+            iter(batched(seeds, 2)),
         )
-    else:
-        return []
+    )
 
 
-def parse_puzzle_a(lines):
+@cache.parsed
+def parse(lines):
     it = iter(lines)
     seeds = parse_seeds(it)
     next(it)
@@ -183,12 +185,13 @@ def parse_puzzle_a(lines):
     return PuzzleA(seeds, mappings)
 
 
-def parse_puzzle_b(lines):
-    it = iter(lines)
-    seed_ranges = parse_seed_ranges(it)
-    next(it)
-    mappings = parse_mappings(it)
-    return PuzzleB(seed_ranges, mappings)
+def solve_a(puzzle):
+    return min(puzzle.seed_locations())
+
+
+def solve_b(puzzle):
+    puzzle = PuzzleB(seed_ranges(puzzle.seeds), puzzle.mappings)
+    return min(map(lambda x: x.start, puzzle.seed_location_ranges()))
 
 
 def day5a(lines):
@@ -196,7 +199,7 @@ def day5a(lines):
     >>> day5a(TEST_INPUT)
     35
     """
-    return min(parse_puzzle_a(lines).seed_locations())
+    return solve_a(parse(lines))
 
 
 def day5b(lines):
@@ -204,14 +207,14 @@ def day5b(lines):
     >>> day5b(TEST_INPUT)
     46
     """
-    return min(map(lambda x: x.start, parse_puzzle_b(lines).seed_location_ranges()))
+    return solve_b(parse(lines))
 
 
 def main():
     with open('aoc23/data/day5input.txt') as f:
-        lines = list(f)
-    print(f'Day 5a: {day5a(lines)}')
-    print(f'Day 5b: {day5b(lines)}')
+        puzzle = parse(list(f))
+    print(f'Day 5a: {solve_a(puzzle)}')
+    print(f'Day 5b: {solve_b(puzzle)}')
 
 
 if __name__ == '__main__':
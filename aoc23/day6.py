@@ -3,6 +3,8 @@ from math import sqrt, ceil, floor
 from functools import reduce
 from operator import mul
 
+from aoc23 import tokens
+
 TEST_INPUT = ['Time:      7  15   30', 'Distance:  9  40  200']
 
 
@@ -26,15 +28,13 @@ class Puzzle(NamedTuple):
     races: list[Race]
 
     @staticmethod
-    def parse_a(lines: list[str]):
-        times = [int(t) for t in lines[0].split(':')[1].split()]
-        distances = [int(t) for t in lines[1].split(':')[1].split()]
+    def parse(lines: list[str]):
+        times, distances = tokens.ints(lines[0]), tokens.ints(lines[1])
         return Puzzle([Race(*t) for t in zip(times, distances)])
 
-    @staticmethod
-    def parse_b(lines: list[str]):
-        time = int(''.join(t for t in lines[0].split(':')[1].split()))
-        distance = int(''.join(t for t in lines[1].split(':')[1].split()))
+    def unkerned(self):
+        time = int(''.join(str(race.time) for race in self.races))
+        distance = int(''.join(str(race.distance) for race in self.races))
         puzzle = Puzzle([Race(time, distance)])
         return puzzle
 
@@ -42,12 +42,24 @@ class Puzzle(NamedTuple):
         return reduce(mul, (len(race.winning_range()) for race in self.races), 1)
 
 
+def parse(lines):
+    return Puzzle.parse(lines)
+
+
+def solve_a(puzzle):
+    return puzzle.error_margin()
+
+
+def solve_b(puzzle):
+    return puzzle.unkerned().error_margin()
+
+
 def day6a(lines):
     """
     >>> day6a(TEST_INPUT)
     288
     """
-    return Puzzle.parse_a(lines).error_margin()
+    return solve_a(parse(lines))
 
 
 def day6b(lines):
@@ -55,14 +67,14 @@ def day6b(lines):
     >>> day6b(TEST_INPUT)
     71503
     """
-    return Puzzle.parse_b(lines).error_margin()
+    return solve_b(parse(lines))
 
 
 def main():
     with open('aoc23/data/day6input.txt') as f:
-        lines = list(f)
-    print(f'Day 6a: {day6a(lines)}')
-    print(f'Day 6b: {day6b(lines)}')
+        puzzle = parse(list(f))
+    print(f'Day 6a: {solve_a(puzzle)}')
+    print(f'Day 6b: {solve_b(puzzle)}')
 
 
 if __name__ == '__main__':
@@ -1,5 +1,7 @@
 from collections import Counter
 
+from aoc23 import inputs
+
 TEST_INPUT = ['32T3K 765', 'T55J5 684', 'KK677 28', 'KTJJT 220', 'QQQJA 483']
 
 val_map_a = {v: k for k, v in enumerate('23456789TJQKA')}
@@ -48,12 +50,25 @@ class Hand:
         return self.text == other.text
 
 
-def parse_a(lines):
-    return [(Hand.a(h), int(b)) for h, b in (l.split() for l in lines)]
+def parse(lines):
+    return [(h, int(b)) for h, b in (l.split() for l in lines)]
 
 
-def parse_b(lines):
-    return [(Hand.b(h), int(b)) for h, b in (l.split() for l in lines)]
+def winnings(hands):
+    return sum(
+        map(
+            lambda t: (t[0] + 1) * t[1],
+            enumerate(bid for _, bid in sorted(hands, key=lambda t: t[0])),
+        )
+    )
+
+
+def solve_a(bids):
+    return winnings((Hand.a(h), b) for h, b in bids)
+
+
+def solve_b(bids):
+    return winnings((Hand.b(h), b) for h, b in bids)
 
 
 def day7a(lines):
@@ -61,12 +76,7 @@ def day7a(lines):
     >>> day7a(TEST_INPUT)
     6440
     """
-    return sum(
-        map(
-            lambda t: (t[0] + 1) * t[1],
-            enumerate(bid for _, bid in sorted(parse_a(lines), key=lambda t: t[0])),
-        )
-    )
+    return solve_a(parse(lines))
 
 
 def day7b(lines):
@@ -74,19 +84,17 @@ def day7b(lines):
     >>> day7b(TEST_INPUT)
     5905
     """
-    return sum(
-        map(
-            lambda t: (t[0] + 1) * t[1],
-            enumerate(bid for _, bid in sorted(parse_b(lines), key=lambda t: t[0])),
-        )
-    )
+    return solve_b(parse(lines))
+
+
+read_input = inputs.lines
 
 
 def main():
     with open('aoc23/data/day7input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 7a: {day7a(lines)}')
-    print(f'Day 7b: {day7b(lines)}')
+        bids = parse(read_input(fd))
+    print(f'Day 7a: {solve_a(bids)}')
+    print(f'Day 7b: {solve_b(bids)}')
 
 
 if __name__ == '__main__':
@@ -1,8 +1,10 @@
-import re
+import functools, re
 from dataclasses import dataclass
 from itertools import cycle
 from math import lcm
 
+from aoc23 import cache
+
 TEST_INPUT_A = [
     'RL',
     '',
@@ -36,7 +38,9 @@ TEST_INPUT_C = [
     'XXX = (XXX, XXX)',
 ]
 
-link_re = re.compile(r'(\w{3}) = \((\w{3}), (\w{3})\)')
+@functools.cache
+def link_re():
+    return re.compile(r'(\w{3}) = \((\w{3}), (\w{3})\)')
 
 
 @dataclass
@@ -55,11 +59,13 @@ class Puzzle:
             yield (choice, node, tick)
 
     @staticmethod
+    @cache.parsed
     def parse(lines):
+        link = link_re()
         route = list(('L', 'R').index(c) for c in lines[0].strip())
         graph = {
             n: (l, r)
-            for n, l, r in (link_re.match(line).groups() for line in lines[2:])
+            for n, l, r in (link.match(line).groups() for line in lines[2:])
         }
         return Puzzle(route, graph)
 
@@ -75,6 +81,20 @@ class Puzzle:
         return b - a
 
 
+def parse(lines):
+    return Puzzle.parse(lines)
+
+
+def solve_a(puzzle):
+    return next(
+        t for _, (_, n, t) in enumerate(puzzle.follow()) if n == 'ZZZ'
+    )
+
+
+def solve_b(puzzle):
+    return lcm(*[puzzle.measure_cycle(s) for s in puzzle.ghost_starts()])
+
+
 def day8a(lines):
     """
     >>> day8a(TEST_INPUT_A)
@@ -82,9 +102,7 @@ def day8a(lines):
     >>> day8a(TEST_INPUT_B)
     6
     """
-    return next(
-        t for _, (_, n, t) in enumerate(Puzzle.parse(lines).follow()) if n == 'ZZZ'
-    )
+    return solve_a(parse(lines))
 
 
 def day8b(lines):
@@ -92,15 +110,14 @@ def day8b(lines):
     >>> day8b(TEST_INPUT_C)
     6
     """
-    puzzle = Puzzle.parse(lines)
-    return lcm(*[puzzle.measure_cycle(s) for s in puzzle.ghost_starts()])
+    return solve_b(parse(lines))
 
 
 def main():
     with open('aoc23/data/day8input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 8a: {day8a(lines)}')
-    print(f'Day 8b: {day8b(lines)}')
+        puzzle = parse(list(fd))
+    print(f'Day 8a: {solve_a(puzzle)}')
+    print(f'Day 8b: {solve_b(puzzle)}')
 
 
 if __name__ == '__main__':
@@ -1,5 +1,7 @@
 from itertools import pairwise
 
+from aoc23 import inputs, tokens
+
 TEST_INPUT = ['0 3 6 9 12 15', '1 3 6 10 15 21', '10 13 16 21 30 45']
 
 def compute_next(nums):
@@ -18,12 +20,26 @@ def compute_next(nums):
 
 
 
+def parse(lines):
+    return tokens.rows(lines)
+
+
+def solve_a(rows):
+    values, offsets = rows
+    return sum(compute_next(values[i:j]) for i, j in pairwise(offsets))
+
+
+def solve_b(rows):
+    values, offsets = rows
+    return sum(compute_next(reversed(values[i:j])) for i, j in pairwise(offsets))
+
+
 def day9a(lines):
     """
     >>> day9a(TEST_INPUT)
     114
     """
-    return sum(compute_next(int(c) for c in line.split()) for line in lines)
+    return solve_a(parse(lines))
 
 
 def day9b(lines):
@@ -31,14 +47,17 @@ def day9b(lines):
     >>> day9b(TEST_INPUT)
     2
     """
-    return sum(compute_next(int(c) for c in reversed(line.split())) for line in lines)
+    return solve_b(parse(lines))
+
+
+read_input = inputs.lines
 
 
 def main():
     with open('aoc23/data/day9input.txt') as fd:
-        lines = list(fd)
-    print(f'Day 9a: {day9a(lines)}')
-    print(f'Day 9b: {day9b(lines)}')
+        rows = parse(read_input(fd))
+    print(f'Day 9a: {solve_a(rows)}')
+    print(f'Day 9b: {solve_b(rows)}')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,608 @@
+"""Seeded synthetic inputs for every day, at any scale.
+
+`generate(n, scale, seed)` returns the lines of an input for day `n`
+with roughly `scale` times as much in it as the puzzle input: `scale`
+times the lines, or the cells for the grid days. Inputs keep whatever
+structure the solvers rely on (a single pipe loop through S, a rock
+trajectory that hits every hailstone, two clusters joined by three
+wires...) so they can be solved at every size.
+"""
+
+import math, random, string
+from itertools import pairwise
+
+GENERATORS = {}
+
+
+def generator(fn):
+    GENERATORS[int(fn.__name__.removeprefix('day'))] = fn
+    return fn
+
+
+def generate(n, scale=1.0, seed=0):
+    """
+    >>> generate(7, 0.003, seed=1)
+    ['25Q9T 881', 'J8Q48 643', '72747 596']
+    """
+    return GENERATORS[n](random.Random(f'{n}:{seed}'), scale)
+
+
+def scaled(base, scale, minimum=1):
+    """
+    >>> scaled(1000, 0.5), scaled(1000, 0.0001), scaled(1000, 0.0001, minimum=5)
+    (500, 1, 5)
+    """
+    return max(minimum, round(base * scale))
+
+
+def side(base, scale, minimum=5):
+    """Side of a square grid with `scale` times the cells of a `base`-sided one.
+
+    >>> side(140, 4)
+    280
+    """
+    return scaled(base, math.sqrt(scale), minimum)
+
+
+def names(rng, count, length=3, alphabet=string.ascii_lowercase, exclude=()):
+    """`count` distinct random names, lengthening them when there are
+    not enough of `length` characters to go round."""
+    while len(alphabet) ** length < 2 * (count + len(exclude)):
+        length += 1
+    found = set(exclude)
+    result = []
+    while len(result) < count:
+        name = ''.join(rng.choices(alphabet, k=length))
+        if name not in found:
+            found.add(name)
+            result.append(name)
+    return result
+
+
+DIGIT_WORDS = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
+
+
+@generator
+def day1(rng, scale):
+    lines = []
+    for _ in range(scaled(1000, scale)):
+        chunks = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(0, 6)))
+                  for _ in range(rng.randint(2, 6))]
+        chunks += [rng.choice(DIGIT_WORDS) for _ in range(rng.randint(0, 3))]
+        chunks += [str(rng.randint(1, 9)) for _ in range(rng.randint(1, 3))]
+        rng.shuffle(chunks)
+        lines.append(''.join(chunks) or str(rng.randint(1, 9)))
+    return lines
+
+
+@generator
+def day2(rng, scale):
+    lines = []
+    for game in range(1, scaled(100, scale) + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colours = rng.sample(['red', 'green', 'blue'], rng.randint(1, 3))
+            draws.append(', '.join(f'{rng.randint(1, 20)} {c}' for c in colours))
+        lines.append(f'Game {game}: ' + '; '.join(draws))
+    return lines
+
+
+@generator
+def day3(rng, scale):
+    width = side(140, scale)
+    lines = []
+    for _ in range(width):
+        row = []
+        while len(row) < width:
+            r = rng.random()
+            if r < 0.12 and len(row) + 4 <= width:
+                row.extend(str(rng.randint(1, 999)))
+                row.append('.' if rng.random() < 0.8 else rng.choice('*#+$/@=%&-'))
+            elif r < 0.16:
+                row.append(rng.choice('*#+$/@=%&-'))
+            else:
+                row.append('.')
+        lines.append(''.join(row[:width]))
+    return lines
+
+
+@generator
+def day4(rng, scale):
+    lines = []
+    for card in range(1, scaled(200, scale) + 1):
+        # half as likely to have each further match, so the copies won
+        # stay in proportion to the cards rather than growing exponentially
+        matches = 0
+        while matches < 10 and rng.random() < 0.5:
+            matches += 1
+        numbers = rng.sample(range(1, 100), 35 - matches)
+        winners = numbers[:10]
+        revealed = winners[:matches] + numbers[10:]
+        rng.shuffle(revealed)
+        lines.append(f'Card {card:>3}: ' + ' '.join(f'{n:>2}' for n in winners) +
+                     ' | ' + ' '.join(f'{n:>2}' for n in revealed))
+    return lines
+
+
+@generator
+def day5(rng, scale):
+    top = 1 << 32
+    seeds = []
+    for _ in range(scaled(10, scale)):
+        start = rng.randrange(top)
+        seeds += [start, rng.randint(1, min(top - start, 500_000_000))]
+    lines = ['seeds: ' + ' '.join(map(str, seeds))]
+    categories = ['seed', 'soil', 'fertilizer', 'water', 'light', 'temperature', 'humidity', 'location']
+    for source, dest in pairwise(categories):
+        cuts = sorted(rng.sample(range(1, top), scaled(30, scale)))
+        lines += ['', f'{source}-to-{dest} map:']
+        for start, stop in pairwise([0] + cuts + [top]):
+            if rng.random() < 0.9:
+                lines.append(f'{rng.randrange(top - (stop - start))} {start} {stop - start}')
+    return lines
+
+
+@generator
+def day6(rng, scale):
+    races = [rng.randint(70, 99) for _ in range(scaled(4, scale))]
+    distances = [rng.randint(1000, t * t // 4 - 1) for t in races]
+    return ['Time:     ' + ''.join(f'{t:>6}' for t in races),
+            'Distance: ' + ''.join(f'{d:>6}' for d in distances)]
+
+
+@generator
+def day7(rng, scale):
+    return [''.join(rng.choices('AKQJT98765432', k=5)) + f' {rng.randint(1, 1000)}'
+            for _ in range(scaled(1000, scale))]
+
+
+def primes(start, count):
+    found = []
+    n = start
+    while len(found) < count:
+        if all(n % p for p in range(2, math.isqrt(n) + 1)):
+            found.append(n)
+        n += 1
+    return found
+
+
+@generator
+def day8(rng, scale):
+    # each ghost walks a ring on which its only Z node recurs with a
+    # period of a distinct prime, whichever way the route turns
+    route = ''.join(rng.choices('LR', k=293))
+    ghosts = 6
+    rings = primes(scaled(120, scale, minimum=3), ghosts)
+    alphabet = string.ascii_uppercase + string.digits
+    middle = [a + b for a in alphabet for b in alphabet]
+    last = alphabet.replace('A', '').replace('Z', '')
+    if sum(rings) > len(middle) * len(last):
+        raise ValueError(f'day 8 node names only stretch to {len(middle) * len(last)} nodes')
+    plain = iter(rng.sample([m + e for m in middle for e in last], sum(rings)))
+    lines = [route, '']
+    for g, size in enumerate(rings):
+        start, end = ('AAA', 'ZZZ') if g == 0 else (f'{g}{g}A', f'{g}{g}Z')
+        ring = [next(plain) for _ in range(size - 1)] + [end]
+        rng.shuffle(ring)
+        lines.append(f'{start} = ({ring[0]}, {ring[0]})')
+        for a, b in pairwise(ring + ring[:1]):
+            lines.append(f'{a} = ({b}, {b})')
+    return lines
+
+
+@generator
+def day9(rng, scale):
+    lines = []
+    for _ in range(scaled(200, scale)):
+        coefficients = [rng.randint(-9, 9) for _ in range(rng.randint(1, 6))]
+        values = [sum(c * x ** i for i, c in enumerate(coefficients)) for x in range(21)]
+        lines.append(' '.join(map(str, values)))
+    return lines
+
+
+def spanning_tree(rng, width, height):
+    """Edges of a random spanning tree over a grid of cells."""
+    seen = {(0, 0)}
+    stack = [(0, 0)]
+    edges = set()
+    while stack:
+        x, y = stack[-1]
+        options = [(x + dx, y + dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                   if 0 <= x + dx < width and 0 <= y + dy < height and (x + dx, y + dy) not in seen]
+        if not options:
+            stack.pop()
+            continue
+        nxt = rng.choice(options)
+        seen.add(nxt)
+        edges.add(frozenset(((x, y), nxt)))
+        stack.append(nxt)
+    return edges
+
+
+def tree_contour(rng, width, height):
+    """A simple closed loop visiting every point of a (2 * width) by
+    (2 * height) grid: the outline of a random spanning tree on the
+    coarser grid. Returns the points in order."""
+    tree = spanning_tree(rng, width, height)
+    links = {}
+
+    def link(a, b):
+        links.setdefault(a, []).append(b)
+        links.setdefault(b, []).append(a)
+
+    for i in range(width):
+        for j in range(height):
+            x, y = 2 * i, 2 * j
+            if frozenset(((i, j), (i, j - 1))) not in tree:
+                link((x, y), (x + 1, y))
+            if frozenset(((i, j), (i, j + 1))) not in tree:
+                link((x, y + 1), (x + 1, y + 1))
+            else:
+                link((x, y + 1), (x, y + 2))
+                link((x + 1, y + 1), (x + 1, y + 2))
+            if frozenset(((i, j), (i - 1, j))) not in tree:
+                link((x, y), (x, y + 1))
+            if frozenset(((i, j), (i + 1, j))) not in tree:
+                link((x + 1, y), (x + 1, y + 1))
+            else:
+                link((x + 1, y), (x + 2, y))
+                link((x + 1, y + 1), (x + 2, y + 1))
+
+    loop = [(0, 0)]
+    prev, here = None, (0, 0)
+    while True:
+        nxt = next(p for p in links[here] if p != prev)
+        if nxt == loop[0]:
+            return loop
+        loop.append(nxt)
+        prev, here = here, nxt
+
+
+PIPES = {
+    frozenset('NS'): '|', frozenset('EW'): '-', frozenset('NE'): 'L',
+    frozenset('NW'): 'J', frozenset('SW'): '7', frozenset('SE'): 'F',
+}
+
+
+def heading(a, b):
+    (ax, ay), (bx, by) = a, b
+    return 'E' if bx > ax else 'W' if bx < ax else 'S' if by > ay else 'N'
+
+
+REVERSE = {'N': 'S', 'S': 'N', 'E': 'W', 'W': 'E'}
+
+
+@generator
+def day10(rng, scale):
+    # a tree outline with its points spread two apart leaves tiles
+    # enclosed by the loop and others outside it
+    width = side(140, scale, minimum=8)
+    cells = max(1, (width - 3) // 4)
+    loop = [(2 * x + 1, 2 * y + 1) for x, y in tree_contour(rng, cells, cells)]
+    path = []
+    for a, b in pairwise(loop + loop[:1]):
+        path.append(a)
+        path.append(((a[0] + b[0]) // 2, (a[1] + b[1]) // 2))
+    grid = [[rng.choice('|-LJ7F..') for _ in range(width)] for _ in range(width)]
+    for i, (x, y) in enumerate(path):
+        before, after = path[i - 1], path[(i + 1) % len(path)]
+        grid[y][x] = PIPES[frozenset((REVERSE[heading(before, (x, y))], heading((x, y), after)))]
+    sx, sy = rng.choice(path)
+    grid[sy][sx] = 'S'
+    on_path = set(path)
+    for x, y in ((sx + 1, sy), (sx - 1, sy), (sx, sy + 1), (sx, sy - 1)):
+        if (x, y) not in on_path:
+            grid[y][x] = '.'
+    return [''.join(row) for row in grid]
+
+
+@generator
+def day11(rng, scale):
+    width = side(140, scale)
+    empty_rows = set(rng.sample(range(width), width // 20))
+    empty_cols = set(rng.sample(range(width), width // 20))
+    lines = []
+    for y in range(width):
+        lines.append(''.join('#' if y not in empty_rows and x not in empty_cols and rng.random() < 0.023 else '.'
+                             for x in range(width)))
+    if '#' not in ''.join(lines):
+        lines[0] = '#' + lines[0][1:]
+    return lines
+
+
+@generator
+def day12(rng, scale):
+    lines = []
+    for _ in range(scaled(1000, scale)):
+        counts = [rng.randint(1, 6) for _ in range(rng.randint(1, 6))]
+        springs = '.' * rng.randint(0, 2)
+        for c in counts:
+            springs += '#' * c + '.' * rng.randint(1, 3)
+        springs = springs[:-1] if rng.random() < 0.5 else springs
+        masked = ''.join('?' if rng.random() < 0.45 else s for s in springs)
+        lines.append(f'{masked} {",".join(map(str, counts))}')
+    return lines
+
+
+def reflected(rng, size):
+    """`size` values with a mirror between two of them."""
+    axis = rng.randint(1, size - 1)
+    values = [None] * size
+    for i in range(axis):
+        values[i] = rng.random()
+    for i in range(axis, size):
+        mirror = 2 * axis - 1 - i
+        values[i] = values[mirror] if mirror >= 0 else rng.random()
+    return values
+
+
+@generator
+def day13(rng, scale):
+    lines = []
+    for _ in range(scaled(100, scale)):
+        width, height = rng.randint(5, 17), rng.randint(5, 17)
+        if rng.random() < 0.5:
+            cols = reflected(rng, width)
+            pattern = {c: ''.join(rng.choices('#.', k=height)) for c in set(cols)}
+            rows = [''.join(pattern[c][y] for c in cols) for y in range(height)]
+        else:
+            rows_key = reflected(rng, height)
+            pattern = {r: ''.join(rng.choices('#.', k=width)) for r in set(rows_key)}
+            rows = [pattern[r] for r in rows_key]
+        rows = [list(r) for r in rows]
+        y, x = rng.randrange(height), rng.randrange(width)
+        rows[y][x] = '#' if rows[y][x] == '.' else '.'
+        lines += [''.join(r) for r in rows] + ['']
+    return lines[:-1]
+
+
+@generator
+def day14(rng, scale):
+    width = side(100, scale)
+    return [''.join(rng.choices('O#.', weights=(20, 8, 72), k=width)) for _ in range(width)]
+
+
+@generator
+def day15(rng, scale):
+    steps = []
+    for _ in range(scaled(4000, scale)):
+        label = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6)))
+        steps.append(f'{label}-' if rng.random() < 0.4 else f'{label}={rng.randint(1, 9)}')
+    return [','.join(steps)]
+
+
+@generator
+def day16(rng, scale):
+    width = side(110, scale)
+    return [''.join(rng.choices('./\\|-', weights=(90, 2.5, 2.5, 2.5, 2.5), k=width)) for _ in range(width)]
+
+
+@generator
+def day17(rng, scale):
+    width = side(141, scale)
+    return [''.join(rng.choices('123456789', k=width)) for _ in range(width)]
+
+
+def skyline(rng, count, length):
+    """Steps around a simple rectilinear polygon, `count` of them (even
+    and at least 4), each at most twice `length` long: a profile of random
+    heights along the top, then back along a profile of random depths
+    below it."""
+    top_runs = max(1, (count // 2) // 2)
+    bottom_runs = max(1, count // 2 - top_runs)
+    tops = [rng.randint(length + 1, 2 * length) for _ in range(top_runs)]
+    for i in range(1, top_runs):
+        while tops[i] == tops[i - 1]:
+            tops[i] = rng.randint(length + 1, 2 * length)
+    bottoms = [rng.randint(0, length - 1) for _ in range(bottom_runs)]
+    for i in range(1, bottom_runs):
+        while bottoms[i] == bottoms[i - 1]:
+            bottoms[i] = rng.randint(0, length - 1)
+    top_widths = [rng.randint(1, length) for _ in range(top_runs)]
+    bottom_widths = [rng.randint(1, length) for _ in range(bottom_runs)]
+    while diff := sum(top_widths) - sum(bottom_widths):
+        widths = bottom_widths if diff > 0 else top_widths
+        i = rng.randrange(len(widths))
+        widths[i] += min(abs(diff), 2 * length - widths[i])
+
+    # heights are measured upwards, so U heads for a greater one
+    steps = []
+    for i, w in enumerate(top_widths):
+        steps.append(('R', w))
+        nxt = tops[i + 1] if i + 1 < top_runs else bottoms[-1]
+        steps.append(('U' if nxt > tops[i] else 'D', abs(tops[i] - nxt)))
+    for i, w in enumerate(reversed(bottom_widths)):
+        steps.append(('L', w))
+        here = bottoms[bottom_runs - 1 - i]
+        nxt = bottoms[bottom_runs - 2 - i] if i + 1 < bottom_runs else tops[0]
+        steps.append(('U' if nxt > here else 'D', abs(here - nxt)))
+    return steps
+
+
+@generator
+def day18(rng, scale):
+    count = 2 * scaled(312, scale, minimum=2)
+    part_a = skyline(rng, count, 10 + count // 10)
+    part_b = skyline(rng, count, 0xfffff // 2)
+    return [f'{d} {n} (#{m:05x}{"RDLU".index(e)})' for (d, n), (e, m) in zip(part_a, part_b)]
+
+
+@generator
+def day19(rng, scale):
+    workflows = names(rng, scaled(575, scale), length=2, exclude=('in',))
+    workflows[0] = 'in'
+    lines = []
+    todo = iter(workflows[1:])
+    for name in workflows:
+        clauses = []
+        for _ in range(rng.randint(1, 4)):
+            target = next(todo, None) if rng.random() < 0.6 else None
+            clauses.append(target or rng.choice('AR'))
+        *conditions, fallback = clauses + [next(todo, None) or rng.choice('AR')]
+        rules = [f'{rng.choice("xmas")}{rng.choice("<>")}{rng.randint(1, 4000)}:{t}' for t in conditions]
+        lines.append(f'{name}{{{",".join(rules + [fallback])}}}')
+    # workflows only send parts on to workflows listed after them, so
+    # every part is eventually accepted or rejected
+    unreached = list(todo)
+    if unreached:
+        raise AssertionError(f'unreached workflows {unreached}')
+    lines.append('')
+    for _ in range(scaled(200, scale)):
+        x, m, a, s = (rng.randint(1, 4000) for _ in range(4))
+        lines.append(f'{{x={x},m={m},a={a},s={s}}}')
+    return lines
+
+
+@generator
+def day20(rng, scale):
+    # counters like the puzzle's: a chain of flip-flops, some feeding a
+    # conjunction that feeds back to the others, each counter's
+    # conjunction inverted into a final conjunction
+    counters = scaled(4, scale)
+    bits = 12
+    flip_flops = names(rng, counters * (bits + 2) + 1, length=2, exclude=('rx',))
+    pool = iter(flip_flops)
+    final = next(pool)
+    lines, starts, inverters = [], [], []
+    for _ in range(counters):
+        chain = [next(pool) for _ in range(bits)]
+        hub, inverter = next(pool), next(pool)
+        target = rng.randrange(1 << (bits - 1), 1 << bits) | 1
+        starts.append(chain[0])
+        inverters.append(inverter)
+        for i, ff in enumerate(chain):
+            outs = [chain[i + 1]] if i + 1 < bits else []
+            if target >> i & 1:
+                outs.append(hub)
+            lines.append(f'%{ff} -> {", ".join(outs)}')
+        fed_back = [ff for i, ff in enumerate(chain) if not target >> i & 1 or i == 0]
+        lines.append(f'&{hub} -> {", ".join(fed_back + [inverter])}')
+        lines.append(f'&{inverter} -> {final}')
+    lines.append(f'&{final} -> rx')
+    lines.append(f'broadcaster -> {", ".join(starts)}')
+    rng.shuffle(lines)
+    return lines
+
+
+@generator
+def day21(rng, scale):
+    # like the puzzle: odd-sided, S in the centre, its row and column
+    # and the border clear of rocks
+    width = side(131, scale, minimum=11) | 1
+    mid = width // 2
+    lines = []
+    for y in range(width):
+        row = ['#' if rng.random() < 0.12 else '.' for _ in range(width)]
+        row[0] = row[-1] = row[mid] = '.'
+        if y in (0, mid, width - 1):
+            row = ['.'] * width
+        lines.append(row)
+    lines[mid][mid] = 'S'
+    return [''.join(row) for row in lines]
+
+
+@generator
+def day22(rng, scale):
+    heights = [[0] * 10 for _ in range(10)]
+    lines = []
+    for _ in range(scaled(1231, scale)):
+        x, y = rng.randrange(10), rng.randrange(10)
+        axis, length = rng.choice('xyz'), rng.randint(0, 4)
+        dx, dy, dz = (length if axis == a else 0 for a in 'xyz')
+        if x + dx > 9:
+            x -= dx
+        if y + dy > 9:
+            y -= dy
+        footprint = [(x + i, y + j) for i in range(dx + 1) for j in range(dy + 1)]
+        z = max(heights[j][i] for i, j in footprint) + 1 + rng.randint(0, 3)
+        for i, j in footprint:
+            heights[j][i] = z + dz
+        lines.append(f'{x},{y},{z}~{x + dx},{y + dy},{z + dz}')
+    rng.shuffle(lines)
+    return lines
+
+
+@generator
+def day23(rng, scale):
+    # a square lattice of junctions joined by straight paths, entered
+    # and left down slopes (so part a can only head east and south),
+    # with some paths closed off away from one route through
+    junctions = scaled(6, math.sqrt(scale), minimum=2)
+    spacing, margin = 22, 15
+    width = 2 * margin + (junctions - 1) * spacing + 1
+    grid = [['#'] * width for _ in range(width)]
+
+    def at(i):
+        return margin + i * spacing
+
+    kept = set()
+    i = j = 0
+    while (i, j) != (junctions - 1, junctions - 1):
+        step = rng.choice([s for s in ((1, 0), (0, 1)) if i + s[0] < junctions and j + s[1] < junctions])
+        kept.add((i, j, i + step[0], j + step[1]))
+        i, j = i + step[0], j + step[1]
+
+    for i in range(junctions):
+        for j in range(junctions):
+            grid[at(j)][at(i)] = '.'
+            for di, dj, slope in ((1, 0, '>'), (0, 1, 'v')):
+                if i + di >= junctions or j + dj >= junctions:
+                    continue
+                if (i, j, i + di, j + dj) not in kept and rng.random() < 0.1:
+                    continue
+                for k in range(1, spacing + 1):
+                    x, y = at(i) + k * di, at(j) + k * dj
+                    grid[y][x] = slope if k in (1, spacing - 1) else '.'
+    for y in range(0, margin):
+        grid[y][margin] = '.'
+    for y in range(at(junctions - 1), width):
+        grid[y][at(junctions - 1)] = '.'
+    return [''.join(row) for row in grid]
+
+
+@generator
+def day24(rng, scale):
+    # every hailstone is on course to meet the rock at some whole time;
+    # two of them move in x exactly as the rock does, as in the puzzle
+    rock = [rng.randint(100_000_000_000_000, 300_000_000_000_000) for _ in range(3)]
+    rock_v = [rng.randint(-300, 300) for _ in range(3)]
+    count = scaled(300, scale, minimum=4)
+    times = rng.sample(range(10_000_000_000, 1_000_000_000_000), count)
+    lines = []
+    for k, t in enumerate(times):
+        v = [rng.randint(-300, 300) for _ in range(3)]
+        while v[0] == rock_v[0]:
+            v[0] = rng.randint(-300, 300)
+        if k < 2:
+            v[0] = rock_v[0]
+        p = [r + rv * t - sv * t for r, rv, sv in zip(rock, rock_v, v)]
+        lines.append(f'{p[0]}, {p[1]}, {p[2]} @ {v[0]}, {v[1]}, {v[2]}')
+    rng.shuffle(lines)
+    return lines
+
+
+@generator
+def day25(rng, scale):
+    # two clusters, each well connected within itself, joined by three wires
+    count = scaled(1500, scale, minimum=20)
+    nodes = names(rng, count)
+    halves = [nodes[:count // 2], nodes[count // 2:]]
+    edges = set()
+    for half in halves:
+        for i, a in enumerate(half):
+            for b in rng.sample(half, 4):
+                if a != b and (b, a) not in edges:
+                    edges.add((a, b))
+            if i:
+                b = half[i - 1]
+                if (b, a) not in edges:
+                    edges.add((a, b))
+    for a, b in zip(rng.sample(halves[0], 3), rng.sample(halves[1], 3)):
+        edges.add((a, b))
+    wires = {}
+    for a, b in edges:
+        wires.setdefault(a, []).append(b)
+    lines = [f'{a}: {" ".join(bs)}' for a, bs in wires.items()]
+    rng.shuffle(lines)
+    return lines
+
@@ -0,0 +1,136 @@
+"""Rectangular grids of characters, held compactly.
+
+A `Grid` keeps a byte per cell, row after row in one bytearray, in
+place of a list per row of one-character strings (each an object of its
+own), so a grid costs about its area in bytes and whole rows, columns
+or the lot can be worked over by bytes methods in C.
+
+Cells are read and written by (x, y), which needn't be in bounds by
+as much as the grid's `pad`: a border of that many `fill` cells all
+round, so that a solver can look at the neighbours of an edge cell
+without checking it is there. Nothing checks the bounds any further
+out.
+
+Walks over a grid can instead take a position to be the cell's index
+in `cells` and a direction to be one of the small ints N, E, S, W
+(clockwise, so turning is a table lookup): a step is then adding the
+grid's `offsets[direction]`, with no tuple made or unpacked.
+"""
+
+N, E, S, W = range(4)
+NAMES = 'NESW'
+LEFT = (W, N, E, S)
+RIGHT = (E, S, W, N)
+REVERSE = (S, W, N, E)
+
+
+class Grid:
+
+    """
+    >>> g = Grid(['#.#', '.S.'], pad=1)
+    >>> g.width, g.height, g[0, 0], g[-1, -1], g.find('S')
+    (3, 2, '#', '.', (1, 1))
+    >>> g[1, 0] = 'O'
+    >>> bytes(g.row(0)), bytes(g.column(1)), g.count('#')
+    (b'#O#', b'OS', 2)
+    >>> print(g)
+    #O#
+    .S.
+    >>> start = g.index(1, 1)
+    >>> g.xy(start + g.offsets[N]), g.xy(start + g.offsets[LEFT[N]])
+    ((1, 0), (0, 1))
+    """
+
+    __slots__ = ('width', 'height', 'pad', 'stride', 'cells', 'offsets')
+
+    def __init__(self, rows, pad=0, fill='.'):
+        rows = [row.strip() for row in rows]
+        self.width, self.height, self.pad = len(rows[0]), len(rows), pad
+        self.stride = self.width + 2 * pad
+        self.offsets = (-self.stride, 1, self.stride, -1)
+        if any(len(row) != self.width for row in rows):
+            raise ValueError(f'rows are not all {self.width} wide')
+        edge, side = fill * (self.stride * pad), fill * pad
+        self.cells = bytearray(edge + ''.join(side + row + side for row in rows) + edge, 'ascii')
+
+    @classmethod
+    def blank(cls, width, height, pad=0, fill='.'):
+        return cls([fill * width] * height, pad, fill)
+
+    def index(self, x, y):
+        """Offset of cell (x, y) in `cells`."""
+        return (y + self.pad) * self.stride + x + self.pad
+
+    def xy(self, i):
+        """(x, y) of the cell at offset `i` in `cells`."""
+        y, x = divmod(i, self.stride)
+        return (x - self.pad, y - self.pad)
+
+    def __getitem__(self, pos):
+        x, y = pos
+        return chr(self.cells[(y + self.pad) * self.stride + x + self.pad])
+
+    def __setitem__(self, pos, value):
+        x, y = pos
+        self.cells[(y + self.pad) * self.stride + x + self.pad] = ord(value)
+
+    def at(self, pos):
+        """Byte value of the cell at `pos`."""
+        x, y = pos
+        return self.cells[(y + self.pad) * self.stride + x + self.pad]
+
+    def put(self, pos, value):
+        """Set the cell at `pos` to the byte `value`."""
+        x, y = pos
+        self.cells[(y + self.pad) * self.stride + x + self.pad] = value
+
+    def __contains__(self, pos):
+        x, y = pos
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def row(self, y):
+        """Writable view of row `y`."""
+        start = self.index(0, y)
+        return memoryview(self.cells)[start:start + self.width]
+
+    def column(self, x):
+        """Writable view of column `x`, from the top down."""
+        start = self.index(x, 0)
+        return memoryview(self.cells)[start:start + self.height * self.stride:self.stride]
+
+    def rows(self):
+        for y in range(self.height):
+            yield str(self.row(y), 'ascii')
+
+    def find(self, c):
+        """(x, y) of the first cell holding `c`, raising ValueError
+        (as `str.index` does) if none does.
+
+        >>> Grid(['..']).find('S')
+        Traceback (most recent call last):
+        ...
+        ValueError: 'S' not in grid
+        """
+        for y in range(self.height):
+            start = self.index(0, y)
+            x = self.cells.find(ord(c), start, start + self.width)
+            if x >= 0:
+                return (x - start, y)
+        raise ValueError(f'{c!r} not in grid')
+
+    def count(self, c):
+        return sum(self.cells.count(ord(c), start, start + self.width)
+                   for start in (self.index(0, y) for y in range(self.height)))
+
+    def copy(self):
+        grid = Grid.__new__(Grid)
+        grid.width, grid.height, grid.pad, grid.stride = self.width, self.height, self.pad, self.stride
+        grid.offsets = self.offsets
+        grid.cells = self.cells[:]
+        return grid
+
+    def __eq__(self, other):
+        return isinstance(other, Grid) and (self.width, self.pad, self.cells) == (other.width, other.pad, other.cells)
+
+    def __str__(self):
+        return '\n'.join(self.rows())
@@ -0,0 +1,138 @@
+"""Memory-mapped inputs.
+
+`list(fd)` makes a string of every line before a day has looked at
+any of them. `Mapped` instead maps the file and finds lines (and fields
+within them) as views over the mapping, copying nothing until a day
+asks for a value, so a day can work through a generated input far
+larger than the strings for all its lines would fit in memory.
+
+A day that only reads each line once can opt in with
+`read_input = inputs.lines`.
+"""
+
+import io, mmap
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate
+
+BLOCK = 1 << 20
+
+
+class Mapped:
+
+    """A file's bytes, mapped read-only, with its lines indexed lazily.
+
+    >>> m = Mapped(io.StringIO('1 2  3\\n40,5\\n'))
+    >>> len(m), bytes(m.line(1)), bytes(Mapped(io.StringIO('no newline')).line(0))
+    (2, b'40,5', b'no newline')
+    >>> [bytes(f) for f in m.fields(0)], m.ints(1, sep=b',')
+    ([b'1', b'2', b'3'], [40, 5])
+    """
+
+    def __init__(self, fd):
+        try:
+            self.data = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        except (io.UnsupportedOperation, ValueError):
+            # not a file, or an empty one (which can't be mapped)
+            self.data = fd.read().encode() if isinstance(fd, io.TextIOBase) else fd.read()
+        self.view = memoryview(self.data)
+        self._starts = None
+
+    def blocks(self):
+        """(offset, bytes) of the input in pieces of about BLOCK bytes, each
+        ending at the end of a line: big enough that splitting them into
+        lines is done by str methods, small enough not to copy the file."""
+        data, size, start = self.data, len(self.data), 0
+        while start < size:
+            end = data.rfind(b'\n', start, start + BLOCK) + 1
+            if end <= start:
+                end = data.find(b'\n', start + BLOCK) + 1 or size
+            yield start, data[start:end]
+            start = end
+
+    @property
+    def starts(self):
+        """Offset of each line, ending with where the line after the last
+        would start."""
+        if self._starts is None:
+            self._starts = array('q')
+            for offset, block in self.blocks():
+                lengths = [len(line) + 1 for line in block.removesuffix(b'\n').split(b'\n')]
+                self._starts.extend(accumulate(lengths[:-1], initial=offset))
+            self._starts.append(len(self.data) + (self.data[-1:] != b'\n'))
+        return self._starts
+
+    def __len__(self):
+        return len(self.starts) - 1
+
+    def line(self, i):
+        """View of line `i`, without its newline."""
+        return self.view[self.starts[i]:self.starts[i + 1] - 1]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.line(i)
+
+    def fields(self, i, sep=None):
+        """Views of the fields of line `i` between occurrences of `sep`,
+        or between runs of spaces if `sep` is None."""
+        data, start, end = self.data, self.starts[i], self.starts[i + 1] - 1
+        step = b' ' if sep is None else sep
+        while start <= end:
+            stop = data.find(step, start, end)
+            if stop < 0:
+                stop = end
+            if sep is not None or stop > start:
+                yield self.view[start:stop]
+            start = stop + len(step)
+
+    def ints(self, i, sep=None):
+        return [int(bytes(f)) for f in self.fields(i, sep)]
+
+
+class Lines(Sequence):
+
+    """The lines of a mapped input as strings, each with its newline as
+    `list(fd)` gives them, but made only when read.
+
+    Reading a line twice decodes it twice, so this suits days that work
+    through their input once rather than indexing into it repeatedly.
+
+    >>> lines = Lines(Mapped(io.StringIO('ab\\ncd\\n')))
+    >>> len(lines), lines[-1], lines[:1], list(lines)
+    (2, 'cd\\n', ['ab\\n'], ['ab\\n', 'cd\\n'])
+    """
+
+    def __init__(self, mapped):
+        self.mapped = mapped
+
+    def __len__(self):
+        return len(self.mapped)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        starts = self.mapped.starts
+        return str(self.mapped.view[starts[i]:starts[i + 1]], 'utf-8')
+
+    def __iter__(self):
+        for _, block in self.mapped.blocks():
+            yield from io.StringIO(str(block, 'utf-8'), newline='\n')
+
+    def __reduce__(self):
+        # pickled as the list it stands for
+        return (list, (list(self),))
+
+    def cache_key(self):
+        # keyed by the parse cache on the file's bytes, without decoding them
+        import hashlib
+        return hashlib.sha256(self.mapped.data).digest()
+
+
+def lines(fd):
+    """`read_input` for days reading lines straight off a mapped file."""
+    return Lines(Mapped(fd))
@@ -0,0 +1,195 @@
+"""Bounded memo tables for solvers' caches of intermediate results.
+
+A `Memo` holds values by key up to `maxsize` entries or `maxbytes`
+bytes (as `sys.getsizeof` has them: the key and value themselves, not
+what they refer to), evicting the least recently used entry or, with
+`policy='lfu'`, the least often used. Each counts its hits, misses and
+evictions in `metrics` as `<name>_hits` and so on, so the runner
+reports alongside a part's other metrics whether its caches are paying
+their way (`describe()`).
+
+A memo given the module it belongs to as `persist` can keep its
+entries on disk between runs, once `enable()`d: they are loaded at its
+first miss and written by `save()`, in a file keyed by the module's
+source so that editing it starts afresh. Values must then pickle, and
+keys should hold everything the value depends on.
+"""
+
+import os, sys
+from collections import OrderedDict
+
+from aoc23 import metrics
+
+MEMOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.aoc', 'memo')
+VARIABLE = 'AOC_MEMO'
+
+
+def enable(directory=MEMOS):
+    """Keep persistent memos on disk for this process and any it starts."""
+    os.environ[VARIABLE] = str(directory)
+
+
+class Memo:
+
+    """
+    >>> metrics.reset()
+    >>> m = Memo('squares', maxsize=2)
+    >>> [m.get(n, pow, n, 2) for n in (3, 4, 3, 5, 4)]
+    [9, 16, 9, 25, 16]
+    >>> list(m), metrics.snapshot()
+    ([5, 4], {'squares_misses': 4, 'squares_hits': 1, 'squares_evictions': 2})
+    >>> m = Memo('squares', maxsize=2, policy='lfu')
+    >>> [m.get(n, pow, n, 2) for n in (3, 3, 4, 5)]
+    [9, 9, 16, 25]
+    >>> list(m)
+    [3, 5]
+    >>> m = Memo('squares', maxbytes=3 * (sys.getsizeof(1) + sys.getsizeof(1)))
+    >>> for n in range(10):
+    ...     m[n] = n * n
+    >>> len(m), m.bytes <= m.maxbytes
+    (3, True)
+    >>> metrics.reset()
+    """
+
+    def __init__(self, name, maxsize=None, maxbytes=None, policy='lru', persist=None, sizeof=sys.getsizeof):
+        if policy not in ('lru', 'lfu'):
+            raise ValueError(f'unknown eviction policy {policy!r}')
+        self.name, self.maxsize, self.maxbytes, self.sizeof = name, maxsize, maxbytes, sizeof
+        self.hit, self.missed, self.evicted = f'{name}_hits', f'{name}_misses', f'{name}_evictions'
+        self.values = OrderedDict()
+        self.bytes = 0
+        self.sizes = {} if maxbytes is not None else None
+        # for lfu: how often each key has been used, and the keys used
+        # each number of times, least recently used first
+        self.lfu = policy == 'lfu'
+        self.uses, self.ranks, self.least = {}, {}, 0
+        self.touch = self.used if self.lfu else self.values.move_to_end
+        self.persist = persist
+        self.loaded = persist is None
+
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __contains__(self, key):
+        return key in self.values
+
+    def get(self, key, compute, *args):
+        """The value held for `key`, or else `compute(*args)`, held."""
+        try:
+            value = self.values[key]
+        except KeyError:
+            if not self.loaded:
+                self.load()
+                if key in self.values:
+                    return self.get(key, compute, *args)
+            metrics.count(self.missed)
+            value = self[key] = compute(*args)
+            return value
+        metrics.count(self.hit)
+        self.touch(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self.values:
+            self.discard(key)
+        self.values[key] = value
+        if self.sizes is not None:
+            self.sizes[key] = size = self.sizeof(key) + self.sizeof(value)
+            self.bytes += size
+        if self.lfu:
+            self.uses[key] = 1
+            self.ranks.setdefault(1, {})[key] = None
+            self.least = 1
+        while len(self.values) > 1 and ((self.maxsize is not None and len(self.values) > self.maxsize) or
+                                        (self.maxbytes is not None and self.bytes > self.maxbytes)):
+            self.discard(self.victim())
+            metrics.count(self.evicted)
+
+    def used(self, key):
+        n = self.uses[key]
+        rank = self.ranks[n]
+        del rank[key]
+        if not rank:
+            del self.ranks[n]
+            if self.least == n:
+                self.least = n + 1
+        self.uses[key] = n + 1
+        self.ranks.setdefault(n + 1, {})[key] = None
+
+    def victim(self):
+        if not self.lfu:
+            return next(iter(self.values))
+        if self.least not in self.ranks:
+            self.least = min(self.ranks)
+        return next(iter(self.ranks[self.least]))
+
+    def discard(self, key):
+        del self.values[key]
+        if self.sizes is not None:
+            self.bytes -= self.sizes.pop(key)
+        if self.lfu:
+            n = self.uses.pop(key)
+            rank = self.ranks[n]
+            del rank[key]
+            if not rank:
+                del self.ranks[n]
+
+    def clear(self):
+        self.values.clear()
+        self.bytes = 0
+        if self.sizes is not None:
+            self.sizes.clear()
+        self.uses.clear()
+        self.ranks.clear()
+
+    @property
+    def path(self):
+        if self.persist is None or not (directory := os.environ.get(VARIABLE)):
+            return None
+        from aoc23 import cache
+        module = self.persist.rpartition('.')[2]
+        return os.path.join(directory, f'{module}.{self.name}.{cache.source_digest(self.persist)[:32]}.pickle')
+
+    def load(self):
+        """Take up the entries saved by an earlier run, if persisting."""
+        self.loaded = True
+        if (path := self.path) is None:
+            return
+        import pickle
+        try:
+            with open(path, 'rb') as fd:
+                saved = pickle.load(fd)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return
+        for key, value in saved:
+            if key not in self.values:
+                self[key] = value
+
+    def save(self):
+        """Write the entries held to disk, if persisting."""
+        if (path := self.path) is None:
+            return
+        import pickle
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f'{path}.{os.getpid()}.tmp'
+        with open(temp, 'wb') as fd:
+            pickle.dump(list(self.values.items()), fd, pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, path)
+
+
+def describe(measured):
+    """Hit rates of the memos among the metrics `measured`.
+
+    >>> describe({'ways_hits': 30, 'ways_misses': 10, 'ways_evictions': 2, 'expanded': 7, 'hash_hits': 8})
+    'ways 75% of 40 (2 evicted), hash 100% of 8'
+    """
+    words = []
+    for name in dict.fromkeys(k.rpartition('_')[0] for k in measured if k.endswith(('_hits', '_misses'))):
+        hits, misses = measured.get(f'{name}_hits', 0), measured.get(f'{name}_misses', 0)
+        evicted = measured.get(f'{name}_evictions', 0)
+        words.append(f'{name} {hits / (hits + misses):.0%} of {hits + misses}'
+                     + (f' ({evicted} evicted)' if evicted else ''))
+    return ', '.join(words)
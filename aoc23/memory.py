@@ -0,0 +1,96 @@
+import _thread, signal, threading, tracemalloc
+from pathlib import Path
+
+from aoc23.runner import BudgetExceeded
+
+KiB = 1 << 10
+MiB = 1 << 20
+# raised in the main thread by the watcher to stop a part over budget
+OVERRUN = signal.SIGUSR1
+
+
+def mib(size):
+    """`size` in MiB, or in KiB or bytes if smaller.
+
+    >>> mib(3 * MiB // 2), mib(20 * KiB), mib(100)
+    ('1.5MiB', '20.0KiB', '100B')
+    """
+    if size >= MiB:
+        return f'{size / MiB:.1f}MiB'
+    if size >= KiB:
+        return f'{size / KiB:.1f}KiB'
+    return f'{size}B'
+
+
+class Memory:
+
+    """Trace a part's allocations, reporting its peak traced memory and
+    the allocation sites holding the most memory near that peak.
+
+    tracemalloc only keeps the peak size, not where it was allocated,
+    so a watcher thread snapshots the traces each time memory in use
+    grows by half again over the last snapshot.
+
+    A part whose peak exceeds `budget` bytes fails. Run on the main
+    thread, it is stopped as soon as the watcher sees its peak over
+    budget, rather than left to run on (or be killed for want of
+    memory) until it finishes.
+    """
+
+    def __init__(self, n, part, top=5, budget=None, interval=0.005):
+        self.top, self.budget, self.interval = top, budget, interval
+        self.peak = 0
+        self.snapshot = None
+        self.previous = None
+
+    def watch(self):
+        threshold = MiB // 16
+        while not self.done.wait(self.interval):
+            current, peak = tracemalloc.get_traced_memory()
+            if current > threshold:
+                self.snapshot = tracemalloc.take_snapshot()
+                threshold = current * 3 // 2
+            if self.previous is not None and self.budget is not None and peak > self.budget:
+                _thread.interrupt_main(OVERRUN)
+                return
+
+    def overrun(self, signum, frame):
+        raise self.exceeded(tracemalloc.get_traced_memory()[1])
+
+    def exceeded(self, peak):
+        return BudgetExceeded('MEMORY', f'peak memory {mib(peak)} exceeds budget of {mib(self.budget)}')
+
+    def __enter__(self):
+        self.done = threading.Event()
+        if self.budget is not None and threading.current_thread() is threading.main_thread():
+            self.previous = signal.signal(OVERRUN, self.overrun)
+        tracemalloc.start()
+        self.watcher = threading.Thread(target=self.watch, daemon=True)
+        self.watcher.start()
+        return self
+
+    def __exit__(self, kind, value, tb):
+        self.done.set()
+        self.watcher.join()
+        try:
+            _, self.peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            if self.previous is not None:
+                signal.signal(OVERRUN, self.previous)
+        if kind is None and self.budget is not None and self.peak > self.budget:
+            raise self.exceeded(self.peak)
+
+    def sites(self):
+        if self.snapshot is None:
+            return []
+        snapshot = self.snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                                tracemalloc.Filter(False, threading.__file__)])
+        return snapshot.statistics('lineno')[:self.top]
+
+    def __str__(self):
+        lines = [f'  peak traced memory {mib(self.peak)}']
+        for stat in self.sites():
+            frame = stat.traceback[0]
+            lines.append(f'  {mib(stat.size):>10} {stat.count:>9} blocks  {Path(frame.filename).name}:{frame.lineno}')
+        return '\n'.join(lines)
@@ -0,0 +1,89 @@
+"""Counters and histograms kept by solvers on their hot paths.
+
+Solvers call `count()` for things worth counting (states expanded,
+pulses sent...) and `observe()` for quantities whose spread matters
+(the size of a frontier as it is popped...). Both are a dictionary
+update, cheap enough to leave in place: a histogram only keeps a count
+per power of two rather than the values themselves. The runner resets
+them before each part and reports what the part left behind, so a
+slowdown can be put down to more work or to slower work.
+"""
+
+counters = {}
+histograms = {}
+
+
+class Histogram:
+
+    """Count, total and extremes of the values observed, and how many
+    fell into each power-of-two bucket (by their bit length, so bucket
+    k holds the values below 2**k and at least 2**(k-1)).
+
+    >>> h = Histogram()
+    >>> for v in (1, 3, 3, 12):
+    ...     h.add(v)
+    >>> h.summary()
+    {'count': 4, 'mean': 4.75, 'min': 1, 'max': 12, 'buckets': {'1': 1, '3': 2, '15': 1}}
+    """
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = self.total = 0
+        self.min = self.max = None
+        self.buckets = {}
+
+    def add(self, value):
+        if not self.count or value < self.min:
+            self.min = value
+        if not self.count or value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+        k = int(value).bit_length()
+        self.buckets[k] = self.buckets.get(k, 0) + 1
+
+    def summary(self):
+        """JSON-ready summary, with the buckets named by the largest
+        value they can hold."""
+        return {'count': self.count, 'mean': self.total / self.count if self.count else 0.0,
+                'min': self.min, 'max': self.max,
+                'buckets': {str((1 << k) - 1): n for k, n in sorted(self.buckets.items())}}
+
+
+def count(name, n=1):
+    counters[name] = counters.get(name, 0) + n
+
+
+def observe(name, value):
+    if (histogram := histograms.get(name)) is None:
+        histogram = histograms[name] = Histogram()
+    histogram.add(value)
+
+
+def reset():
+    counters.clear()
+    histograms.clear()
+
+
+def snapshot():
+    """What has been counted and observed since the last `reset()`,
+    as JSON-ready values.
+
+    >>> reset()
+    >>> count('states'); count('states', 2); observe('heap', 5)
+    >>> snapshot()
+    {'states': 3, 'heap': {'count': 1, 'mean': 5.0, 'min': 5, 'max': 5, 'buckets': {'7': 1}}}
+    >>> reset()
+    """
+    return counters | {name: h.summary() for name, h in histograms.items()}
+
+
+def describe(metrics):
+    """
+    >>> describe({'states': 3, 'heap': {'count': 2, 'mean': 4.5, 'min': 4, 'max': 5, 'buckets': {'7': 2}}})
+    'states=3 heap=2x(mean 4.5, max 5)'
+    """
+    return ' '.join(f'{name}={value["count"]}x(mean {value["mean"]:.4g}, max {value["max"]})'
+                    if isinstance(value, dict) else f'{name}={value}'
+                    for name, value in metrics.items())
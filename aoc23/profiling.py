@@ -0,0 +1,166 @@
+import cProfile, signal, sys, threading
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from aoc23 import runner
+
+PROFILES = runner.PACKAGE.parent / '.aoc' / 'profiles'
+
+
+def label(func):
+    """
+    >>> label(('/src/aoc23/day17.py', 131, 'options'))
+    'options (day17.py:131)'
+    >>> label(('~', 0, "<built-in method builtins.sum>"))
+    '<built-in method builtins.sum>'
+    """
+    filename, line, name = func
+    if filename == '~':
+        return name
+    return f'{name} ({Path(filename).name}:{line})'
+
+
+def collapse(stats):
+    """Fold a cProfile call graph into flamegraph stacks, with times in seconds.
+
+    cProfile records caller/callee pairs rather than whole stacks, so
+    each function's time is shared among the paths reaching it in
+    proportion to the time spent on each incoming edge. Recursive calls
+    are folded into the outermost frame.
+    """
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, ct) in callers.items():
+            callees[caller][func] = ct
+
+    folded = Counter()
+
+    def walk(func, path, on_path, share):
+        _, _, tt, ct, _ = stats[func]
+        if ct <= 0 or share < 1e-7:
+            return
+        scale = share / ct
+        folded[path] += tt * scale
+        for callee, t in callees[func].items():
+            if callee not in on_path:
+                walk(callee, f'{path};{label(callee)}', on_path | {callee}, t * scale)
+
+    for func, (_, _, _, ct, callers) in stats.items():
+        if not callers:
+            walk(func, label(func), {func}, ct)
+    return folded
+
+
+def write_stacks(folded, path):
+    """Write stacks in the collapsed format flamegraph tools read, one
+    `frame;frame;frame microseconds` line per stack."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as fd:
+        for stack, t in sorted(folded.items()):
+            if (us := round(t * 1e6)) > 0:
+                fd.write(f'{stack} {us}\n')
+
+
+class Profile:
+
+    """Run a part under cProfile, reporting its hottest functions and
+    writing its collapsed stacks to `directory`."""
+
+    def __init__(self, n, part, top=20, directory=PROFILES):
+        self.n, self.part, self.top = n, part, top
+        self.stacks = Path(directory) / f'day{n}{part}.folded'
+        self.stats = {}
+
+    def __enter__(self):
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.disable()
+        self.profiler.create_stats()
+        self.stats = self.profiler.stats
+        write_stacks(collapse(self.stats), self.stacks)
+
+    def table(self, title, key):
+        rows = sorted(self.stats.items(), key=lambda s: s[1][key], reverse=True)[:self.top]
+        lines = [f'  {title}', f'  {"calls":>10} {"self":>9} {"cumul":>9}  function']
+        for func, (_, nc, tt, ct, _) in rows:
+            lines.append(f'  {nc:>10} {tt:9.3f} {ct:9.3f}  {label(func)}')
+        return lines
+
+    def __str__(self):
+        return '\n'.join(self.table('by cumulative time', 3) + self.table('by self time', 2) +
+                         [f'  stacks written to {self.stacks}'])
+
+
+class Sampler:
+
+    """Sample a part's stack every `interval` seconds of CPU time,
+    reporting the functions seen most and writing its collapsed stacks
+    to `directory`.
+
+    Unlike `Profile` this costs nothing per call, only per sample, so
+    parts made of many small calls run at close to their usual speed.
+    Samples are taken by a SIGPROF timer, or by a thread (every
+    `interval` seconds of wall time) where the part doesn't run on the
+    main thread.
+    """
+
+    def __init__(self, n, part, interval=0.002, top=20, directory=PROFILES):
+        self.n, self.part, self.interval, self.top = n, part, interval, top
+        self.stacks = Path(directory) / f'day{n}{part}.sampled.folded'
+        self.samples = Counter()
+
+    def sample(self, frame):
+        codes = []
+        while frame is not None and frame.f_code is not runner.run_day.__code__:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        self.samples[tuple(codes)] += 1
+
+    def __enter__(self):
+        if threading.current_thread() is threading.main_thread() and hasattr(signal, 'setitimer'):
+            self.thread = None
+            self.handler = signal.signal(signal.SIGPROF, lambda signum, frame: self.sample(frame))
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self.stopped = threading.Event()
+            self.thread = threading.Thread(target=self.watch, args=(threading.get_ident(),), daemon=True)
+            self.thread.start()
+        return self
+
+    def watch(self, ident):
+        while not self.stopped.wait(self.interval):
+            if (frame := sys._current_frames().get(ident)) is not None:
+                self.sample(frame)
+
+    def __exit__(self, *exc):
+        if self.thread is None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self.handler)
+        else:
+            self.stopped.set()
+            self.thread.join()
+        write_stacks(self.folded(), self.stacks)
+
+    def folded(self):
+        """Samples as flamegraph stacks, each sample counting `interval` seconds."""
+        folded = defaultdict(float)
+        for codes, n in self.samples.items():
+            stack = ';'.join(label((c.co_filename, c.co_firstlineno, c.co_name)) for c in reversed(codes))
+            folded[stack] += n * self.interval
+        return folded
+
+    def __str__(self):
+        total = sum(self.samples.values())
+        own, seen = Counter(), Counter()
+        for codes, n in self.samples.items():
+            if codes:
+                own[codes[0]] += n
+            for c in set(codes):
+                seen[c] += n
+        lines = [f'  {total} samples every {self.interval * 1000:g}ms', f'  {"self":>7} {"total":>7}  function']
+        for c, n in seen.most_common(self.top):
+            lines.append(f'  {own[c] / total:7.1%} {n / total:7.1%}  {label((c.co_filename, c.co_firstlineno, c.co_name))}')
+        return '\n'.join(lines + [f'  stacks written to {self.stacks}'])
@@ -0,0 +1,154 @@
+"""Progress exposed by long-running solvers.
+
+Solvers call `report()` with the unit of work they count, how much of
+it they have done, how much there is in all where they know, and
+whatever else describes their progress so far (the best answer
+found...). Reports gain the rate of work since the part first reported
+that unit and, given a total, an estimate of the time left.
+
+Nothing happens with them unless a runner has installed a `sink`:
+`Status` keeps a status line up to date on a terminal, `Log` writes a
+line of JSON every few seconds elsewhere, and the isolated runner
+forwards reports to show how far a part got before it ran out of time.
+"""
+
+import json, sys, time
+
+sink = None
+context = {}
+started = {}
+
+
+def reset(**about):
+    """Start afresh, as at the start of a part: forget when each unit of
+    work was first reported and label reports with `about` (the day and
+    part)."""
+    global context
+    context = about
+    started.clear()
+
+
+def report(unit, done, total=None, **state):
+    """
+    >>> from aoc23 import progress
+    >>> progress.sink = print
+    >>> report('rows', 0, 4, partial_sum=12)
+    {'unit': 'rows', 'done': 0, 'total': 4, 'partial_sum': 12}
+    >>> progress.sink = None
+    >>> reset()
+    """
+    if sink is None:
+        return
+    now = time.monotonic()
+    t0, done0 = started.setdefault(unit, (now, done))
+    measured = context | {'unit': unit, 'done': done, 'total': total}
+    if now > t0 and done > done0:
+        measured['rate'] = rate = (done - done0) / (now - t0)
+        if total is not None:
+            measured['eta'] = (total - done) / rate
+    sink(measured | state)
+
+
+def clock(seconds):
+    """
+    >>> clock(8.4), clock(226), clock(7384)
+    ('8s', '3m46s', '2h03m')
+    """
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours}h{minutes:02}m' if hours else f'{minutes}m{seconds:02}s' if minutes else f'{seconds}s'
+
+
+def describe(state):
+    """
+    >>> describe({'unit': 'rows', 'done': 22, 'total': 1000, 'rate': 4.25, 'eta': 230.1, 'partial_sum': 12})
+    'rows 22/1000 4.25/s eta 3m50s partial_sum=12'
+    >>> describe({'day': 23, 'part': 'b', 'unit': 'paths', 'done': 5000, 'total': None, 'best': 6422})
+    'Day 23b: paths 5000 best=6422'
+    """
+    words = []
+    if 'day' in state:
+        words.append(f'Day {state["day"]}{state.get("part", "")}:')
+    if 'unit' in state:
+        total = '' if state.get('total') is None else f'/{state["total"]}'
+        words.append(f'{state["unit"]} {state["done"]}{total}')
+    if 'rate' in state:
+        words.append(f'{state["rate"]:.3g}/s')
+    if 'eta' in state:
+        words.append(f'eta {clock(state["eta"])}')
+    words.extend(f'{k}={v}' for k, v in state.items()
+                 if k not in ('day', 'part', 'unit', 'done', 'total', 'rate', 'eta'))
+    return ' '.join(words)
+
+
+def unlabelled(state):
+    """
+    >>> unlabelled({'day': 12, 'part': 'b', 'unit': 'rows', 'done': 3})
+    {'unit': 'rows', 'done': 3}
+    """
+    return {k: v for k, v in state.items() if k not in ('day', 'part')}
+
+
+class Status:
+
+    """Sink keeping a status line on a terminal up to date, redrawn at
+    most every `interval` seconds."""
+
+    def __init__(self, stream=sys.stderr, interval=0.1):
+        self.stream, self.interval = stream, interval
+        self.drawn = 0.0
+        self.shown = False
+
+    def __call__(self, state):
+        now = time.monotonic()
+        if now - self.drawn >= self.interval:
+            self.stream.write(f'\r\x1b[K{describe(state)}')
+            self.stream.flush()
+            self.drawn, self.shown = now, True
+
+    def clear(self):
+        if self.shown:
+            self.stream.write('\r\x1b[K')
+            self.stream.flush()
+            self.drawn, self.shown = 0.0, False
+
+
+class Log:
+
+    """Sink writing a report as a line of JSON at most every `interval`
+    seconds, for output that isn't a terminal."""
+
+    def __init__(self, stream=sys.stderr, interval=5.0):
+        self.stream, self.interval = stream, interval
+        self.written = 0.0
+
+    def __call__(self, state):
+        now = time.monotonic()
+        if now - self.written >= self.interval:
+            self.stream.write(json.dumps({'time': round(time.time(), 3)} | state, default=str) + '\n')
+            self.stream.flush()
+            self.written = now
+
+    def clear(self):
+        pass
+
+
+def sink_for(stream=sys.stderr):
+    """A status line if `stream` is a terminal, a log otherwise."""
+    return Status(stream) if stream.isatty() else Log(stream)
+
+
+class Above:
+
+    """Output stream writing to `stream` above the status line of
+    `display`, rather than over it."""
+
+    def __init__(self, stream, display):
+        self.stream, self.display = stream, display
+
+    def write(self, text):
+        self.display.clear()
+        return self.stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
@@ -0,0 +1,34 @@
+"""The days this package has solutions for, found from its files
+without importing them, so that the CLI only pays for the days it
+runs."""
+
+import importlib, os, re
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+PARTS = ('a', 'b')
+
+
+def days():
+    """Days with a solution module, in order."""
+    return sorted(int(m.group(1)) for name in os.listdir(DIRECTORY) if (m := re.fullmatch(r'day(\d+)\.py', name)))
+
+
+def parts(n):
+    """Parts defined by the module for day `n`.
+
+    >>> parts(25)
+    ['a']
+    >>> parts(0)
+    []
+    """
+    try:
+        with open(os.path.join(DIRECTORY, f'day{n}.py')) as fd:
+            source = fd.read()
+    except FileNotFoundError:
+        return []
+    return [p for p in PARTS if re.search(rf'^def solve_{p}\(', source, re.M)]
+
+
+def module(n):
+    """Import the module for day `n`."""
+    return importlib.import_module(f'{__package__}.day{n}')
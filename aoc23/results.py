@@ -0,0 +1,59 @@
+import json, sqlite3, time
+
+from aoc23 import runner
+
+RESULTS = runner.PACKAGE.parent / '.aoc' / 'results.sqlite'
+
+
+class ResultStore:
+
+    """Answers of solved parts, keyed by day, part, input digest and
+    source digest, so that a change to either the code or the input
+    misses rather than returning a stale answer.
+
+    Holds at most `capacity` answers, evicting the least recently used.
+
+    >>> store = ResultStore(':memory:', capacity=2)
+    >>> store.put(1, 'a', 'input', 'source', 142)
+    >>> store.get(1, 'a', 'input', 'source')
+    (True, 142)
+    >>> store.get(1, 'a', 'input', 'changed')
+    (False, None)
+    >>> store.put(1, 'b', 'input', 'source', 281)
+    >>> store.put(2, 'a', 'input', 'source', 8)
+    >>> store.get(1, 'a', 'input', 'source'), len(store)
+    ((False, None), 2)
+    """
+
+    def __init__(self, path=RESULTS, capacity=1000):
+        if path != ':memory:':
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.capacity = capacity
+        self.db.execute('CREATE TABLE IF NOT EXISTS results ('
+                        'day INTEGER, part TEXT, input TEXT, source TEXT, answer TEXT, used INTEGER, '
+                        'PRIMARY KEY (day, part, input, source))')
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def get(self, n, part, input_digest, source_digest):
+        key = (n, part, input_digest, source_digest)
+        with self.db:
+            row = self.db.execute('SELECT answer FROM results WHERE day = ? AND part = ? AND input = ? AND source = ?',
+                                  key).fetchone()
+            if row is None:
+                return (False, None)
+            self.db.execute('UPDATE results SET used = ? WHERE day = ? AND part = ? AND input = ? AND source = ?',
+                            (time.time_ns(),) + key)
+        return (True, json.loads(row[0]))
+
+    def put(self, n, part, input_digest, source_digest, answer):
+        with self.db:
+            self.db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                            (n, part, input_digest, source_digest, json.dumps(answer), time.time_ns()))
+            self.db.execute('DELETE FROM results WHERE rowid NOT IN '
+                            '(SELECT rowid FROM results ORDER BY used DESC LIMIT ?)', (self.capacity,))
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,407 @@
+import ast, contextlib, hashlib, importlib, io, multiprocessing, os, signal, time, traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.connection import wait
+from pathlib import Path
+from queue import Empty
+from typing import NamedTuple, Any
+
+from aoc23 import metrics, progress, spans
+from aoc23.registry import parts
+
+PACKAGE = Path(__file__).parent
+DATA = PACKAGE / 'data'
+
+
+class BudgetExceeded(Exception):
+
+    """Raised when a part overruns a resource budget; `status` is what
+    its result reports instead of FAIL."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class PartResult(NamedTuple):
+
+    """Outcome of running one part of one day."""
+
+    day: int
+    part: str
+    status: str
+    answer: Any = None
+    wall: float = 0.0
+    cpu: float = 0.0
+    error: str | None = None
+    notes: tuple[str, ...] = ()
+    metrics: dict | None = None
+    spans: list | None = None
+
+    @property
+    def ok(self):
+        return self.status in ('ok', 'cached')
+
+    def __str__(self):
+        """
+        >>> print(PartResult(12, 'b', 'ok', 42, 1.5, 1.25))
+        Day 12b: 42                   ok      wall   1.500s  cpu   1.250s
+        """
+        answer = '' if self.answer is None else self.answer
+        return f'Day {self.day}{self.part}: {answer!s:<20} {self.status:<7} wall {self.wall:7.3f}s  cpu {self.cpu:7.3f}s'
+
+
+def input_path(n):
+    return DATA / f'day{n}input.txt'
+
+
+def input_digest(n):
+    with open(input_path(n), 'rb') as fd:
+        return hashlib.file_digest(fd, 'sha256').hexdigest()
+
+
+def package_imports(path):
+    """Modules of this package imported by the module at `path`.
+
+    >>> 'grid' in package_imports(PACKAGE / 'day23.py')
+    True
+    """
+    found = set()
+    for node in ast.walk(ast.parse(path.read_text())):
+        if isinstance(node, ast.ImportFrom) and node.module == PACKAGE.name:
+            found.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and (module := node.module or '').startswith(f'{PACKAGE.name}.'):
+            found.add(module.partition('.')[2])
+        elif isinstance(node, ast.Import):
+            found.update(a.name.partition('.')[2] for a in node.names if a.name.startswith(f'{PACKAGE.name}.'))
+    return found
+
+
+def source_digest(n):
+    """Digest of the source of day `n` and of the package modules it
+    (transitively) imports."""
+    return module_digest(f'day{n}')
+
+
+def module_digest(name):
+    """Digest of the source of the package module `name` and of the
+    package modules it (transitively) imports.
+
+    >>> module_digest('day22') == module_digest('day22') != module_digest('day21')
+    True
+    """
+    h = hashlib.sha256()
+    seen, todo = set(), [name]
+    while todo:
+        name = todo.pop()
+        path = PACKAGE / f'{name}.py'
+        if name in seen or not path.exists():
+            continue
+        seen.add(name)
+        h.update(path.read_bytes())
+        todo.extend(sorted(package_imports(path)))
+    return h.hexdigest()
+
+
+def load_input(module, n, path=None):
+    """Read the puzzle input (or the input at `path`) the way the day's
+    `main()` does.
+
+    Most days take a list of lines; a module can define `read_input(fd)`
+    where its input needs different handling.
+    """
+    reader = getattr(module, 'read_input', list)
+    with open(path or input_path(n)) as fd:
+        return reader(fd)
+
+
+def parse_lines(module, lines):
+    """Read `lines` as though they were the day's input file.
+
+    >>> from aoc23 import day15
+    >>> parse_lines(day15, ['rn=1,cm-'])
+    ['rn=1', 'cm-']
+    """
+    reader = getattr(module, 'read_input', list)
+    return reader(io.StringIO(''.join(f'{line}\n' for line in lines)))
+
+
+def run_day(n, parts, instruments=(), path=None, loader=load_input, parser=None):
+    """Run `parts` of day `n` in this process, yielding the result of
+    each as it finishes, timing only the solution itself. The parts
+    solve the puzzle input unless given another `path`, read by
+    `loader`.
+
+    The day's `parse()` (or `parser(module, lines)`, given one) makes a
+    model of the input once, for all the parts to share: its cost is
+    counted in the first part's timing and the later parts only time
+    their `solve_<part>()`.
+
+    Each of `instruments` is called with the day and part to give a
+    context manager wrapped around the solution; its `str()` afterwards
+    is kept as a note on the result, as is what the part counted in
+    `metrics` and, when recording them, its `spans`.
+    """
+    module = lines = model = None
+    parsed = False
+    for part in parts:
+        answer = error = None
+        wall = cpu = 0.0
+        active = []
+        metrics.reset()
+        progress.reset(day=n, part=part)
+        try:
+            with spans.span(f'Day {n}{part}'):
+                if module is None:
+                    module = importlib.import_module(f'aoc23.day{n}')
+                    with spans.span('read'):
+                        lines = loader(module, n, path)
+                solve = getattr(module, f'solve_{part}')
+                with contextlib.ExitStack() as stack:
+                    active = [stack.enter_context(instrument(n, part)) for instrument in instruments]
+                    wall0, cpu0 = time.perf_counter(), time.process_time()
+                    try:
+                        if not parsed:
+                            with spans.span('parse'):
+                                model = parser(module, lines) if parser else module.parse(lines)
+                                parsed, lines = True, None
+                        with spans.span('solve'):
+                            answer = solve(model)
+                    finally:
+                        wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+            status = 'ok'
+        except BudgetExceeded as e:
+            status, error = e.status, str(e)
+        except Exception:
+            status, error = 'FAIL', traceback.format_exc()
+        yield PartResult(n, part, status, answer, wall, cpu, error, tuple(str(a) for a in active),
+                         metrics.snapshot(), spans.collect() if spans.enabled else None)
+
+
+def run_parts(n, parts, instruments=(), path=None, loader=load_input):
+    """`run_day` as a list, for handing back from a worker process."""
+    return list(run_day(n, parts, instruments, path, loader))
+
+
+def run_part(n, part, instruments=(), path=None, loader=load_input, parser=None):
+    """Run one part on its own, parsing the input for it alone."""
+    return next(run_day(n, (part,), instruments, path, loader, parser))
+
+
+def by_day(todo):
+    """The (day, part) pairs of `todo` as (day, parts), so that parts of
+    a day run together over one parse.
+
+    >>> by_day([(5, 'a'), (7, 'b'), (5, 'b')])
+    [(5, ('a', 'b')), (7, ('b',))]
+    """
+    grouped = {}
+    for n, p in todo:
+        grouped.setdefault(n, []).append(p)
+    return [(n, tuple(ps)) for n, ps in grouped.items()]
+
+
+def worker_sink():
+    """Pool initialiser: workers can't share the runner's status line,
+    so only keep the progress sink if it is a log."""
+    if not isinstance(progress.sink, progress.Log):
+        progress.sink = None
+
+
+def run_queued(queue, n, parts, instruments=()):
+    """`run_day` in a worker, putting each part's result on `queue` as
+    it finishes rather than once the day is done."""
+    for result in run_day(n, parts, instruments):
+        queue.put(result)
+
+
+def run_pool(todo, jobs=None, instruments=()):
+    """Run the (day, part) pairs in `todo` across a pool of `jobs`
+    worker processes, yielding results as each part finishes.
+
+    A day's parts run in one worker over one parse, each result coming
+    back through a queue as soon as it is ready; parts left unreported
+    by a worker that failed are reported as FAIL.
+    """
+    with multiprocessing.Manager() as manager, \
+         ProcessPoolExecutor(max_workers=jobs or None, initializer=worker_sink) as pool:
+        queue = manager.Queue()
+        pending = {n: (pool.submit(run_queued, queue, n, ps, instruments), list(ps)) for n, ps in by_day(todo)}
+        while pending:
+            try:
+                result = queue.get(timeout=0.1)
+            except Empty:
+                for n, (future, ps) in list(pending.items()):
+                    if future.done() and future.exception() is not None:
+                        del pending[n]
+                        error = ''.join(traceback.format_exception(future.exception()))
+                        for p in ps:
+                            yield PartResult(n, p, 'FAIL', error=error)
+                continue
+            future, ps = pending[result.day]
+            ps.remove(result.part)
+            if not ps:
+                del pending[result.day]
+            yield result
+
+
+class Forward:
+
+    """Progress sink sending a worker's reports to the runner, at most
+    every `interval` seconds.
+
+    Everything the worker sends goes through `send()`, so that `stop()`,
+    its SIGTERM handler, can put off stopping until a message being sent
+    is through rather than cutting it short or sending over it.
+    """
+
+    def __init__(self, conn, interval=0.1):
+        self.conn, self.interval = conn, interval
+        self.sent = 0.0
+        self.pending = None
+        self.sending = False
+        self.stopped = None
+
+    def __call__(self, state):
+        self.pending = state
+        if time.monotonic() - self.sent >= self.interval:
+            self.flush()
+
+    def flush(self):
+        if self.pending is not None:
+            pending, self.pending = self.pending, None
+            self.sent = time.monotonic()
+            self.send(('partial', pending))
+
+    def send(self, message):
+        self.sending = True
+        try:
+            self.conn.send(message)
+        finally:
+            self.sending = False
+        if self.stopped is not None:
+            raise SystemExit(128 + self.stopped)
+
+    def stop(self, signum, frame):
+        self.stopped = signum
+        if not self.sending:
+            raise SystemExit(128 + signum)
+
+
+def isolated(conn, n, parts, instruments):
+    """Entry point of the process running a day's parts for `run_isolated`."""
+
+    forward = progress.sink = Forward(conn)
+    signal.signal(signal.SIGTERM, forward.stop)
+    try:
+        for result in run_day(n, parts, instruments):
+            forward.send(('result', result))
+    except SystemExit:
+        # stopped: pass on the last progress, from here rather than the
+        # handler, and only once any message being sent is through
+        forward.flush()
+        raise
+
+
+def run_isolated(todo, jobs=None, instruments=(), timeout=None, grace=1.0):
+    """Run the parts of each day in `todo` (of (day, part) pairs) in a
+    process of its own, at most `jobs` at once, yielding results as each
+    part finishes.
+
+    A part still running after `timeout` seconds is terminated (and
+    killed if it has not stopped `grace` seconds later) and reported as
+    TIMEOUT, noting the last progress it reported; the day's later parts
+    are started again in a new process.
+    """
+    todo = deque(by_day(todo))
+    jobs = jobs or os.cpu_count() or 1
+    running = {}
+    while todo or running:
+        while todo and len(running) < jobs:
+            n, ps = todo.popleft()
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=isolated, args=(sender, n, ps, instruments))
+            process.start()
+            sender.close()
+            running[receiver] = [process, n, deque(ps), time.monotonic(), None]
+
+        now = time.monotonic()
+        deadline = min(start for _, _, _, start, _ in running.values()) + timeout if timeout else None
+        ready = wait(list(running), None if deadline is None else max(0.0, deadline - now))
+        for conn in [c for c in running if c in ready]:
+            process, n, ps, start, partial = entry = running[conn]
+            try:
+                kind, value = conn.recv()
+            except EOFError:
+                process.join()
+                del running[conn]
+                for p in ps:
+                    yield PartResult(n, p, 'FAIL', wall=time.monotonic() - start,
+                                     error=f'worker exited with code {process.exitcode}')
+                continue
+            if kind == 'partial':
+                entry[4] = value
+                if progress.sink is not None:
+                    progress.sink(value)
+            else:
+                ps.popleft()
+                entry[3:] = time.monotonic(), None
+                if not ps:
+                    process.join()
+                    del running[conn]
+                yield value
+
+        if timeout:
+            now = time.monotonic()
+            for conn, (process, n, ps, start, partial) in list(running.items()):
+                if now - start < timeout:
+                    continue
+                process.terminate()
+                process.join(grace)
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+                while conn.poll():
+                    try:
+                        kind, value = conn.recv()
+                    except EOFError:
+                        break
+                    if kind == 'partial':
+                        partial = value
+                del running[conn]
+                notes = () if partial is None else (f'  partial progress: {progress.describe(progress.unlabelled(partial))}',)
+                yield PartResult(n, ps.popleft(), 'TIMEOUT', wall=now - start,
+                                 error=f'exceeded time budget of {timeout}s', notes=notes)
+                if ps:
+                    todo.append((n, tuple(ps)))
+
+
+def run_parallel(selected, jobs=None, instruments=(), store=None, timeout=None):
+    """Run every part of the `selected` days across `jobs` worker
+    processes, yielding results as each part finishes. With a
+    `timeout`, each part runs in a process of its own that is stopped
+    if the part takes longer than that.
+
+    Parts with an answer in the result `store` for the current input
+    and code are answered from it without running; the answers of the
+    others are added to it.
+    """
+    keys = {}
+    todo = []
+    for n in selected:
+        for p in parts(n):
+            if store is not None:
+                keys[n, p] = (input_digest(n), source_digest(n))
+                found, answer = store.get(n, p, *keys[n, p])
+                if found:
+                    yield PartResult(n, p, 'cached', answer)
+                    continue
+            todo.append((n, p))
+    if timeout is None:
+        results = run_pool(todo, jobs, instruments)
+    else:
+        results = run_isolated(todo, jobs, instruments, timeout)
+    for result in results:
+        if store is not None and result.status == 'ok':
+            store.put(result.day, result.part, *keys[result.day, result.part], result.answer)
+        yield result
@@ -0,0 +1,167 @@
+"""Searches over graphs given as a function from a node to its neighbours.
+
+Nodes are best ints (a cell's index in a `grid.Grid`, with whatever
+else a state needs packed in beside it), which hash and compare
+fastest, though any hashable value that can be compared with others
+will do. Each search gives back the cost of the cheapest way it found
+to every node it reached and the node each was reached from, from which
+`Reached.path()` rebuilds the way there.
+
+Searches count the nodes they expand and observe the size of their
+frontier in `metrics`, and report their progress every `REPORT`
+nodes.
+"""
+
+import heapq
+from collections import deque
+from typing import NamedTuple, Any
+
+from aoc23 import metrics, progress
+
+REPORT = 1000
+
+
+class Reached(NamedTuple):
+
+    """The cost of reaching each node reached and the node it was
+    reached from (None for a start), and the node found meeting the
+    search's goal, if any."""
+
+    costs: dict
+    parents: dict
+    goal: Any = None
+
+    def path(self, node=None):
+        """The nodes from a start to `node`, by default the goal.
+
+        >>> bfs([0], lambda n: [n + 1, n * 2], goal=lambda n: n == 10).path()
+        [0, 1, 2, 4, 5, 10]
+        """
+        node = self.goal if node is None else node
+        path = []
+        while node is not None:
+            path.append(node)
+            node = self.parents[node]
+        return path[::-1]
+
+
+def bfs(starts, neighbours, goal=None, limit=None):
+    """Breadth-first search from the nodes `starts`, each step costing
+    one, until a node meeting `goal` is reached or (given a `limit`) no
+    more are within that many steps.
+
+    >>> bfs([0], lambda n: [n - 1, n + 1], limit=2).costs
+    {0: 0, -1: 1, 1: 1, -2: 2, 2: 2}
+    """
+    costs = dict.fromkeys(starts, 0)
+    parents = dict.fromkeys(costs)
+    queue = deque(costs)
+    n = layer = 0
+    while queue:
+        node = queue.popleft()
+        n += 1
+        cost = costs[node]
+        if cost > layer:
+            metrics.observe('frontier', len(queue) + 1)
+            layer = cost
+        if n % REPORT == 0:
+            progress.report('expanded', n, frontier=len(queue), cost=cost)
+        if goal is not None and goal(node):
+            metrics.count('expanded', n)
+            return Reached(costs, parents, node)
+        if limit is not None and cost >= limit:
+            break
+        for next in neighbours(node):
+            if next not in costs:
+                costs[next] = cost + 1
+                parents[next] = node
+                queue.append(next)
+    metrics.count('expanded', n)
+    return Reached(costs, parents)
+
+
+def astar(starts, neighbours, goal, heuristic=None):
+    """Search from the nodes `starts` for the cheapest way to a node
+    meeting `goal`, where `neighbours(node)` gives (node, cost) pairs,
+    expanding nodes in order of their cost so far plus the `heuristic`
+    estimate of the cost still to come. Given a heuristic that never
+    overestimates, the first goal reached is reached most cheaply.
+
+    >>> ring = lambda n: [((n + 1) % 10, 1), ((n - 1) % 10, 3)]
+    >>> r = astar([0], ring, lambda n: n == 8, lambda n: min((8 - n) % 10, 3 * ((n - 8) % 10)))
+    >>> r.costs[r.goal], r.path()
+    (6, [0, 9, 8])
+    """
+    costs = dict.fromkeys(starts, 0)
+    parents = dict.fromkeys(costs)
+    frontier = [(heuristic(s) if heuristic else 0, 0, s) for s in costs]
+    heapq.heapify(frontier)
+    n = 0
+    while frontier:
+        _, cost, node = heapq.heappop(frontier)
+        if cost > costs[node]:
+            continue
+        n += 1
+        metrics.observe('frontier', len(frontier))
+        if n % REPORT == 0:
+            progress.report('expanded', n, frontier=len(frontier), cost=cost)
+        if goal is not None and goal(node):
+            metrics.count('expanded', n)
+            return Reached(costs, parents, node)
+        for next, step in neighbours(node):
+            c = cost + step
+            if next not in costs or c < costs[next]:
+                costs[next] = c
+                parents[next] = node
+                heapq.heappush(frontier, (c + heuristic(next) if heuristic else c, c, next))
+    metrics.count('expanded', n)
+    return Reached(costs, parents)
+
+
+def dijkstra(starts, neighbours, goal=None):
+    """`astar()` with no heuristic, so reaching every node it can (or
+    stopping at a `goal`) by the cheapest way.
+
+    >>> dijkstra([0], lambda n: [(n + 1, 2), (n + 2, 5)] if n < 4 else []).costs
+    {0: 0, 1: 2, 2: 4, 3: 6, 4: 8, 5: 11}
+    """
+    return astar(starts, neighbours, goal)
+
+
+def buckets(starts, neighbours, goal=None):
+    """As `dijkstra()`, for small int costs: the frontier is a list of
+    the nodes reached at each cost, taken in turn, rather than a heap.
+
+    >>> buckets([0], lambda n: [(n + 1, 2), (n + 2, 5)] if n < 4 else []).costs
+    {0: 0, 1: 2, 2: 4, 3: 6, 4: 8, 5: 11}
+    """
+    costs = dict.fromkeys(starts, 0)
+    parents = dict.fromkeys(costs)
+    frontier = [list(costs)]
+    pending = len(costs)
+    n = cost = 0
+    while pending:
+        for node in frontier[cost]:
+            pending -= 1
+            if costs[node] < cost:
+                continue
+            n += 1
+            metrics.observe('frontier', pending)
+            if n % REPORT == 0:
+                progress.report('expanded', n, frontier=pending, cost=cost)
+            if goal is not None and goal(node):
+                metrics.count('expanded', n)
+                return Reached(costs, parents, node)
+            for next, step in neighbours(node):
+                c = cost + step
+                if next not in costs or c < costs[next]:
+                    costs[next] = c
+                    parents[next] = node
+                    while len(frontier) <= c:
+                        frontier.append([])
+                    frontier[c].append(next)
+                    pending += 1
+        frontier[cost].clear()
+        cost += 1
+    metrics.count('expanded', n)
+    return Reached(costs, parents)
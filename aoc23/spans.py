@@ -0,0 +1,63 @@
+"""Timed spans of a run, written as a Chrome trace.
+
+The runner times reading, parsing and solving each part as spans, and
+solvers can mark phases of their own within them with `span()`, as a
+context manager or a decorator. Spans are only kept once recording is
+`enable()`d (in this process and any it starts); the runner hands each
+part's back with its result, so spans from parallel workers end up on
+one timeline, a track per process, in a file that Perfetto
+(ui.perfetto.dev) or chrome://tracing can open.
+"""
+
+import contextlib, json, os, threading, time
+
+TRACE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.aoc', 'trace.json')
+VARIABLE = 'AOC_SPANS'
+
+enabled = bool(os.environ.get(VARIABLE))
+events = []
+
+
+def enable():
+    global enabled
+    os.environ[VARIABLE] = '1'
+    enabled = True
+
+
+@contextlib.contextmanager
+def span(name, **args):
+    """
+    >>> from aoc23 import spans
+    >>> spans.enabled = True
+    >>> with span('condense', bricks=3):
+    ...     pass
+    >>> [(e['name'], e['ph'], e['args']) for e in collect()]
+    [('condense', 'X', {'bricks': 3})]
+    >>> collect()
+    []
+    >>> spans.enabled = False
+    """
+    if not enabled:
+        yield
+        return
+    start = time.monotonic_ns()
+    try:
+        yield
+    finally:
+        end = time.monotonic_ns()
+        events.append({'name': name, 'ph': 'X', 'ts': start / 1000, 'dur': (end - start) / 1000,
+                       'pid': os.getpid(), 'tid': threading.get_native_id(), 'args': args})
+
+
+def collect():
+    """The spans recorded since the last `collect()`."""
+    found = events[:]
+    events.clear()
+    return found
+
+
+def write(found, path):
+    """Write the spans `found` as Chrome trace events to `path`."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as fd:
+        json.dump({'traceEvents': found, 'displayTimeUnit': 'ms'}, fd)
@@ -0,0 +1,86 @@
+"""Where the CLI's start-up time goes: `python -X importtime` for the
+CLI and for each day on top of it, grouped per day."""
+
+import os, re, subprocess, sys
+from typing import NamedTuple
+
+from aoc23 import registry
+
+CLI = f'{registry.__package__}.aoc'
+
+
+class Import(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse(report):
+    """Imports listed by `-X importtime`, in the order it lists them
+    (each module after those it imported).
+
+    >>> parse('import time: self [us] | cumulative | imported package\\n'
+    ...       'import time:       120 |        120 |   _locale\\n'
+    ...       'import time:      1100 |       1220 | locale\\n')
+    [Import(name='_locale', self_us=120, cumulative_us=120, depth=1), Import(name='locale', self_us=1100, cumulative_us=1220, depth=0)]
+    """
+    found = []
+    for m in re.finditer(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$', report, re.M):
+        found.append(Import(m.group(4), int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2))
+    return found
+
+
+def importtime(*modules):
+    """Imports made importing `modules` in turn in a fresh interpreter."""
+    code = '; '.join(f'import {m}' for m in modules)
+    env = os.environ | {'PYTHONPATH': os.pathsep.join([os.path.dirname(registry.DIRECTORY),
+                                                        os.environ.get('PYTHONPATH', '')])}
+    done = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env,
+                          capture_output=True, text=True, check=True)
+    return parse(done.stderr)
+
+
+def subtree(imports, name):
+    """`name` and the imports it made, from a list in `importtime` order."""
+    for i, imp in enumerate(imports):
+        if imp.name == name and imp.depth == 0:
+            start = i
+            while start > 0 and imports[start - 1].depth > 0:
+                start -= 1
+            return imports[start:i + 1]
+    return []
+
+
+def day(n, top=5):
+    """Cost of importing day `n` once the CLI is loaded: its total and
+    the heaviest modules it brings in (those imported directly by the
+    day or by other modules of the package)."""
+    name = f'{registry.__package__}.day{n}'
+    imports = subtree(importtime(CLI, name), name)
+    if not imports:
+        return {'day': n, 'total_us': 0, 'self_us': 0, 'heaviest': []}
+    own = imports[-1]
+    direct = [imp for imp in imports[:-1] if imp.depth == 1]
+    heaviest = sorted(direct, key=lambda imp: -imp.cumulative_us)[:top]
+    return {'day': n, 'total_us': own.cumulative_us, 'self_us': own.self_us,
+            'heaviest': [(imp.name, imp.cumulative_us) for imp in heaviest]}
+
+
+def cli():
+    """Cost of importing the CLI itself."""
+    imports = importtime(CLI)
+    return sum(imp.cumulative_us for imp in imports if imp.depth == 0 and imp.name.startswith(registry.__package__))
+
+
+def ms(us):
+    return f'{us / 1000:7.2f}ms'
+
+
+def format_day(report):
+    """
+    >>> print(format_day({'day': 8, 'total_us': 9800, 'self_us': 900, 'heaviest': [('dataclasses', 6100)]}))
+    Day 8      9.80ms  self    0.90ms  dataclasses 6.10ms
+    """
+    heaviest = ', '.join(f'{name} {us / 1000:.2f}ms' for name, us in report['heaviest'])
+    return f'Day {report["day"]:<3} {ms(report["total_us"])}  self {ms(report["self_us"])}  {heaviest}'.rstrip()
@@ -0,0 +1,63 @@
+"""Signed integers pulled out of text in bulk.
+
+Every byte that can't be part of a number is translated to a space
+and the result split, both in one pass in C over the whole text, and
+the tokens converted by one `map(int, ...)` into an `array('q')`, in
+place of a `split()` and a Python-level `int()` call per token per
+line. A `-` is taken to be a sign wherever it appears, as it is in
+every input these are used on.
+"""
+
+from array import array
+from itertools import batched
+
+from aoc23 import inputs
+
+NUMERIC = bytes(c if chr(c) in '-0123456789' else ord(' ') for c in range(256))
+
+
+def ints(text):
+    """Every signed integer in `text`, which may be a str or any bytes-like
+    buffer (such as a mapped input).
+
+    >>> ints('19, 13, 30 @ -2,  1, -2')
+    array('q', [19, 13, 30, -2, 1, -2])
+    >>> ints(b'1,0,1~1,2,1')
+    array('q', [1, 0, 1, 1, 2, 1])
+    """
+    data = text.encode() if isinstance(text, str) else text if isinstance(text, bytes) else bytes(text)
+    return array('q', map(int, data.translate(NUMERIC).split()))
+
+
+def rows(lines):
+    """The integers of each of `lines`, as one array of all of them and
+    an array of the offsets at which each line's integers start, ending with
+    their total, so that line i's are `values[offsets[i]:offsets[i + 1]]`.
+
+    >>> rows(['1 2', 'none', '-3'])
+    (array('q', [1, 2, -3]), array('q', [0, 2, 2, 3]))
+    """
+    values, offsets = array('q'), array('q', [0])
+    for line in lines:
+        values.extend(ints(line))
+        offsets.append(len(values))
+    return values, offsets
+
+
+def table(lines, width):
+    """The integers of `lines` which each hold `width` of them, as a tuple
+    per line. Mapped lines are scanned a block at a time from the
+    mapping.
+
+    >>> table(['0,0,1~0,0,2', '3,4,5~3,4,6'], 6)
+    [(0, 0, 1, 0, 0, 2), (3, 4, 5, 3, 4, 6)]
+    """
+    if isinstance(lines, inputs.Lines):
+        values = array('q')
+        for _, block in lines.mapped.blocks():
+            values.extend(ints(block))
+    else:
+        values = ints('\n'.join(lines))
+    if len(values) % width:
+        raise ValueError(f'{len(values)} integers do not make rows of {width}')
+    return list(batched(values, width))